@@ -3,6 +3,8 @@ import numpy as np
 import talib
 from abc import ABC, abstractmethod
 
+from indicatorGraph import IndicatorGraph
+
 class BaseTradingStrategy(ABC):
     """
     Abstract base class for trading strategies.
@@ -12,6 +14,7 @@ class BaseTradingStrategy(ABC):
     def __init__(self, name="BaseStrategy"):
         self.name = name
         self.indicators = {}
+        self.graph = None
     
     @abstractmethod
     def analyze(self, data):
@@ -43,7 +46,72 @@ class BaseTradingStrategy(ABC):
         dict : Calculated indicators
         """
         return {}
-    
+
+    def generate_signals(self, data, lookback=200):
+        """
+        Generate signals for every bar of the data
+
+        Subclasses override this with a vectorized implementation that
+        mirrors analyze(). This default replays analyze() bar by bar on a
+        sliding window, so any strategy can be backtested, only slowly.
+
+        Parameters:
+        -----------
+        data : pandas.DataFrame
+            OHLCV data for analysis
+        lookback : int
+            Number of bars passed to analyze() for each evaluation
+
+        Returns:
+        --------
+        pandas.DataFrame : 'action' (1 buy, 0 hold, -1 sell) and 'confidence' per bar
+        """
+        action_values = {'buy': 1, 'hold': 0, 'sell': -1}
+        actions = np.zeros(len(data), dtype=np.int8)
+        confidence = np.zeros(len(data), dtype=float)
+
+        for i in range(1, len(data)):
+            window = data.iloc[max(0, i + 1 - lookback):i + 1]
+            # analyze() caches indicators, so reset them for every window
+            self.reset_indicators()
+            try:
+                signal = self.analyze(window)
+            except (IndexError, KeyError):
+                continue
+            actions[i] = action_values.get(signal['action'], 0)
+            confidence[i] = signal['confidence']
+
+        self.reset_indicators()
+        return self._signal_frame(data, actions, confidence)
+
+    def reset_indicators(self):
+        """Clear indicators cached by analyze()"""
+        self.indicators = {}
+
+    def get_graph(self, data):
+        """
+        Get the indicator graph bound to the data
+
+        Strategies declare their series on this graph, so strategies sharing
+        a graph compute each series once per bar.
+        """
+        if self.graph is None:
+            self.graph = IndicatorGraph()
+        return self.graph.bind(data)
+
+    def share_graph(self, graph):
+        """Use a graph shared with other strategies"""
+        self.graph = graph
+
+    @staticmethod
+    def _signal_frame(data, actions, confidence):
+        """Build the signal DataFrame returned by generate_signals()"""
+        actions = np.asarray(actions, dtype=np.int8)
+        confidence = np.nan_to_num(np.asarray(confidence, dtype=float), nan=0.0)
+        # Confidence only carries meaning for buy/sell bars, as in analyze()
+        confidence = np.where(actions != 0, confidence, 0.0)
+        return pd.DataFrame({'action': actions, 'confidence': confidence}, index=data.index)
+
     def get_name(self):
         """Get strategy name"""
         return self.name
@@ -55,18 +123,23 @@ class MACrossoverStrategy(BaseTradingStrategy):
     
     Generates buy signals when the fast MA crosses above the slow MA,
     and sell signals when the fast MA crosses below the slow MA.
+    With ma_type='ema' the averages are the same EMA nodes MACD uses, so
+    an ensemble with MACD on the same periods computes them once.
     """
     
-    def __init__(self, fast_period=12, slow_period=26, name="MA Crossover"):
+    def __init__(self, fast_period=12, slow_period=26, name="MA Crossover", ma_type='sma'):
         super().__init__(name)
         self.fast_period = fast_period
         self.slow_period = slow_period
+        self.ma_type = ma_type
     
     def calculate_indicators(self, data):
         """Calculate fast and slow moving averages"""
+        graph = self.get_graph(data)
+        average = graph.ema if self.ma_type == 'ema' else graph.sma
         self.indicators = {
-            'fast_ma': data['close'].rolling(window=self.fast_period).mean(),
-            'slow_ma': data['close'].rolling(window=self.slow_period).mean()
+            'fast_ma': average('close', self.fast_period),
+            'slow_ma': average('close', self.slow_period)
         }
         return self.indicators
     
@@ -117,6 +190,23 @@ class MACrossoverStrategy(BaseTradingStrategy):
             'timestamp': data.index[-1]
         }
 
+    def generate_signals(self, data):
+        """Vectorized version of analyze() for every bar"""
+        indicators = self.calculate_indicators(data)
+        fast_ma = indicators['fast_ma'].to_numpy()
+        slow_ma = indicators['slow_ma'].to_numpy()
+        fast_prev = np.roll(fast_ma, 1)
+        slow_prev = np.roll(slow_ma, 1)
+        fast_prev[0] = slow_prev[0] = np.nan
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            buy = (fast_prev < slow_prev) & (fast_ma > slow_ma)
+            sell = (fast_prev > slow_prev) & (fast_ma < slow_ma)
+            confidence = np.minimum(100, np.abs(fast_ma - slow_ma) / slow_ma * 1000)
+
+        actions = buy.astype(np.int8) - sell.astype(np.int8)
+        return self._signal_frame(data, actions, confidence)
+
 
 class RSIStrategy(BaseTradingStrategy):
     """
@@ -133,25 +223,8 @@ class RSIStrategy(BaseTradingStrategy):
         self.overbought = overbought
     
     def calculate_indicators(self, data):
-        """Calculate RSI indicator"""
-        try:
-            # Use talib for RSI calculation if available
-            import talib
-            rsi = talib.RSI(data['close'].values, timeperiod=self.period)
-            self.indicators = {'rsi': pd.Series(rsi, index=data.index)}
-        except ImportError:
-            # Fallback to manual calculation
-            delta = data['close'].diff()
-            gain = delta.where(delta > 0, 0)
-            loss = -delta.where(delta < 0, 0)
-            
-            avg_gain = gain.rolling(window=self.period).mean()
-            avg_loss = loss.rolling(window=self.period).mean()
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            self.indicators = {'rsi': rsi}
-            
+        """Calculate RSI indicator from the shared gain/loss averages"""
+        self.indicators = {'rsi': self.get_graph(data).rsi('close', self.period)}
         return self.indicators
     
     def analyze(self, data):
@@ -197,6 +270,24 @@ class RSIStrategy(BaseTradingStrategy):
             'timestamp': data.index[-1]
         }
 
+    def generate_signals(self, data):
+        """Vectorized version of analyze() for every bar"""
+        rsi = self.calculate_indicators(data)['rsi'].to_numpy(dtype=float)
+        rsi_prev = np.roll(rsi, 1)
+        rsi_prev[0] = np.nan
+
+        with np.errstate(invalid='ignore'):
+            buy = (rsi < self.oversold) & (rsi_prev > self.oversold)
+            sell = (rsi > self.overbought) & (rsi_prev < self.overbought)
+
+        confidence = np.where(
+            buy,
+            np.minimum(100, (self.oversold - rsi) * 5),
+            np.minimum(100, (rsi - self.overbought) * 5)
+        )
+        actions = buy.astype(np.int8) - sell.astype(np.int8)
+        return self._signal_frame(data, actions, confidence)
+
 
 class BollingerBandsStrategy(BaseTradingStrategy):
     """
@@ -213,8 +304,9 @@ class BollingerBandsStrategy(BaseTradingStrategy):
     
     def calculate_indicators(self, data):
         """Calculate Bollinger Bands"""
-        middle_band = data['close'].rolling(window=self.period).mean()
-        std = data['close'].rolling(window=self.period).std()
+        graph = self.get_graph(data)
+        middle_band = graph.sma('close', self.period)
+        std = graph.rolling_std('close', self.period)
         upper_band = middle_band + (std * self.std_dev)
         lower_band = middle_band - (std * self.std_dev)
         
@@ -280,6 +372,27 @@ class BollingerBandsStrategy(BaseTradingStrategy):
             'timestamp': data.index[-1]
         }
 
+    def generate_signals(self, data):
+        """Vectorized version of analyze() for every bar"""
+        indicators = self.calculate_indicators(data)
+        price = data['close'].to_numpy(dtype=float)
+        upper = indicators['upper_band'].to_numpy()
+        lower = indicators['lower_band'].to_numpy()
+        width = upper - lower
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            band_position = np.where(width > 0, (price - lower) / width, 0.5)
+            buy = price <= lower
+            sell = ~buy & (price >= upper)
+
+        confidence = np.where(
+            buy,
+            np.minimum(100, (1 - band_position) * 100),
+            np.minimum(100, band_position * 100)
+        )
+        actions = buy.astype(np.int8) - sell.astype(np.int8)
+        return self._signal_frame(data, actions, confidence)
+
 
 class MACDStrategy(BaseTradingStrategy):
     """
@@ -296,35 +409,15 @@ class MACDStrategy(BaseTradingStrategy):
         self.signal_period = signal_period
     
     def calculate_indicators(self, data):
-        """Calculate MACD indicators"""
-        try:
-            # Use talib for MACD calculation if available
-            import talib
-            macd, signal, histogram = talib.MACD(
-                data['close'].values, 
-                fastperiod=self.fast_period, 
-                slowperiod=self.slow_period, 
-                signalperiod=self.signal_period
-            )
-            self.indicators = {
-                'macd': pd.Series(macd, index=data.index),
-                'signal': pd.Series(signal, index=data.index),
-                'histogram': pd.Series(histogram, index=data.index)
-            }
-        except ImportError:
-            # Fallback to manual calculation
-            exp1 = data['close'].ewm(span=self.fast_period, adjust=False).mean()
-            exp2 = data['close'].ewm(span=self.slow_period, adjust=False).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=self.signal_period, adjust=False).mean()
-            histogram = macd - signal
-            
-            self.indicators = {
-                'macd': macd,
-                'signal': signal,
-                'histogram': histogram
-            }
-            
+        """Calculate MACD indicators from the shared EMAs"""
+        macd, signal, histogram = self.get_graph(data).macd(
+            'close', self.fast_period, self.slow_period, self.signal_period
+        )
+        self.indicators = {
+            'macd': macd,
+            'signal': signal,
+            'histogram': histogram
+        }
         return self.indicators
     
     def analyze(self, data):
@@ -376,19 +469,42 @@ class MACDStrategy(BaseTradingStrategy):
             'timestamp': data.index[-1]
         }
 
+    def generate_signals(self, data):
+        """Vectorized version of analyze() for every bar"""
+        indicators = self.calculate_indicators(data)
+        macd = indicators['macd'].to_numpy(dtype=float)
+        signal = indicators['signal'].to_numpy(dtype=float)
+        macd_prev = np.roll(macd, 1)
+        signal_prev = np.roll(signal, 1)
+        macd_prev[0] = signal_prev[0] = np.nan
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            buy = (macd_prev < signal_prev) & (macd > signal)
+            sell = (macd_prev > signal_prev) & (macd < signal)
+            confidence = np.where(
+                signal != 0,
+                np.minimum(100, np.abs(macd - signal) / np.abs(signal) * 100),
+                50
+            )
+
+        actions = buy.astype(np.int8) - sell.astype(np.int8)
+        return self._signal_frame(data, actions, confidence)
+
 
 class CombinedStrategy(BaseTradingStrategy):
     """
     Combined Strategy
     
     Combines multiple strategies and weighs their signals
-    to generate a final trading decision.
+    to generate a final trading decision. All sub-strategies share one
+    indicator graph, so series they have in common are computed once per bar.
     """
     
     def __init__(self, strategies=None, weights=None, name="Combined Strategy"):
         super().__init__(name)
         self.strategies = strategies or []
         self.weights = weights or {}
+        self.share_graph(IndicatorGraph())
         
         # Set default weights if not provided
         if not self.weights and self.strategies:
@@ -408,6 +524,7 @@ class CombinedStrategy(BaseTradingStrategy):
         """
         self.strategies.append(strategy)
         self.weights[strategy.get_name()] = weight
+        strategy.share_graph(self.graph)
         
         # Normalize weights
         total_weight = sum(self.weights.values())
@@ -488,4 +605,63 @@ class CombinedStrategy(BaseTradingStrategy):
         
         result.update(strategy_details)
         
-        return result
\ No newline at end of file
+        return result
+
+    def reset_indicators(self):
+        """Clear indicators cached by this strategy and all sub-strategies"""
+        self.indicators = {}
+        for strategy in self.strategies:
+            strategy.reset_indicators()
+
+    def share_graph(self, graph):
+        """Use a graph shared with other strategies, including all sub-strategies"""
+        self.graph = graph
+        for strategy in self.strategies:
+            strategy.share_graph(graph)
+
+    def generate_signals(self, data):
+        """
+        Vectorized version of analyze() for every bar
+
+        Uses the same weighting and thresholds as analyze(), built from the
+        generate_signals() output of each child strategy.
+        """
+        if not self.strategies:
+            return self._signal_frame(data, np.zeros(len(data)), np.zeros(len(data)))
+
+        weighted_value = np.zeros(len(data), dtype=float)
+        for strategy in self.strategies:
+            weight = self.weights.get(strategy.get_name(), 1.0 / len(self.strategies))
+            signals = strategy.generate_signals(data)
+            weighted_value += (
+                signals['action'].to_numpy() * signals['confidence'].to_numpy() / 100.0 * weight
+            )
+
+        actions = (weighted_value > 0.2).astype(np.int8) - (weighted_value < -0.2).astype(np.int8)
+        confidence = np.minimum(100, np.abs(weighted_value) * 100)
+        return self._signal_frame(data, actions, confidence)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 500
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    data = pd.DataFrame({
+        'open': close, 'high': close * 1.01, 'low': close * 0.99, 'close': close
+    }, index=pd.date_range('2024-01-01', periods=n, freq='h'))
+
+    # An ensemble on one shared graph should reuse its diff, EMA and MACD
+    # line nodes; with an EMA crossover it also reuses MACD's EMAs
+    for ma_type in ('sma', 'ema'):
+        combined = CombinedStrategy([
+            MACrossoverStrategy(12, 26, ma_type=ma_type),
+            RSIStrategy(14),
+            BollingerBandsStrategy(20),
+            MACDStrategy(12, 26, 9)
+        ])
+        graph = IndicatorGraph()
+        combined.share_graph(graph)
+        signal = combined.analyze(data)
+        stats = graph.stats()
+        print(f"MA({ma_type}) ensemble: {signal['action']} @ {signal['price']:.2f}, graph {stats}")
+        assert stats['hits'] > 0, "ensemble strategies did not share any indicator nodes"
@@ -5,7 +5,11 @@ import os
 import logging
 from datetime import datetime, timedelta
 import numpy as np
-import json
+
+from records import Position
+import serialization
+from tradeJournal import TradeJournal
+from candleResampler import CandleResampler
 
 class BitcoinTrader:
     """
@@ -13,7 +17,8 @@ class BitcoinTrader:
     executes trades, and manages positions.
     """
     
-    def __init__(self, exchange_id='binance', api_key=None, secret=None, leverage=3):
+    def __init__(self, exchange_id='binance', api_key=None, secret=None, leverage=3,
+                 state_file='bitcoin_trader_state.json'):
         """
         Initialize the BitcoinTrader
         
@@ -27,6 +32,8 @@ class BitcoinTrader:
             API secret for the exchange
         leverage : int
             Default leverage to use for trading (default: 3x)
+        state_file : str
+            Snapshot file; position events are logged to a WAL next to it
         """
         self.setup_logging()
         
@@ -38,12 +45,17 @@ class BitcoinTrader:
         # Trading parameters
         self.symbol = 'BTC/USDT'
         self.timeframe = '1h'  # Default timeframe
+        self.candles = CandleResampler()  # 1m candles resampled to 5m/15m/1h/4h
         
         # Position tracking
         self.active_positions = {}
         self.position_history = []
         self.trade_history = []
         
+        # Durable state: every fill goes to the WAL, snapshots keep the recent history
+        self.journal = TradeJournal(state_file)
+        self.max_history = 1000
+        
         # Risk management
         self.max_open_positions = 3
         self.position_size_pct = 0.1  # 10% of available balance per position
@@ -190,6 +202,16 @@ class BitcoinTrader:
         if not timeframe:
             timeframe = self.timeframe
             
+        # Derivable timeframes come from the shared 1m buffers: only new minutes are fetched
+        if since is None and limit <= self.candles.capacity and self.candles.supports(timeframe):
+            try:
+                self.candles.sync(self.exchange, symbol, (timeframe,))
+                df = self.candles.frame(symbol, timeframe, limit)
+                if not df.empty:
+                    return df
+            except Exception as e:
+                self.logger.warning(f"Resampled candles unavailable, fetching {timeframe} directly: {e}")
+
         try:
             ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, since, limit)
             df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
@@ -269,18 +291,18 @@ class BitcoinTrader:
             
             # Track position
             position_id = order['id']
-            self.active_positions[position_id] = {
-                'id': position_id,
-                'type': 'long',
-                'symbol': self.symbol,
-                'size': size,
-                'entry_price': current_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'leverage': self.leverage,
-                'open_time': datetime.now(),
-                'status': 'open'
-            }
+            self.active_positions[position_id] = Position(
+                id=position_id,
+                type='long',
+                symbol=self.symbol,
+                size=size,
+                entry_price=current_price,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                leverage=self.leverage,
+                open_time=datetime.now(),
+                status='open'
+            )
             
             # Add to trade history
             self.trade_history.append({
@@ -291,6 +313,8 @@ class BitcoinTrader:
                 'timestamp': datetime.now()
             })
             
+            self._journal_event('open', {'position': self.active_positions[position_id], 'trade': self.trade_history[-1]})
+            
             self.logger.info(f"Opened long position: {size} BTC at {current_price} USDT")
             return order
         except Exception as e:
@@ -333,18 +357,18 @@ class BitcoinTrader:
             
             # Track position
             position_id = order['id']
-            self.active_positions[position_id] = {
-                'id': position_id,
-                'type': 'short',
-                'symbol': self.symbol,
-                'size': size,
-                'entry_price': current_price,
-                'stop_loss': stop_loss,
-                'take_profit': take_profit,
-                'leverage': self.leverage,
-                'open_time': datetime.now(),
-                'status': 'open'
-            }
+            self.active_positions[position_id] = Position(
+                id=position_id,
+                type='short',
+                symbol=self.symbol,
+                size=size,
+                entry_price=current_price,
+                stop_loss=stop_loss,
+                take_profit=take_profit,
+                leverage=self.leverage,
+                open_time=datetime.now(),
+                status='open'
+            )
             
             # Add to trade history
             self.trade_history.append({
@@ -355,6 +379,8 @@ class BitcoinTrader:
                 'timestamp': datetime.now()
             })
             
+            self._journal_event('open', {'position': self.active_positions[position_id], 'trade': self.trade_history[-1]})
+            
             self.logger.info(f"Opened short position: {size} BTC at {current_price} USDT")
             return order
         except Exception as e:
@@ -382,24 +408,24 @@ class BitcoinTrader:
         
         try:
             # Create order to close position
-            if position['type'] == 'long':
-                order = self.exchange.create_market_sell_order(position['symbol'], position['size'])
+            if position.type == 'long':
+                order = self.exchange.create_market_sell_order(position.symbol, position.size)
             else:  # short
-                order = self.exchange.create_market_buy_order(position['symbol'], position['size'])
+                order = self.exchange.create_market_buy_order(position.symbol, position.size)
                 
             current_price = self.get_market_price()
             
             # Calculate profit/loss
-            if position['type'] == 'long':
-                pnl_pct = (current_price - position['entry_price']) / position['entry_price'] * 100 * self.leverage
+            if position.type == 'long':
+                pnl_pct = (current_price - position.entry_price) / position.entry_price * 100 * self.leverage
             else:  # short
-                pnl_pct = (position['entry_price'] - current_price) / position['entry_price'] * 100 * self.leverage
+                pnl_pct = (position.entry_price - current_price) / position.entry_price * 100 * self.leverage
                 
             # Update position status
-            position['close_price'] = current_price
-            position['close_time'] = datetime.now()
-            position['status'] = 'closed'
-            position['pnl_pct'] = pnl_pct
+            position.close_price = current_price
+            position.close_time = datetime.now()
+            position.status = 'closed'
+            position.pnl_pct = pnl_pct
             
             # Move to position history
             self.position_history.append(position)
@@ -415,6 +441,8 @@ class BitcoinTrader:
                 'timestamp': datetime.now()
             })
             
+            self._journal_event('close', {'position': position, 'trade': self.trade_history[-1]})
+            
             self.logger.info(f"Closed {position['type']} position: {position['size']} BTC at {current_price} USDT, PnL: {pnl_pct:.2f}%")
             return order
         except Exception as e:
@@ -452,20 +480,20 @@ class BitcoinTrader:
         
         for position_id, position in list(self.active_positions.items()):
             # Skip if already closed
-            if position['status'] != 'open':
+            if position.status != 'open':
                 continue
                 
             # Check if stop loss or take profit hit
-            if position['type'] == 'long':
+            if position.type == 'long':
                 # Stop loss hit
-                if current_price <= position['stop_loss']:
+                if current_price <= position.stop_loss:
                     self.logger.info(f"Stop loss hit for long position {position_id}")
                     result = self.close_position(position_id)
                     if result:
                         closed_positions.append(position_id)
                 
                 # Take profit hit
-                elif current_price >= position['take_profit']:
+                elif current_price >= position.take_profit:
                     self.logger.info(f"Take profit hit for long position {position_id}")
                     result = self.close_position(position_id)
                     if result:
@@ -473,14 +501,14 @@ class BitcoinTrader:
                         
             else:  # short
                 # Stop loss hit
-                if current_price >= position['stop_loss']:
+                if current_price >= position.stop_loss:
                     self.logger.info(f"Stop loss hit for short position {position_id}")
                     result = self.close_position(position_id)
                     if result:
                         closed_positions.append(position_id)
                 
                 # Take profit hit
-                elif current_price <= position['take_profit']:
+                elif current_price <= position.take_profit:
                     self.logger.info(f"Take profit hit for short position {position_id}")
                     result = self.close_position(position_id)
                     if result:
@@ -502,59 +530,117 @@ class BitcoinTrader:
         current_time = datetime.now().strftime("%H:%M")
         return self.trading_start_time <= current_time <= self.trading_end_time
     
-    def save_state(self, filename='bitcoin_trader_state.json'):
+    def _journal_event(self, event_type, data):
         """
-        Save the current state of the trader to a file
+        Log a position event to the WAL, taking a snapshot when one is due
+        
+        Parameters:
+        -----------
+        event_type : str
+            'open' or 'close'
+        data : dict
+            Position record and trade history entry
+        """
+        try:
+            if self.journal.append(event_type, data):
+                self.save_state()
+        except Exception as e:
+            self.logger.error(f"Failed to journal {event_type} event: {e}")
+    
+    def _apply_event(self, event):
+        """Replay a logged position event onto the in-memory state"""
+        data = event['data']
+        position = Position.from_dict(data['position'])
+        
+        if event['type'] == 'open':
+            self.active_positions[position.id] = position
+        elif event['type'] == 'close':
+            self.active_positions.pop(position.id, None)
+            self.position_history.append(position)
+            
+        if data.get('trade'):
+            self.trade_history.append(data['trade'])
+    
+    def _get_journal(self, filename):
+        if filename is None or filename == self.journal.snapshot_path:
+            return self.journal
+        return TradeJournal(filename)
+    
+    def save_state(self, filename=None):
+        """
+        Write a compacted snapshot of the trader state and truncate the WAL
+        
+        History beyond max_history entries is moved to the history archive
+        so the snapshot stays bounded.
         
         Parameters:
         -----------
         filename : str
-            Filename to save state to
-        """
-        state = {
-            'active_positions': self.active_positions,
-            'position_history': self.position_history,
-            'trade_history': self.trade_history,
-            'exchange_id': self.exchange_id,
-            'symbol': self.symbol,
-            'leverage': self.leverage,
-            'max_open_positions': self.max_open_positions,
-            'position_size_pct': self.position_size_pct,
-            'stop_loss_pct': self.stop_loss_pct,
-            'take_profit_pct': self.take_profit_pct,
-            'trading_active': self.trading_active,
-            'trading_start_time': self.trading_start_time,
-            'trading_end_time': self.trading_end_time,
-            'last_saved': datetime.now().isoformat()
-        }
+            Snapshot file (default: the trader's state_file)
+        """
+        journal = self._get_journal(filename)
         
         try:
-            with open(filename, 'w') as f:
-                json.dump(state, f, default=str)
-            self.logger.info(f"Saved state to {filename}")
+            archived = []
+            if len(self.position_history) > self.max_history:
+                overflow = len(self.position_history) - self.max_history
+                archived.extend({'type': 'position', 'data': p} for p in self.position_history[:overflow])
+                self.position_history = self.position_history[overflow:]
+            if len(self.trade_history) > self.max_history:
+                overflow = len(self.trade_history) - self.max_history
+                archived.extend({'type': 'trade', 'data': t} for t in self.trade_history[:overflow])
+                self.trade_history = self.trade_history[overflow:]
+            journal.archive(archived)
+            
+            state = {
+                'active_positions': self.active_positions,
+                'position_history': self.position_history,
+                'trade_history': self.trade_history,
+                'exchange_id': self.exchange_id,
+                'symbol': self.symbol,
+                'leverage': self.leverage,
+                'max_open_positions': self.max_open_positions,
+                'position_size_pct': self.position_size_pct,
+                'stop_loss_pct': self.stop_loss_pct,
+                'take_profit_pct': self.take_profit_pct,
+                'trading_active': self.trading_active,
+                'trading_start_time': self.trading_start_time,
+                'trading_end_time': self.trading_end_time,
+                'last_saved': datetime.now().isoformat()
+            }
+            
+            journal.write_snapshot(state)
+            self.logger.info(f"Saved state to {journal.snapshot_path}")
         except Exception as e:
             self.logger.error(f"Failed to save state: {e}")
     
-    def load_state(self, filename='bitcoin_trader_state.json'):
+    def load_state(self, filename=None):
         """
-        Load the state of the trader from a file
+        Load the trader state from the latest snapshot plus the WAL tail
         
         Parameters:
         -----------
         filename : str
-            Filename to load state from
+            Snapshot file (default: the trader's state_file)
             
         Returns:
         --------
         bool : True if successful, False otherwise
         """
+        journal = self._get_journal(filename)
+        
         try:
-            with open(filename, 'r') as f:
-                state = json.load(f)
-                
-            # Restore state
-            self.active_positions = state.get('active_positions', {})
-            self.position_history = state.get('position_history', [])
+            state, events = journal.load()
+            if state is None and not events:
+                raise FileNotFoundError(journal.snapshot_path)
+            state = state or {}
+            
+            # Restore snapshot
+            self.active_positions = {
+                position_id: Position.from_dict(position)
+                for position_id, position in state.get('active_positions', {}).items()
+            }
+            self.position_history = [Position.from_dict(position) for position in state.get('position_history', [])]
             self.trade_history = state.get('trade_history', [])
             self.symbol = state.get('symbol', self.symbol)
             self.leverage = state.get('leverage', self.leverage)
@@ -566,10 +652,14 @@ class BitcoinTrader:
             self.trading_start_time = state.get('trading_start_time', self.trading_start_time)
             self.trading_end_time = state.get('trading_end_time', self.trading_end_time)
             
-            self.logger.info(f"Loaded state from {filename}")
+            # Replay fills logged after the snapshot
+            for event in events:
+                self._apply_event(event)
+            
+            self.logger.info(f"Loaded state from {journal.snapshot_path} ({len(events)} events replayed from WAL)")
             return True
         except FileNotFoundError:
-            self.logger.warning(f"State file {filename} not found")
+            self.logger.warning(f"State file {journal.snapshot_path} not found")
             return False
         except Exception as e:
             self.logger.error(f"Failed to load state: {e}")
@@ -594,9 +684,9 @@ class BitcoinTrader:
         current_price = self.get_market_price()
         
         for position_id, position in self.active_positions.items():
-            position_type = position['type']
-            position_size = position['size']
-            entry_price = position['entry_price']
+            position_type = position.type
+            position_size = position.size
+            entry_price = position.entry_price
             
             # Calculate current value and PnL
             position_value = position_size * current_price
@@ -210,6 +210,9 @@ class BitcoinTradingBot:
             leverage=trading_config['leverage']
         )
         
+        # Recover positions and fills from the last snapshot and WAL
+        trader.load_state()
+        
         # Configure trader
         trader.symbol = trading_config['symbol']
         trader.timeframe = trading_config['timeframe']
@@ -252,7 +255,8 @@ class BitcoinTradingBot:
                 if strat_name == 'MA':
                     strategy = MACrossoverStrategy(
                         fast_period=strat_params.get('fast_period', 12),
-                        slow_period=strat_params.get('slow_period', 26)
+                        slow_period=strat_params.get('slow_period', 26),
+                        ma_type=strat_params.get('ma_type', 'sma')
                     )
                 elif strat_name == 'RSI':
                     strategy = RSIStrategy(
@@ -283,7 +287,8 @@ class BitcoinTradingBot:
             params = strategy_config.get('params', {})
             return MACrossoverStrategy(
                 fast_period=params.get('fast_period', 12),
-                slow_period=params.get('slow_period', 26)
+                slow_period=params.get('slow_period', 26),
+                ma_type=params.get('ma_type', 'sma')
             )
         
         elif strategy_type == 'RSI':
@@ -0,0 +1,386 @@
+import time
+import logging
+import numpy as np
+import pandas as pd
+
+# Binance perpetual futures settle funding every 8 hours
+FUNDING_INTERVAL_NS = 8 * 60 * 60 * 1_000_000_000
+
+
+class StrategyBacktester:
+    """
+    Vectorized backtester for BaseTradingStrategy implementations.
+
+    Signals are generated for the whole history at once with
+    strategy.generate_signals(). The trade loop only iterates over trades
+    (not bars), and the equity curve is marked to market in bulk with
+    numpy. Trading rules follow BitcoinTradingBot/BitcoinTrader: one
+    position at a time, an opposite signal closes and reverses it, and
+    stop loss / take profit are fixed price levels set at entry.
+    """
+
+    def __init__(self, strategy, initial_capital=10000.0, leverage=3,
+                 position_size_pct=0.1, stop_loss_pct=0.05, take_profit_pct=0.15,
+                 fee_rate=0.0004, slippage=0.0002, funding_rate=0.0001,
+                 confidence_threshold=60):
+        """
+        Initialize the StrategyBacktester
+
+        Parameters:
+        -----------
+        strategy : BaseTradingStrategy
+            Strategy to backtest
+        initial_capital : float
+            Starting account balance in USDT (default: 10000)
+        leverage : int
+            Leverage applied to each position (default: 3x)
+        position_size_pct : float
+            Fraction of equity used as margin per position (default: 0.1)
+        stop_loss_pct : float
+            Stop loss distance from the entry price (default: 0.05)
+        take_profit_pct : float
+            Take profit distance from the entry price (default: 0.15)
+        fee_rate : float
+            Taker fee charged on notional at entry and exit (default: 0.0004)
+        slippage : float
+            Adverse price slippage applied to every fill (default: 0.0002)
+        funding_rate : float
+            Funding rate per 8 hour period, paid by longs and received by shorts (default: 0.0001)
+        confidence_threshold : float
+            Minimum signal confidence required to trade (default: 60)
+        """
+        self.strategy = strategy
+        self.initial_capital = initial_capital
+        self.leverage = leverage
+        self.position_size_pct = position_size_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.funding_rate = funding_rate
+        self.confidence_threshold = confidence_threshold
+        self.logger = logging.getLogger("StrategyBacktester")
+
+    @classmethod
+    def from_config(cls, strategy, config, **kwargs):
+        """
+        Create a backtester from a BitcoinTradingBot configuration dict
+
+        Parameters:
+        -----------
+        strategy : BaseTradingStrategy
+            Strategy to backtest
+        config : dict
+            Bot configuration with 'trading' and 'strategy' sections
+        **kwargs
+            Overrides for any other constructor argument
+
+        Returns:
+        --------
+        StrategyBacktester : Configured backtester
+        """
+        trading = config.get('trading', {})
+        params = {
+            'leverage': trading.get('leverage', 3),
+            'position_size_pct': trading.get('position_size_pct', 0.1),
+            'stop_loss_pct': trading.get('stop_loss_pct', 0.05),
+            'take_profit_pct': trading.get('take_profit_pct', 0.15),
+            'confidence_threshold': config.get('strategy', {}).get('confidence_threshold', 60),
+        }
+        params.update(kwargs)
+        return cls(strategy, **params)
+
+    def run(self, data, signals=None):
+        """
+        Run the backtest over the given OHLCV data
+
+        Parameters:
+        -----------
+        data : pandas.DataFrame
+            OHLCV data indexed by timestamp, as returned by BitcoinTrader.get_historical_data
+        signals : pandas.DataFrame
+            Precomputed output of strategy.generate_signals (optional)
+
+        Returns:
+        --------
+        dict : 'equity' (pandas.Series), 'positions' (pandas.Series),
+               'trades' (pandas.DataFrame) and 'stats' (dict)
+        """
+        if signals is None:
+            signals = self.strategy.generate_signals(data)
+
+        actions = signals['action'].to_numpy()
+        confidence = signals['confidence'].to_numpy()
+        signal = np.where(confidence >= self.confidence_threshold, actions, 0).astype(np.int8)
+
+        close = data['close'].to_numpy(dtype=float)
+        high = data['high'].to_numpy(dtype=float)
+        low = data['low'].to_numpy(dtype=float)
+        funding_count = self._funding_events(data.index)
+
+        trades = self._simulate_trades(signal, close, high, low, funding_count)
+        equity, positions = self._equity_curve(trades, close, funding_count)
+
+        trades_df = self._trades_frame(trades, data.index)
+        equity = pd.Series(equity, index=data.index, name='equity')
+        positions = pd.Series(positions, index=data.index, name='position')
+
+        return {
+            'equity': equity,
+            'positions': positions,
+            'trades': trades_df,
+            'stats': self._calculate_stats(equity, positions, trades_df)
+        }
+
+    def _funding_events(self, index):
+        """Cumulative number of funding settlements up to each bar"""
+        if not isinstance(index, pd.DatetimeIndex) or len(index) == 0:
+            return np.zeros(len(index), dtype=np.int64)
+
+        periods = index.asi8 // FUNDING_INTERVAL_NS
+        events = np.zeros(len(index), dtype=np.int64)
+        events[1:] = periods[1:] != periods[:-1]
+        return np.cumsum(events)
+
+    @staticmethod
+    def _first_hit(mask_fn, start, stop):
+        """
+        Find the first bar in [start, stop] where mask_fn is true
+
+        Scans in growing chunks so a trade stopped out early does not pay for
+        scanning up to the next opposite signal.
+        """
+        size = 256
+        while start <= stop:
+            end = min(stop + 1, start + size)
+            hits = np.flatnonzero(mask_fn(start, end))
+            if len(hits):
+                return start + hits[0]
+            start = end
+            size *= 2
+        return -1
+
+    def _simulate_trades(self, signal, close, high, low, funding_count):
+        """
+        Walk the signal array trade by trade
+
+        Returns:
+        --------
+        dict of numpy arrays : One entry per trade
+        """
+        n = len(close)
+        buy_idx = np.flatnonzero(signal > 0)
+        sell_idx = np.flatnonzero(signal < 0)
+        signal_idx = np.flatnonzero(signal != 0)
+
+        trades = {key: [] for key in (
+            'entry_idx', 'exit_idx', 'side', 'entry_price', 'exit_price',
+            'exit_reason', 'funding_periods', 'equity_before', 'equity_after'
+        )}
+        frac = self.position_size_pct * self.leverage
+        equity = self.initial_capital
+
+        # Index of the next signal bar to consider for an entry
+        cursor = np.searchsorted(signal_idx, 0)
+        while cursor < len(signal_idx):
+            entry = signal_idx[cursor]
+            side = int(signal[entry])
+            if entry >= n - 1:
+                break
+
+            entry_price = close[entry] * (1 + side * self.slippage)
+            if side > 0:
+                stop_price = entry_price * (1 - self.stop_loss_pct)
+                target_price = entry_price * (1 + self.take_profit_pct)
+                opposite = sell_idx
+            else:
+                stop_price = entry_price * (1 + self.stop_loss_pct)
+                target_price = entry_price * (1 - self.take_profit_pct)
+                opposite = buy_idx
+
+            pos = np.searchsorted(opposite, entry, side='right')
+            reverse_at = opposite[pos] if pos < len(opposite) else n - 1
+
+            if side > 0:
+                stop_at = self._first_hit(lambda a, b: low[a:b] <= stop_price, entry + 1, reverse_at)
+                target_at = self._first_hit(lambda a, b: high[a:b] >= target_price, entry + 1, reverse_at)
+            else:
+                stop_at = self._first_hit(lambda a, b: high[a:b] >= stop_price, entry + 1, reverse_at)
+                target_at = self._first_hit(lambda a, b: low[a:b] <= target_price, entry + 1, reverse_at)
+
+            # The bot checks signals before monitoring stops, but intrabar the
+            # stop is always hit before the close. A bar touching both levels
+            # is counted as a stop loss.
+            if stop_at >= 0 and (target_at < 0 or stop_at <= target_at):
+                exit_idx, reason, raw_exit = stop_at, 'stop_loss', stop_price
+            elif target_at >= 0:
+                exit_idx, reason, raw_exit = target_at, 'take_profit', target_price
+            elif pos < len(opposite):
+                exit_idx, reason, raw_exit = reverse_at, 'signal', close[reverse_at]
+            else:
+                exit_idx, reason, raw_exit = n - 1, 'end', close[n - 1]
+
+            exit_price = raw_exit * (1 - side * self.slippage)
+            funding_periods = funding_count[exit_idx] - funding_count[entry]
+            trade_return = frac * (
+                side * (exit_price / entry_price - 1)
+                - 2 * self.fee_rate
+                - side * self.funding_rate * funding_periods
+            )
+
+            trades['entry_idx'].append(entry)
+            trades['exit_idx'].append(exit_idx)
+            trades['side'].append(side)
+            trades['entry_price'].append(entry_price)
+            trades['exit_price'].append(exit_price)
+            trades['exit_reason'].append(reason)
+            trades['funding_periods'].append(funding_periods)
+            trades['equity_before'].append(equity)
+            equity = equity * (1 + trade_return)
+            trades['equity_after'].append(equity)
+
+            # A reversal re-enters on the same bar; stops wait for the next signal
+            if reason == 'signal':
+                cursor = np.searchsorted(signal_idx, exit_idx)
+            else:
+                cursor = np.searchsorted(signal_idx, exit_idx, side='right')
+
+        return {key: np.asarray(values) for key, values in trades.items()}
+
+    def _equity_curve(self, trades, close, funding_count):
+        """
+        Mark every bar to market in one vectorized pass
+
+        Returns:
+        --------
+        tuple : (equity array, position array of 1 / 0 / -1)
+        """
+        n = len(close)
+        trade_id = np.full(n, -1, dtype=np.int64)
+        positions = np.zeros(n, dtype=np.int8)
+        realized = np.full(n, np.nan)
+        realized[0] = self.initial_capital
+
+        for k in range(len(trades['side'])):
+            entry, exit_idx = trades['entry_idx'][k], trades['exit_idx'][k]
+            trade_id[entry:exit_idx] = k
+            positions[entry + 1:exit_idx + 1] = trades['side'][k]
+            realized[exit_idx] = trades['equity_after'][k]
+
+        equity = pd.Series(realized).ffill().to_numpy(copy=True)
+        open_bars = np.flatnonzero(trade_id >= 0)
+        if len(open_bars):
+            k = trade_id[open_bars]
+            side = trades['side'][k]
+            entry_idx = trades['entry_idx'][k]
+            frac = self.position_size_pct * self.leverage
+            unrealized = frac * (
+                side * (close[open_bars] / trades['entry_price'][k] - 1)
+                - self.fee_rate
+                - side * self.funding_rate * (funding_count[open_bars] - funding_count[entry_idx])
+            )
+            equity[open_bars] = trades['equity_before'][k] * (1 + unrealized)
+
+        return equity, positions
+
+    def _trades_frame(self, trades, index):
+        """Build the trade list in BitcoinTrader position_history terms"""
+        columns = ['entry_time', 'exit_time', 'type', 'entry_price', 'exit_price',
+                   'exit_reason', 'pnl_pct', 'pnl', 'bars_held', 'fees']
+        if len(trades['side']) == 0:
+            return pd.DataFrame(columns=columns)
+
+        side = trades['side']
+        entry_price = trades['entry_price']
+        notional = trades['equity_before'] * self.position_size_pct * self.leverage
+
+        return pd.DataFrame({
+            'entry_time': index[trades['entry_idx']],
+            'exit_time': index[trades['exit_idx']],
+            'type': np.where(side > 0, 'long', 'short'),
+            'entry_price': entry_price,
+            'exit_price': trades['exit_price'],
+            'exit_reason': trades['exit_reason'],
+            # Leveraged price move, same definition as BitcoinTrader.close_position
+            'pnl_pct': side * (trades['exit_price'] - entry_price) / entry_price * 100 * self.leverage,
+            'pnl': trades['equity_after'] - trades['equity_before'],
+            'bars_held': trades['exit_idx'] - trades['entry_idx'],
+            'fees': notional * 2 * self.fee_rate
+        }, columns=columns)
+
+    def _calculate_stats(self, equity, positions, trades):
+        """
+        Summarize the backtest
+
+        Returns:
+        --------
+        dict : Performance statistics
+        """
+        values = equity.to_numpy()
+        final_equity = float(values[-1]) if len(values) else self.initial_capital
+        peak = np.maximum.accumulate(values) if len(values) else values
+        drawdown = (values - peak) / peak if len(values) else values
+
+        returns = np.diff(values) / values[:-1] if len(values) > 1 else np.array([])
+        sharpe = 0.0
+        if len(returns) and returns.std() > 0 and isinstance(equity.index, pd.DatetimeIndex):
+            bar_seconds = np.median(np.diff(equity.index.asi8)) / 1e9
+            if bar_seconds > 0:
+                bars_per_year = 365 * 24 * 60 * 60 / bar_seconds
+                sharpe = float(returns.mean() / returns.std() * np.sqrt(bars_per_year))
+
+        pnl = trades['pnl'].to_numpy(dtype=float) if len(trades) else np.array([])
+        gross_profit = pnl[pnl > 0].sum()
+        gross_loss = -pnl[pnl < 0].sum()
+
+        return {
+            'initial_capital': self.initial_capital,
+            'final_equity': final_equity,
+            'total_return_pct': (final_equity / self.initial_capital - 1) * 100,
+            'max_drawdown_pct': float(drawdown.min() * 100) if len(drawdown) else 0.0,
+            'sharpe_ratio': sharpe,
+            'total_trades': int(len(trades)),
+            'win_rate': float((pnl > 0).mean() * 100) if len(pnl) else 0.0,
+            'profit_factor': float(gross_profit / gross_loss) if gross_loss > 0 else float('inf') if gross_profit > 0 else 0.0,
+            'avg_trade_pnl_pct': float(trades['pnl_pct'].mean()) if len(trades) else 0.0,
+            'total_fees': float(trades['fees'].sum()) if len(trades) else 0.0,
+            'exposure_pct': float((positions.to_numpy() != 0).mean() * 100) if len(positions) else 0.0
+        }
+
+
+if __name__ == "__main__":
+    from BaseTradingStrategy import (
+        MACrossoverStrategy, RSIStrategy, BollingerBandsStrategy, MACDStrategy, CombinedStrategy
+    )
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    # One year of synthetic 1-minute BTC bars
+    bars = 365 * 24 * 60
+    rng = np.random.default_rng(42)
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 0.0008, bars)))
+    spread = np.abs(rng.normal(0, 0.0005, bars)) * close
+    data = pd.DataFrame({
+        'open': np.concatenate(([close[0]], close[:-1])),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(1, 100, bars)
+    }, index=pd.date_range('2024-01-01', periods=bars, freq='1min', name='timestamp'))
+
+    strategy = CombinedStrategy([
+        MACrossoverStrategy(12, 26),
+        RSIStrategy(14, 30, 70),
+        BollingerBandsStrategy(20, 2),
+        MACDStrategy(12, 26, 9)
+    ])
+    backtester = StrategyBacktester(strategy, confidence_threshold=20)
+
+    start = time.perf_counter()
+    result = backtester.run(data)
+    elapsed = time.perf_counter() - start
+
+    print(f"Backtested {bars:,} bars in {elapsed:.2f}s")
+    for key, value in result['stats'].items():
+        print(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
+    print(result['trades'].tail())
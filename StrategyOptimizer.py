@@ -0,0 +1,501 @@
+import os
+import copy
+import json
+import time
+import random
+import sqlite3
+import logging
+import itertools
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from BaseTradingStrategy import (
+    MACrossoverStrategy, RSIStrategy, BollingerBandsStrategy, MACDStrategy, CombinedStrategy
+)
+from StrategyBacktester import StrategyBacktester
+from indicatorGraph import IndicatorGraph
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+METRIC_COLUMNS = [
+    'total_return_pct', 'max_drawdown_pct', 'sharpe_ratio', 'total_trades',
+    'win_rate', 'profit_factor', 'avg_trade_pnl_pct', 'exposure_pct'
+]
+
+STRATEGY_CLASSES = {
+    'MA': MACrossoverStrategy,
+    'RSI': RSIStrategy,
+    'BB': BollingerBandsStrategy,
+    'MACD': MACDStrategy
+}
+
+# Indicator series each worker keeps cached across the combos it evaluates
+GRAPH_MAX_NODES = 64
+
+
+def build_strategy(strategy_config):
+    """
+    Build a strategy from the 'strategy' section of a BitcoinTradingBot config
+
+    Mirrors BitcoinTradingBot.setup_strategy without needing an exchange connection.
+
+    Parameters:
+    -----------
+    strategy_config : dict
+        Strategy configuration ('type', 'strategies' or 'params')
+
+    Returns:
+    --------
+    BaseTradingStrategy : Configured strategy instance
+    """
+    strategy_type = strategy_config.get('type', 'combined')
+
+    if strategy_type == 'combined':
+        combined = CombinedStrategy()
+        for strat_config in strategy_config.get('strategies', []):
+            strategy_class = STRATEGY_CLASSES.get(strat_config['name'])
+            if strategy_class is None:
+                continue
+            combined.add_strategy(strategy_class(**strat_config.get('params', {})),
+                                  strat_config.get('weight', 1.0))
+        return combined
+
+    strategy_class = STRATEGY_CLASSES.get(strategy_type, MACDStrategy)
+    return strategy_class(**strategy_config.get('params', {}))
+
+
+def apply_params(config, params):
+    """
+    Return a copy of a bot config with the given parameters applied
+
+    Parameter keys:
+    ---------------
+    'confidence_threshold'   -> config['strategy']['confidence_threshold']
+    'trading.<key>'          -> config['trading'][<key>]
+    '<NAME>.weight'          -> weight of sub-strategy <NAME> (MA, RSI, BB, MACD)
+    '<NAME>.<param>'         -> params of sub-strategy <NAME>
+    'params.<param>'         -> params of a single (non-combined) strategy
+    """
+    config = copy.deepcopy(config)
+    strategy_config = config.setdefault('strategy', {})
+    sub_strategies = {s['name']: s for s in strategy_config.get('strategies', [])}
+
+    for key, value in params.items():
+        if key == 'confidence_threshold':
+            strategy_config['confidence_threshold'] = value
+            continue
+
+        section, _, name = key.partition('.')
+        if section == 'trading':
+            config.setdefault('trading', {})[name] = value
+        elif section == 'params':
+            strategy_config.setdefault('params', {})[name] = value
+        elif section in sub_strategies:
+            if name == 'weight':
+                sub_strategies[section]['weight'] = value
+            else:
+                sub_strategies[section].setdefault('params', {})[name] = value
+        else:
+            raise KeyError(f"Unknown parameter: {key}")
+
+    return config
+
+
+# Worker process state, attached once per process by _init_worker
+_worker_state = {}
+
+
+def _init_worker(price_shm_name, time_shm_name, length, base_config, costs):
+    """Attach to the shared OHLCV arrays without copying them"""
+    price_shm = shared_memory.SharedMemory(name=price_shm_name)
+    time_shm = shared_memory.SharedMemory(name=time_shm_name)
+    prices = np.ndarray((len(OHLCV_COLUMNS), length), dtype=np.float64, buffer=price_shm.buf)
+    timestamps = np.ndarray((length,), dtype=np.int64, buffer=time_shm.buf)
+
+    index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='timestamp')
+    data = pd.DataFrame({col: prices[i] for i, col in enumerate(OHLCV_COLUMNS)},
+                        index=index, copy=False)
+
+    # Keep the handles referenced so the buffers stay mapped. Combos evaluated
+    # by this worker share one indicator graph, so a series used by several
+    # parameter sets (e.g. rsi(close, 14) across threshold sweeps) is computed once.
+    # The graph lives as long as the worker, so its cache is bounded.
+    _worker_state.update({
+        'shm': (price_shm, time_shm),
+        'data': data,
+        'graph': IndicatorGraph(max_nodes=GRAPH_MAX_NODES),
+        'base_config': base_config,
+        'costs': costs
+    })
+
+
+def _evaluate_combo(task):
+    """
+    Backtest one parameter combination on every walk-forward segment
+
+    Signals are generated once over the full history and sliced per
+    segment, so indicator warm-up never eats into a test window.
+    """
+    combo_id, params, splits = task
+    data = _worker_state['data']
+    config = apply_params(_worker_state['base_config'], params)
+
+    strategy = build_strategy(config['strategy'])
+    strategy.share_graph(_worker_state['graph'])
+    backtester = StrategyBacktester.from_config(strategy, config, **_worker_state['costs'])
+    signals = backtester.strategy.generate_signals(data)
+
+    rows = []
+    for fold, segments in enumerate(splits):
+        for segment, (start, end) in zip(('train', 'test'), segments):
+            if end <= start:
+                continue
+            stats = backtester.run(data.iloc[start:end], signals=signals.iloc[start:end])['stats']
+            rows.append((combo_id, fold, segment) + tuple(stats[m] for m in METRIC_COLUMNS))
+    return combo_id, params, rows
+
+
+class StrategyOptimizer:
+    """
+    Parallel parameter sweep and walk-forward optimizer for strategy configs.
+
+    OHLCV history is placed in shared memory once and attached by every
+    worker in a process pool. Each parameter combination is backtested with
+    StrategyBacktester on all walk-forward folds, and results are written
+    to a SQLite results store for ranking.
+    """
+
+    def __init__(self, data, base_config, results_db='optimizer_results.db',
+                 objective='sharpe_ratio', max_workers=None, costs=None):
+        """
+        Initialize the StrategyOptimizer
+
+        Parameters:
+        -----------
+        data : pandas.DataFrame
+            OHLCV data indexed by timestamp
+        base_config : dict
+            BitcoinTradingBot configuration the parameters are applied to
+        results_db : str
+            Path of the SQLite results store (default: 'optimizer_results.db')
+        objective : str
+            Statistic used for ranking, one of METRIC_COLUMNS (default: 'sharpe_ratio')
+        max_workers : int
+            Number of worker processes (default: all cores)
+        costs : dict
+            Fee, slippage and funding overrides passed to StrategyBacktester
+        """
+        if objective not in METRIC_COLUMNS:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        self.data = data
+        self.base_config = base_config
+        self.results_db = results_db
+        self.objective = objective
+        self.max_workers = max_workers or os.cpu_count()
+        self.costs = costs or {}
+        self.logger = logging.getLogger("StrategyOptimizer")
+        self._init_results_db()
+
+    def _init_results_db(self):
+        """Create the results tables if they do not exist"""
+        metric_defs = ', '.join(f"{m} REAL" for m in METRIC_COLUMNS)
+        with sqlite3.connect(self.results_db) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    created_at TEXT,
+                    objective TEXT,
+                    base_config TEXT,
+                    splits TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS combos (
+                    run_id INTEGER,
+                    combo_id INTEGER,
+                    params TEXT,
+                    PRIMARY KEY (run_id, combo_id)
+                ) WITHOUT ROWID
+            ''')
+            conn.execute(f'''
+                CREATE TABLE IF NOT EXISTS results (
+                    run_id INTEGER,
+                    combo_id INTEGER,
+                    fold INTEGER,
+                    segment TEXT,
+                    {metric_defs},
+                    PRIMARY KEY (run_id, combo_id, fold, segment)
+                ) WITHOUT ROWID
+            ''')
+
+    @staticmethod
+    def grid(param_space, constraint=None):
+        """
+        Expand a parameter space into every combination
+
+        Parameters:
+        -----------
+        param_space : dict
+            Parameter key -> list of candidate values
+        constraint : callable
+            Optional filter, called with a params dict (e.g. fast < slow)
+
+        Returns:
+        --------
+        list : Parameter dicts
+        """
+        keys = list(param_space)
+        combos = (dict(zip(keys, values)) for values in itertools.product(*param_space.values()))
+        return [params for params in combos if constraint is None or constraint(params)]
+
+    @staticmethod
+    def random_search(param_space, n_iter, seed=None, constraint=None):
+        """
+        Sample distinct combinations from a parameter space
+
+        The grid is never materialized: combination numbers are sampled and
+        decoded, so very large spaces are cheap to sample from.
+
+        Returns:
+        --------
+        list : Up to n_iter parameter dicts
+        """
+        keys = list(param_space)
+        sizes = [len(param_space[key]) for key in keys]
+        total = int(np.prod(sizes, dtype=object))
+        rng = random.Random(seed)
+
+        combos = []
+        for number in rng.sample(range(total), min(n_iter, total)):
+            params = {}
+            for key, size in zip(reversed(keys), reversed(sizes)):
+                number, pos = divmod(number, size)
+                params[key] = param_space[key][pos]
+            params = {key: params[key] for key in keys}
+            if constraint is None or constraint(params):
+                combos.append(params)
+        return combos
+
+    def walk_forward_splits(self, n_splits=4, train_ratio=0.7, anchored=False):
+        """
+        Build walk-forward train/test windows as bar index ranges
+
+        Parameters:
+        -----------
+        n_splits : int
+            Number of folds (default: 4)
+        train_ratio : float
+            Share of each fold used for training (default: 0.7)
+        anchored : bool
+            Grow the train window from the start of the data instead of rolling it
+
+        Returns:
+        --------
+        list : [((train_start, train_end), (test_start, test_end)), ...]
+        """
+        n = len(self.data)
+        fold_size = n // n_splits
+        train_size = int(fold_size * train_ratio)
+        test_size = fold_size - train_size
+
+        splits = []
+        for fold in range(n_splits):
+            test_end = n if fold == n_splits - 1 else (fold + 1) * fold_size
+            test_start = (fold + 1) * fold_size - test_size
+            train_start = 0 if anchored else fold * fold_size
+            splits.append(((train_start, test_start), (test_start, test_end)))
+        return splits
+
+    def optimize(self, param_sets, splits=None, chunksize=None):
+        """
+        Backtest every parameter set across the process pool
+
+        Parameters:
+        -----------
+        param_sets : list
+            Parameter dicts from grid() or random_search()
+        splits : list
+            Walk-forward windows (default: whole history as a single train window)
+        chunksize : int
+            Tasks sent to a worker at a time (default: balanced over workers)
+
+        Returns:
+        --------
+        int : run_id of the stored results
+        """
+        n = len(self.data)
+        splits = splits or [((0, n), (n, n))]
+        run_id = self._create_run(splits)
+        chunksize = chunksize or max(1, len(param_sets) // (self.max_workers * 8))
+
+        price_shm, time_shm = self._share_data()
+        start = time.perf_counter()
+        try:
+            tasks = ((combo_id, params, splits) for combo_id, params in enumerate(param_sets))
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(price_shm.name, time_shm.name, n, self.base_config, self.costs)
+            ) as executor, sqlite3.connect(self.results_db) as conn:
+                combo_rows, result_rows = [], []
+                for done, (combo_id, params, rows) in enumerate(
+                        executor.map(_evaluate_combo, tasks, chunksize=chunksize), 1):
+                    combo_rows.append((run_id, combo_id, json.dumps(params)))
+                    result_rows.extend((run_id,) + row for row in rows)
+
+                    if len(combo_rows) >= 500 or done == len(param_sets):
+                        self._write_results(conn, combo_rows, result_rows)
+                        combo_rows, result_rows = [], []
+                        self.logger.info(f"Run {run_id}: {done}/{len(param_sets)} combinations evaluated")
+        finally:
+            price_shm.close()
+            price_shm.unlink()
+            time_shm.close()
+            time_shm.unlink()
+
+        self.logger.info(f"Run {run_id} finished in {time.perf_counter() - start:.1f}s")
+        return run_id
+
+    def _share_data(self):
+        """Copy the OHLCV history into shared memory once"""
+        n = len(self.data)
+        price_shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * len(OHLCV_COLUMNS) * n))
+        time_shm = shared_memory.SharedMemory(create=True, size=max(1, 8 * n))
+
+        prices = np.ndarray((len(OHLCV_COLUMNS), n), dtype=np.float64, buffer=price_shm.buf)
+        for i, col in enumerate(OHLCV_COLUMNS):
+            prices[i] = self.data[col].to_numpy(dtype=np.float64)
+        timestamps = np.ndarray((n,), dtype=np.int64, buffer=time_shm.buf)
+        timestamps[:] = pd.DatetimeIndex(self.data.index).as_unit('ns').asi8
+
+        return price_shm, time_shm
+
+    def _create_run(self, splits):
+        """Register a new optimization run"""
+        with sqlite3.connect(self.results_db) as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (created_at, objective, base_config, splits) VALUES (?, ?, ?, ?)",
+                (datetime.now().isoformat(), self.objective,
+                 json.dumps(self.base_config), json.dumps(splits))
+            )
+            return cursor.lastrowid
+
+    @staticmethod
+    def _write_results(conn, combo_rows, result_rows):
+        """Insert a batch of combinations and their fold statistics"""
+        placeholders = ', '.join('?' * (4 + len(METRIC_COLUMNS)))
+        conn.executemany("INSERT INTO combos VALUES (?, ?, ?)", combo_rows)
+        conn.executemany(f"INSERT INTO results VALUES ({placeholders})", result_rows)
+        conn.commit()
+
+    def ranked_results(self, run_id, segment='test', top=20):
+        """
+        Rank combinations by their mean objective across folds
+
+        Parameters:
+        -----------
+        run_id : int
+            Run returned by optimize()
+        segment : str
+            'train' or 'test' (default: 'test', out-of-sample)
+        top : int
+            Number of rows to return (default: 20)
+
+        Returns:
+        --------
+        pandas.DataFrame : Ranked combinations with averaged statistics
+        """
+        averages = ', '.join(f"AVG(r.{m}) AS {m}" for m in METRIC_COLUMNS)
+        query = f'''
+            SELECT r.combo_id, c.params, {averages}
+            FROM results r JOIN combos c ON c.run_id = r.run_id AND c.combo_id = r.combo_id
+            WHERE r.run_id = ? AND r.segment = ?
+            GROUP BY r.combo_id
+            ORDER BY {self.objective} DESC
+            LIMIT ?
+        '''
+        with sqlite3.connect(self.results_db) as conn:
+            ranked = pd.read_sql_query(query, conn, params=(run_id, segment, top))
+        ranked['params'] = ranked['params'].map(json.loads)
+        return ranked
+
+    def walk_forward_report(self, run_id):
+        """
+        Pick the best train combination per fold and report it out-of-sample
+
+        Returns:
+        --------
+        pandas.DataFrame : One row per fold with train and test statistics
+        """
+        query = f'''
+            SELECT tr.fold, tr.combo_id, c.params,
+                   tr.{self.objective} AS train_{self.objective},
+                   {', '.join(f"te.{m} AS test_{m}" for m in METRIC_COLUMNS)}
+            FROM results tr
+            JOIN results te ON te.run_id = tr.run_id AND te.combo_id = tr.combo_id
+                           AND te.fold = tr.fold AND te.segment = 'test'
+            JOIN combos c ON c.run_id = tr.run_id AND c.combo_id = tr.combo_id
+            WHERE tr.run_id = ? AND tr.segment = 'train'
+              AND tr.{self.objective} = (
+                  SELECT MAX(x.{self.objective}) FROM results x
+                  WHERE x.run_id = tr.run_id AND x.fold = tr.fold AND x.segment = 'train'
+              )
+            GROUP BY tr.fold
+            ORDER BY tr.fold
+        '''
+        with sqlite3.connect(self.results_db) as conn:
+            report = pd.read_sql_query(query, conn, params=(run_id,))
+        report['params'] = report['params'].map(json.loads)
+        return report
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    # Two years of synthetic 1-hour BTC bars
+    bars = 2 * 365 * 24
+    rng = np.random.default_rng(7)
+    close = 60000 * np.exp(np.cumsum(rng.normal(0, 0.006, bars)))
+    spread = np.abs(rng.normal(0, 0.003, bars)) * close
+    data = pd.DataFrame({
+        'open': np.concatenate(([close[0]], close[:-1])),
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.uniform(1, 100, bars)
+    }, index=pd.date_range('2023-01-01', periods=bars, freq='1h', name='timestamp'))
+
+    base_config = {
+        'trading': {'leverage': 3, 'position_size_pct': 0.1, 'stop_loss_pct': 0.05, 'take_profit_pct': 0.15},
+        'strategy': {
+            'type': 'combined',
+            'strategies': [
+                {'name': 'MA', 'weight': 1.0, 'params': {'fast_period': 12, 'slow_period': 26}},
+                {'name': 'RSI', 'weight': 0.8, 'params': {'period': 14, 'oversold': 30, 'overbought': 70}},
+                {'name': 'MACD', 'weight': 1.0, 'params': {'fast_period': 12, 'slow_period': 26, 'signal_period': 9}}
+            ],
+            'confidence_threshold': 60
+        }
+    }
+    param_space = {
+        'MA.fast_period': [5, 8, 12, 16, 20],
+        'MA.slow_period': [26, 40, 50, 100],
+        'RSI.period': [7, 14, 21],
+        'RSI.oversold': [20, 25, 30],
+        'MACD.weight': [0.5, 1.0, 1.5],
+        'confidence_threshold': [20, 40, 60],
+        'trading.stop_loss_pct': [0.02, 0.05]
+    }
+
+    optimizer = StrategyOptimizer(data, base_config, results_db='optimizer_results.db')
+    param_sets = optimizer.random_search(param_space, n_iter=200, seed=1,
+                                         constraint=lambda p: p['MA.fast_period'] < p['MA.slow_period'])
+    run_id = optimizer.optimize(param_sets, splits=optimizer.walk_forward_splits(n_splits=4))
+
+    pd.set_option('display.width', 200)
+    print(optimizer.ranked_results(run_id, top=5)[['combo_id', 'params', 'sharpe_ratio', 'total_return_pct']])
+    print(optimizer.walk_forward_report(run_id))
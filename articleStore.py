@@ -0,0 +1,284 @@
+import os
+import hashlib
+import logging
+import threading
+
+from timeUtils import to_epoch_ms, now_ms
+from records import Article
+import serialization
+
+logger = logging.getLogger(__name__)
+
+# 역색인 이름 -> 기사 필드
+INDEX_FIELDS = {
+    'coin': 'related_coins',
+    'influencer': 'related_influencers',
+    'category': 'special_categories',
+    'risk': 'risk_level'
+}
+
+
+def article_key(article):
+    """기사 고유 키 (URL 해시, URL이 없으면 출처+제목 해시)"""
+    basis = article.get('url') or f"{article.get('source')}|{article.get('title')}"
+    return hashlib.sha1(basis.encode('utf-8')).hexdigest()[:16]
+
+
+class ArticleStore:
+    """
+    뉴스 기사 단일 저장소
+
+    URL 해시를 키로 기사를 한 번만 저장하고, 코인/인플루언서/카테고리/위험도
+    역색인을 삽입 시점에 갱신한다. 디스크에는 추가 전용 JSONL 로그
+    (news/article_store.jsonl)로 남기므로 쓰기 비용은 새 기사 수에만 비례한다.
+    다른 프로세스(reverageAI)는 refresh()로 로그의 새 줄만 읽어 색인을 따라간다.
+    """
+
+    def __init__(self, path="news/article_store.jsonl"):
+        self.path = path
+        self.articles = {}
+        self.indexes = {name: {} for name in INDEX_FIELDS}
+        self._times = {}
+        self._offset = 0
+        self._inode = None
+        self._log_lines = 0
+        self._lock = threading.RLock()
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # 색인 관리
+    # ------------------------------------------------------------------
+    def _index_values(self, article, name):
+        value = article.get(INDEX_FIELDS[name])
+        if value is None:
+            return []
+        return value if isinstance(value, list) else [value]
+
+    def _apply(self, key, article):
+        """메모리 테이블과 색인에 기사 반영 (기존 색인 항목은 교체)"""
+        old = self.articles.get(key)
+        if old is not None:
+            for name in INDEX_FIELDS:
+                for value in self._index_values(old, name):
+                    postings = self.indexes[name].get(value)
+                    if postings:
+                        postings.discard(key)
+
+        if article is None:
+            self.articles.pop(key, None)
+            self._times.pop(key, None)
+            return
+
+        self.articles[key] = article
+        self._times[key] = article.get('timestamp_ms') or to_epoch_ms(article.get('timestamp')) or 0
+        for name in INDEX_FIELDS:
+            for value in self._index_values(article, name):
+                self.indexes[name].setdefault(value, set()).add(key)
+
+    def refresh(self):
+        """로그 파일에서 아직 읽지 않은 줄만 반영 (압축으로 파일이 바뀌면 다시 로드)"""
+        with self._lock:
+            try:
+                stat = os.stat(self.path)
+            except FileNotFoundError:
+                return 0
+
+            if stat.st_ino != self._inode or stat.st_size < self._offset:
+                self.articles = {}
+                self.indexes = {name: {} for name in INDEX_FIELDS}
+                self._times = {}
+                self._offset = 0
+                self._log_lines = 0
+                self._inode = stat.st_ino
+
+            if stat.st_size == self._offset:
+                return 0
+
+            applied = 0
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read()
+
+            # 쓰는 중인 마지막 줄은 다음 refresh에서 읽음
+            end = data.rfind(b'\n') + 1
+            for line in data[:end].splitlines():
+                if not line.strip():
+                    continue
+                try:
+                    record = serialization.loads(line)
+                except ValueError as e:
+                    logger.error(f"기사 저장소 로그 파싱 오류: {e}")
+                    continue
+                article = record.get('article')
+                self._apply(record['key'], Article.from_dict(article) if article is not None else None)
+                self._log_lines += 1
+                applied += 1
+
+            self._offset += end
+            return applied
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def add_many(self, articles):
+        """
+        기사 여러 개를 저장 (새 기사이거나 내용이 바뀐 경우만 기록)
+
+        Returns:
+        --------
+        list : 이번 배치 기사들의 키 (입력 순서)
+        """
+        keys = []
+        records = []
+        with self._lock:
+            self.refresh()
+            for article in articles:
+                article = Article.from_dict(article)
+                key = article_key(article)
+                keys.append(key)
+                if self.articles.get(key) == article:
+                    continue
+                self._apply(key, article)
+                records.append({'key': key, 'article': article})
+
+            if records:
+                self._append(records)
+        return keys
+
+    def add(self, article):
+        """기사 하나 저장, 키 반환"""
+        return self.add_many([article])[0]
+
+    def remove_older_than(self, max_hours_old):
+        """오래된 기사를 저장소에서 삭제 (삭제 기록을 로그에 남김)"""
+        cutoff = now_ms() - int(max_hours_old * 3600 * 1000)
+        with self._lock:
+            self.refresh()
+            expired = [key for key, ts in self._times.items() if ts < cutoff]
+            for key in expired:
+                self._apply(key, None)
+            if expired:
+                self._append([{'key': key, 'article': None} for key in expired])
+        return len(expired)
+
+    def _append(self, records):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        lines = ''.join(serialization.dumps_line(r) for r in records)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+        stat = os.stat(self.path)
+        self._inode = stat.st_ino
+        self._offset = stat.st_size
+        self._log_lines += len(records)
+
+        # 로그가 현재 기사 수의 3배를 넘으면 압축
+        if self._log_lines > max(1000, 3 * len(self.articles)):
+            self.compact()
+
+    def compact(self):
+        """현재 기사만 담은 새 로그로 교체 (임시 파일 작성 후 원자적 rename)"""
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for key, article in self.articles.items():
+                    f.write(serialization.dumps_line({'key': key, 'article': article}))
+            os.replace(tmp_path, self.path)
+
+            stat = os.stat(self.path)
+            self._inode = stat.st_ino
+            self._offset = stat.st_size
+            self._log_lines = len(self.articles)
+            logger.info(f"기사 저장소 압축 완료: {len(self.articles)}개")
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def get(self, key):
+        return self.articles.get(key)
+
+    def get_many(self, keys):
+        return [self.articles[key] for key in keys if key in self.articles]
+
+    def query(self, coin=None, influencer=None, category=None, risk_level=None,
+              keys=None, max_hours_old=None, limit=None):
+        """
+        색인 교집합으로 기사 조회 (최신순)
+
+        Parameters:
+        -----------
+        coin, influencer, category, risk_level : str
+            조건 (지정한 것만 적용)
+        keys : iterable
+            조회 대상 기사 키로 한정 (예: 최근 수집 배치)
+        max_hours_old : float
+            기사 timestamp 기준 최대 경과 시간
+        limit : int
+            최대 개수
+
+        Returns:
+        --------
+        list : 기사 dict 목록
+        """
+        with self._lock:
+            result = self._match(coin, influencer, category, risk_level, keys)
+
+            if max_hours_old is not None:
+                cutoff = now_ms() - int(max_hours_old * 3600 * 1000)
+                result = {key for key in result if self._times.get(key, 0) >= cutoff}
+
+            ordered = sorted(result, key=lambda key: self._times.get(key, 0), reverse=True)
+            if limit is not None:
+                ordered = ordered[:limit]
+            return [self.articles[key] for key in ordered]
+
+    def select(self, keys, coin=None, influencer=None, category=None, risk_level=None):
+        """주어진 키 순서를 유지한 채 조건에 맞는 기사만 반환"""
+        with self._lock:
+            matched = self._match(coin, influencer, category, risk_level)
+            return [self.articles[key] for key in keys if key in matched]
+
+    def _match(self, coin=None, influencer=None, category=None, risk_level=None, keys=None):
+        """조건별 색인 집합의 교집합 (작은 집합부터)"""
+        conditions = [('coin', coin), ('influencer', influencer),
+                      ('category', category), ('risk', risk_level)]
+        postings = [self.indexes[name].get(value, set()) for name, value in conditions if value is not None]
+        if keys is not None:
+            postings.append(set(keys))
+
+        if not postings:
+            return set(self.articles)
+        postings.sort(key=len)
+        return set(postings[0]).intersection(*postings[1:])
+
+    def counts(self, name, keys=None):
+        """색인 값별 기사 수 (keys 지정 시 해당 기사만)"""
+        with self._lock:
+            keys = set(keys) if keys is not None else None
+            return {
+                value: len(postings if keys is None else postings & keys)
+                for value, postings in self.indexes[name].items()
+                if (postings if keys is None else postings & keys)
+            }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import glob
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    store = ArticleStore("news/article_store_test.jsonl")
+    files = sorted(glob.glob("news/all_news_*.json"))
+    start = time.perf_counter()
+    for path in files:
+        store.add_many(serialization.load(path))
+    print(f"all_news 파일 {len(files)}개 적재: {time.perf_counter() - start:.2f}초, 기사 {len(store.articles)}개")
+
+    start = time.perf_counter()
+    result = store.query(coin='BTC', risk_level='HIGH', limit=5)
+    print(f"BTC 고위험 기사 조회: {(time.perf_counter() - start) * 1000:.2f}ms")
+    for article in result:
+        print(f"  {article.get('timestamp')} {article.get('title')}")
+    print(store.counts('coin'))
+    os.remove(store.path)
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+캔들 캐시 모듈
+심볼/타임프레임별 OHLCV를 NumPy 배열로 보관하고 새 봉만 증분으로 받아오는 공유 캐시
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# 상위 디렉토리 모듈 import
+sys.path.append(str(Path(__file__).parent.parent))
+from candleResampler import CandleResampler, COLUMNS, TIMEFRAME_MS
+
+logger = logging.getLogger(__name__)
+
+
+class CandleCache:
+    """
+    OHLCV 공유 캐시
+
+    처음에는 max_bars개를 받아오고, 이후에는 max_age초가 지났을 때만 마지막 봉 시각부터
+    (진행 중인 마지막 봉 + 새로 닫힌 봉) 받아와 덮어쓴다. 기술적 분석과 리스크 엔진이
+    같은 캔들을 공유하므로 심볼당 네트워크 요청은 갱신 주기마다 한 번이다.
+
+    1m/5m/15m/1h/4h는 CandleResampler가 1분봉 하나로 만들므로 타임프레임이 몇 개든
+    심볼당 갱신 요청은 새 1분봉 조회 한 번이다 (타임프레임별 과거 봉 시드는 처음 한 번).
+    그 외 타임프레임(1d 등)은 거래소 봉을 그대로 받아온다.
+    """
+
+    def __init__(self, exchange, max_bars: int = 1000, max_age: float = 60.0):
+        """
+        Parameters:
+        -----------
+        exchange : ccxt.Exchange
+            fetch_ohlcv를 제공하는 거래소 객체
+        max_bars : int
+            심볼/타임프레임별 최대 보관 봉 수
+        max_age : float
+            캐시를 갱신하지 않고 그대로 쓰는 최대 시간 (초)
+        """
+        self.exchange = exchange
+        self.max_bars = max_bars
+        self.max_age = max_age
+        self._data: Dict[tuple, np.ndarray] = {}
+        self._fetched_at: Dict[tuple, float] = {}
+        self._synced_at: Dict[str, float] = {}
+        self.resampler = CandleResampler(capacity=max_bars)
+        self._lock = threading.Lock()
+
+    def _fetch(self, symbol: str, timeframe: str, since: Optional[int]) -> np.ndarray:
+        if since is None:
+            rows = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=self.max_bars)
+        else:
+            rows = self.exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=since)
+        return np.asarray(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+
+    def refresh(self, symbol: str, timeframe: str = '1h', force: bool = False) -> Optional[np.ndarray]:
+        """
+        필요할 때만 증분 갱신 후 배열 반환
+
+        Returns:
+        --------
+        np.ndarray : (봉 수, 6) 배열 [timestamp, open, high, low, close, volume] (없으면 None)
+        """
+        if self.resampler.supports(timeframe):
+            return self._refresh_resampled(symbol, timeframe, force)
+
+        key = (symbol, timeframe)
+        with self._lock:
+            current = self._data.get(key)
+            fresh = time.monotonic() - self._fetched_at.get(key, float('-inf')) < self.max_age
+        if current is not None and fresh and not force:
+            return current
+
+        since = int(current[-1, 0]) if current is not None and len(current) else None
+        try:
+            rows = self._fetch(symbol, timeframe, since)
+        except Exception as e:
+            logger.error(f"❌ 캔들 조회 실패 ({symbol} {timeframe}): {e}")
+            return current
+
+        with self._lock:
+            current = self._data.get(key)
+            if current is not None and len(current) and len(rows):
+                # 진행 중이던 마지막 봉부터 새 데이터로 교체
+                keep = current[current[:, 0] < rows[0, 0]]
+                rows = np.concatenate([keep, rows])
+            if len(rows) > self.max_bars:
+                rows = rows[-self.max_bars:]
+            if len(rows):
+                self._data[key] = rows
+            self._fetched_at[key] = time.monotonic()
+            return self._data.get(key)
+
+    def _refresh_resampled(self, symbol: str, timeframe: str, force: bool) -> Optional[np.ndarray]:
+        """1분봉 동기화 후 리샘플러 뷰 반환 (모든 파생 타임프레임이 같은 동기화를 공유)"""
+        with self._lock:
+            fresh = time.monotonic() - self._synced_at.get(symbol, float('-inf')) < self.max_age
+        try:
+            if not fresh or force:
+                self.resampler.sync(self.exchange, symbol, (timeframe,), limit=self.max_bars)
+                with self._lock:
+                    self._synced_at[symbol] = time.monotonic()
+            elif self.resampler.needs_seed(symbol, timeframe):
+                self.resampler.seed(symbol, timeframe, self._fetch(symbol, timeframe, None))
+        except Exception as e:
+            logger.error(f"❌ 캔들 조회 실패 ({symbol} {timeframe}): {e}")
+        return self.get(symbol, timeframe)
+
+    def get(self, symbol: str, timeframe: str = '1h') -> Optional[np.ndarray]:
+        """네트워크 요청 없이 캐시된 배열 반환 (리샘플 타임프레임은 복사 없는 읽기 전용 뷰)"""
+        if self.resampler.supports(timeframe):
+            rows = self.resampler.view(symbol, timeframe)
+            return rows if rows is not None and len(rows) else None
+        with self._lock:
+            return self._data.get((symbol, timeframe))
+
+    def get_frame(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> pd.DataFrame:
+        """
+        최근 limit개 봉을 DataFrame으로 반환 (필요 시 증분 갱신)
+
+        Returns:
+        --------
+        pd.DataFrame : timestamp(datetime), open, high, low, close, volume
+        """
+        rows = self.refresh(symbol, timeframe)
+        if rows is None:
+            raise ValueError(f"캔들 데이터 없음: {symbol} {timeframe}")
+
+        df = pd.DataFrame(rows[-limit:], columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df
+
+    def symbols(self, timeframe: str = '1h'):
+        """캐시된 심볼 목록"""
+        if self.resampler.supports(timeframe):
+            return self.resampler.symbols()
+        with self._lock:
+            return [symbol for symbol, tf in self._data if tf == timeframe]
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    class FakeExchange:
+        """요청한 타임프레임 봉을 생성하는 테스트용 거래소"""
+
+        def __init__(self):
+            self.calls = []
+            self.now = 1_700_000_000_000
+
+        def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+            self.calls.append((symbol, since, limit))
+            step = TIMEFRAME_MS[timeframe]
+            end = self.now - self.now % step
+            start = since if since is not None else end - (limit - 1) * step
+            return [[t, 1, 1, 1, t / 1e12, 1] for t in range(start, end + 1, step)]
+
+    exchange = FakeExchange()
+    cache = CandleCache(exchange, max_bars=500, max_age=0)
+
+    cache.refresh('BTC/USDT', '1d')
+    exchange.now += 3 * TIMEFRAME_MS['1d']
+    rows = cache.refresh('BTC/USDT', '1d')
+    print(f"1d: 요청 {len(exchange.calls)}회 (두 번째는 since={exchange.calls[1][1]} 증분), 보관 {len(rows)}개")
+    assert len(rows) == 500 and np.all(np.diff(rows[:, 0]) == TIMEFRAME_MS['1d'])
+
+    # 리샘플 타임프레임: 1분봉 동기화 + 타임프레임별 첫 시드만 요청
+    cache.max_age = 60
+    exchange.calls.clear()
+    for timeframe in ('5m', '15m', '1h', '4h'):
+        cache.refresh('ETH/USDT', timeframe)
+    first = len(exchange.calls)
+    exchange.now += 2 * TIMEFRAME_MS['1h']
+    cache.refresh('ETH/USDT', '5m', force=True)
+    for timeframe in ('15m', '1h', '4h'):
+        cache.refresh('ETH/USDT', timeframe)
+    rows = cache.get('ETH/USDT', '1h')
+    print(f"5m/15m/1h/4h: 첫 갱신 요청 {first}회, 이후 {len(exchange.calls) - first}회, "
+          f"1h {len(rows)}개 (시드+1분봉 집계)")
+    assert np.all(np.diff(rows[:, 0]) == TIMEFRAME_MS['1h'])
+    print(cache.get_frame('ETH/USDT', limit=3))
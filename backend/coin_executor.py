@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+코인별 병렬 실행기
+서로 다른 코인의 작업은 동시에, 같은 코인의 작업은 제출 순서대로 하나씩 실행
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class CoinExecutor:
+    """
+    코인별 순차 실행 레인을 가진 스레드 풀
+
+    코인마다 대기열(레인)을 두고 레인당 한 번에 하나의 작업만 스레드 풀에 올린다.
+    따라서 같은 코인의 주문은 항상 제출 순서대로 실행되고, 다른 코인끼리는 병렬로
+    실행되어 전체 소요 시간이 가장 오래 걸리는 코인 레인에 맞춰진다.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        """
+        Parameters:
+        -----------
+        max_workers : int
+            동시에 실행할 최대 코인 수
+        """
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='coin')
+        self._lanes: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, coin: str, func: Callable, *args, **kwargs) -> Future:
+        """
+        코인 레인에 작업 제출
+
+        Parameters:
+        -----------
+        coin : str
+            작업 대상 코인 (같은 코인은 순서 보장)
+        func : Callable
+            실행할 함수
+
+        Returns:
+        --------
+        Future : 작업 결과
+        """
+        future = Future()
+        with self._lock:
+            lane = self._lanes.get(coin)
+            if lane is not None:
+                # 이미 실행 중인 레인: 뒤에 대기
+                lane.append((future, func, args, kwargs))
+                return future
+            self._lanes[coin] = deque()
+
+        self._pool.submit(self._run, coin, future, func, args, kwargs)
+        return future
+
+    def _run(self, coin: str, future: Future, func: Callable, args, kwargs):
+        while True:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(func(*args, **kwargs))
+                except Exception as e:
+                    logger.error(f"❌ {coin} 작업 실패: {e}")
+                    future.set_exception(e)
+
+            # 같은 레인의 다음 작업을 이 스레드에서 이어서 실행
+            with self._lock:
+                lane = self._lanes[coin]
+                if not lane:
+                    del self._lanes[coin]
+                    return
+                future, func, args, kwargs = lane.popleft()
+
+    def run_all(self, tasks: List[tuple], timeout: float = None) -> List[Future]:
+        """
+        (coin, func, *args) 작업 목록을 제출하고 모두 끝날 때까지 대기
+
+        Returns:
+        --------
+        List[Future] : 제출 순서대로의 Future
+        """
+        futures = [self.submit(coin, func, *args) for coin, func, *args in tasks]
+        wait(futures, timeout=timeout)
+        return futures
+
+    def shutdown(self, wait_for_tasks: bool = True):
+        self._pool.shutdown(wait=wait_for_tasks)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    random.seed(0)
+    coins = ['BTC', 'ETH', 'DOGE', 'SHIB', 'XRP', 'SOL']
+    burst = [(random.choice(coins), i) for i in range(20)]
+    order_log = []
+
+    def handle(coin, seq):
+        time.sleep(0.05)  # 기술적 분석 + 검증 + 주문 I/O
+        order_log.append((coin, seq))
+        return seq
+
+    start = time.perf_counter()
+    for coin, seq in burst:
+        handle(coin, seq)
+    serial = time.perf_counter() - start
+
+    order_log.clear()
+    executor = CoinExecutor(max_workers=8)
+    start = time.perf_counter()
+    executor.run_all([(coin, handle, coin, seq) for coin, seq in burst])
+    parallel = time.perf_counter() - start
+    executor.shutdown()
+
+    slowest = max(sum(1 for c, _ in burst if c == coin) for coin in coins) * 0.05
+    print(f"신호 20개: 순차 {serial:.2f}초 / 코인별 병렬 {parallel:.2f}초 (가장 긴 코인 레인 {slowest:.2f}초)")
+
+    for coin in coins:
+        expected = [seq for c, seq in burst if c == coin]
+        assert [seq for c, seq in order_log if c == coin] == expected
+    print("코인별 실행 순서 보장 확인")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+이벤트 버스 모듈
+스케줄러 스레드에서 발행한 이벤트를 이벤트 루프의 WebSocket 구독자에게 전달
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    구독자 하나의 전송 대기열
+
+    대기열이 가득 찰 정도로 느린 구독자는 끊어서(closed) 다른 구독자에게 영향을 주지 않는다.
+    """
+
+    def __init__(self, maxsize: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+        self.dropped = 0
+
+    def offer(self, message: Dict) -> bool:
+        """이벤트 루프 스레드에서 메시지 적재 (가득 차면 False)"""
+        if self.closed:
+            return False
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+
+    def close(self):
+        """대기 중인 메시지를 버리고 종료 표시(None)를 넣어 전송 루프를 끝냄"""
+        if self.closed:
+            return
+        self.closed = True
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(None)
+
+    async def get(self) -> Optional[Dict]:
+        """다음 메시지 (종료 시 None)"""
+        return await self.queue.get()
+
+
+class EventBus:
+    """
+    프로세스 내 발행/구독 버스
+
+    publish()는 어느 스레드에서나 호출할 수 있고, loop.call_soon_threadsafe로 이벤트 루프에
+    전달만 하고 바로 반환한다. 이벤트 루프에서는 구독자별 대기열에 넣기만 하며, 실제 전송은
+    구독자마다 별도 태스크가 하므로 느린 클라이언트가 다른 클라이언트를 막지 않는다.
+    """
+
+    def __init__(self, queue_size: int = 100):
+        """
+        Parameters:
+        -----------
+        queue_size : int
+            구독자별 최대 대기 메시지 수 (초과 시 해당 구독자 연결 종료)
+        """
+        self.queue_size = queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        """이벤트를 전달할 이벤트 루프 지정 (서버 시작 시 호출)"""
+        self._loop = loop
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """구독 등록 (이벤트 루프 안에서 호출)"""
+        subscription = Subscription(self.queue_size)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+        subscription.close()
+
+    def publish(self, message: Dict):
+        """
+        이벤트 발행 (스레드 안전, 즉시 반환)
+
+        Parameters:
+        -----------
+        message : Dict
+            구독자에게 보낼 메시지
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            logger.warning(f"⚠️  이벤트 루프 없음, 이벤트 폐기: {message.get('type')}")
+            return
+        loop.call_soon_threadsafe(self._fan_out, message)
+
+    def _fan_out(self, message: Dict):
+        """이벤트 루프 스레드에서 모든 구독자 대기열에 적재"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            if not subscription.offer(message):
+                logger.warning("⚠️  느린 WebSocket 구독자 연결 종료 (대기열 초과)")
+                self.unsubscribe(subscription)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    async def main():
+        bus = EventBus(queue_size=10)
+        bus.bind(asyncio.get_running_loop())
+
+        received = []
+        latencies = []
+
+        async def fast_client(subscription):
+            while True:
+                message = await subscription.get()
+                if message is None:
+                    break
+                latencies.append(time.perf_counter() - message['sent'])
+                received.append(message)
+
+        subscriptions = [bus.subscribe() for _ in range(500)]
+        tasks = [asyncio.create_task(fast_client(s)) for s in subscriptions]
+        slow = bus.subscribe()  # 읽지 않는 클라이언트
+
+        def scheduler_job():
+            for i in range(20):
+                bus.publish({'type': 'test', 'seq': i, 'sent': time.perf_counter()})
+                time.sleep(0.001)
+
+        fan_out = bus._fan_out
+        fan_out_times = []
+
+        def timed_fan_out(message):
+            start = time.perf_counter()
+            fan_out(message)
+            fan_out_times.append(time.perf_counter() - start)
+
+        bus._fan_out = timed_fan_out
+
+        await asyncio.to_thread(scheduler_job)
+        await asyncio.sleep(0.05)
+        print(f"스레드 발행 20건 x 구독자 500: {len(received)}건 수신, "
+              f"구독자 500명 적재 {sorted(fan_out_times)[len(fan_out_times) // 2] * 1000:.3f}ms (중앙값), "
+              f"클라이언트 수신 지연 중앙값 {sorted(latencies)[len(latencies) // 2] * 1000:.2f}ms")
+        print(f"느린 구독자 종료: {slow.closed}, 남은 구독자 {bus.subscriber_count}")
+
+        for subscription in subscriptions:
+            bus.unsubscribe(subscription)
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
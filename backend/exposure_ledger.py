@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+노출 원장 모듈
+열린 포지션의 증거금/명목가/레버리지/미실현 손익을 코인별·전체로 실시간 유지
+"""
+
+import logging
+import threading
+import itertools
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CoinExposure:
+    """
+    코인 하나의 누적 노출
+
+    포지션별 값을 합산 가능한 항으로만 보관하므로 체결/청산/시세 갱신이 모두 O(1)이다.
+    포지션 i의 계약 수량 units_i = amount_i * leverage_i / entry_i, 방향 s_i(+1 매수, -1 매도)일 때
+    시세 m에서 명목가 = m * Σunits, 미실현 손익 = m * Σ(s*units) - Σ(s*amount*leverage).
+    """
+
+    __slots__ = ('positions', 'margin', 'entry_notional', 'units', 'net_units', 'net_entry_notional',
+                 'mark_price', 'notional', 'net_notional', 'unrealized_pnl')
+
+    def __init__(self):
+        self.positions = 0
+        self.margin = 0.0              # Σ amount (투입 증거금)
+        self.entry_notional = 0.0      # Σ amount * leverage
+        self.units = 0.0               # Σ units
+        self.net_units = 0.0           # Σ s * units
+        self.net_entry_notional = 0.0  # Σ s * amount * leverage
+        self.mark_price = None
+        self.notional = 0.0
+        self.net_notional = 0.0
+        self.unrealized_pnl = 0.0
+
+    def apply(self, sign: int, margin: float, leverage: float, entry_price: float, direction: int):
+        """포지션 추가(sign=+1) 또는 제거(sign=-1)"""
+        leveraged = margin * leverage
+        units = leveraged / entry_price
+        self.positions += sign
+        self.margin += sign * margin
+        self.entry_notional += sign * leveraged
+        self.units += sign * units
+        self.net_units += sign * direction * units
+        self.net_entry_notional += sign * direction * leveraged
+        if self.mark_price is None:
+            self.mark_price = entry_price
+
+    def revalue(self):
+        """현재 시세로 명목가/미실현 손익 재계산"""
+        if self.positions == 0:
+            self.notional = self.net_notional = self.unrealized_pnl = 0.0
+            return
+        self.notional = self.mark_price * self.units
+        self.net_notional = self.mark_price * self.net_units
+        self.unrealized_pnl = self.net_notional - self.net_entry_notional
+
+    def to_dict(self) -> Dict:
+        return {
+            'positions': self.positions,
+            'margin': self.margin,
+            'notional': self.notional,
+            'net_notional': self.net_notional,
+            'leverage': self.entry_notional / self.margin if self.margin > 0 else 0.0,
+            'mark_price': self.mark_price,
+            'unrealized_pnl': self.unrealized_pnl
+        }
+
+
+class ExposureLedger:
+    """
+    실시간 노출 원장
+
+    체결(record_fill), 청산(record_close), 시세(update_mark)마다 해당 코인과 전체 합계를
+    증분 갱신한다. 주문 전에는 try_reserve로 증거금을 예약해 동시에 들어온 주문들이
+    함께 한도를 넘지 못하게 하고, 모든 조회는 잠금 안에서 일관된 상태를 읽는다.
+    """
+
+    def __init__(self):
+        self._coins: Dict[str, CoinExposure] = {}
+        self._positions: Dict[str, tuple] = {}
+        self._reservations: Dict[int, tuple] = {}
+        self._reservation_ids = itertools.count(1)
+
+        self.total_margin = 0.0
+        self.reserved_margin = 0.0
+        self.total_notional = 0.0
+        self.total_entry_notional = 0.0
+        self.total_unrealized_pnl = 0.0
+        self._lock = threading.RLock()
+
+    def _update_coin(self, symbol: str, change):
+        """코인 노출을 바꾸고 전체 합계에는 변화량만 반영"""
+        coin = self._coins.setdefault(symbol, CoinExposure())
+        before = (coin.margin, coin.notional, coin.entry_notional, coin.unrealized_pnl)
+        change(coin)
+        coin.revalue()
+
+        self.total_margin += coin.margin - before[0]
+        self.total_notional += coin.notional - before[1]
+        self.total_entry_notional += coin.entry_notional - before[2]
+        self.total_unrealized_pnl += coin.unrealized_pnl - before[3]
+        if coin.positions == 0:
+            del self._coins[symbol]
+
+    def try_reserve(self, symbol: str, margin: float, limit: float) -> Optional[int]:
+        """
+        증거금 예약 (열린 포지션 + 다른 예약 + 이번 주문이 limit 이하일 때만)
+
+        Parameters:
+        -----------
+        symbol : str
+            거래 심볼 (예: 'BTC/USDT')
+        margin : float
+            주문 증거금 (USDT)
+        limit : float
+            전체 증거금 한도 (USDT)
+
+        Returns:
+        --------
+        int : 예약 ID (한도 초과 시 None)
+        """
+        with self._lock:
+            if self.total_margin + self.reserved_margin + margin > limit:
+                return None
+            reservation_id = next(self._reservation_ids)
+            self._reservations[reservation_id] = (symbol, margin)
+            self.reserved_margin += margin
+            return reservation_id
+
+    def release(self, reservation_id: int):
+        """주문 실패/취소 시 예약 해제"""
+        with self._lock:
+            reservation = self._reservations.pop(reservation_id, None)
+            if reservation:
+                self.reserved_margin -= reservation[1]
+
+    def record_fill(self, position: Dict, reservation_id: Optional[int] = None):
+        """
+        체결된 포지션 반영 (예약이 있으면 예약을 실제 노출로 전환)
+
+        Parameters:
+        -----------
+        position : Dict
+            trade_id, symbol, side, leverage, amount, entry_price를 포함한 포지션
+        """
+        trade_id = position.get('trade_id')
+        direction = 1 if position.get('side') == 'buy' else -1
+        entry = (position.get('symbol'), float(position.get('amount') or 0),
+                 float(position.get('leverage') or 1), float(position.get('entry_price') or 0), direction)
+        if not trade_id or entry[3] <= 0:
+            logger.warning(f"⚠️  노출 원장에 반영할 수 없는 포지션: {trade_id}")
+            if reservation_id is not None:
+                self.release(reservation_id)
+            return
+
+        with self._lock:
+            if reservation_id is not None:
+                self.release(reservation_id)
+            if trade_id in self._positions:
+                return
+            self._positions[trade_id] = entry
+            symbol, margin, leverage, entry_price, direction = entry
+            self._update_coin(symbol, lambda coin: coin.apply(1, margin, leverage, entry_price, direction))
+
+    def record_close(self, trade_id: str):
+        """청산된 포지션 제거"""
+        with self._lock:
+            entry = self._positions.pop(trade_id, None)
+            if entry is None:
+                return
+            symbol, margin, leverage, entry_price, direction = entry
+            self._update_coin(symbol, lambda coin: coin.apply(-1, margin, leverage, entry_price, direction))
+
+    def update_mark(self, symbol: str, price: float):
+        """시세 갱신 (열린 포지션이 없는 코인은 무시)"""
+        if not price or price <= 0:
+            return
+        with self._lock:
+            if symbol not in self._coins:
+                return
+
+            def set_mark(coin):
+                coin.mark_price = price
+            self._update_coin(symbol, set_mark)
+
+    def used_margin(self) -> float:
+        """열린 포지션 증거금 + 예약 증거금 (O(1))"""
+        with self._lock:
+            return self.total_margin + self.reserved_margin
+
+    def positions(self) -> List[tuple]:
+        """열린 포지션 목록 [(trade_id, symbol, margin, leverage, entry_price, direction, mark_price)]"""
+        with self._lock:
+            return [(trade_id, *entry, self._coins[entry[0]].mark_price)
+                    for trade_id, entry in self._positions.items()]
+
+    def get_coin(self, symbol: str) -> Dict:
+        """코인 노출 (O(1))"""
+        with self._lock:
+            coin = self._coins.get(symbol)
+            return coin.to_dict() if coin else CoinExposure().to_dict()
+
+    def snapshot(self) -> Dict:
+        """전체/코인별 노출의 일관된 스냅샷"""
+        with self._lock:
+            return {
+                'total': {
+                    'positions': len(self._positions),
+                    'margin': self.total_margin,
+                    'reserved_margin': self.reserved_margin,
+                    'notional': self.total_notional,
+                    'leverage': self.total_entry_notional / self.total_margin if self.total_margin > 0 else 0.0,
+                    'unrealized_pnl': self.total_unrealized_pnl
+                },
+                'by_symbol': {symbol: coin.to_dict() for symbol, coin in self._coins.items()}
+            }
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import random
+
+    logging.basicConfig(level=logging.INFO)
+
+    random.seed(0)
+    symbols = ['BTC/USDT', 'ETH/USDT', 'DOGE/USDT', 'SHIB/USDT']
+    prices = {symbol: random.uniform(1, 100) for symbol in symbols}
+
+    ledger = ExposureLedger()
+    positions = []
+    for i in range(2000):
+        symbol = random.choice(symbols)
+        position = {
+            'trade_id': str(i), 'symbol': symbol, 'side': random.choice(['buy', 'sell']),
+            'leverage': random.choice([2, 3, 5, 10]), 'amount': random.uniform(10, 200),
+            'entry_price': prices[symbol] * random.uniform(0.95, 1.05)
+        }
+        reservation = ledger.try_reserve(symbol, position['amount'], limit=1e9)
+        ledger.record_fill(position, reservation)
+        positions.append(position)
+    for position in positions[::3]:
+        ledger.record_close(position['trade_id'])
+
+    start = time.perf_counter()
+    for _ in range(10000):
+        symbol = random.choice(symbols)
+        prices[symbol] *= random.uniform(0.999, 1.001)
+        ledger.update_mark(symbol, prices[symbol])
+    print(f"시세 갱신 1만 건: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    # 포지션별 전체 재계산과 비교
+    open_positions = [p for i, p in enumerate(positions) if i % 3 != 0]
+    expected_pnl = sum(
+        (1 if p['side'] == 'buy' else -1) * p['amount'] * p['leverage'] * (prices[p['symbol']] - p['entry_price']) / p['entry_price']
+        for p in open_positions
+    )
+    snapshot = ledger.snapshot()
+    assert abs(snapshot['total']['unrealized_pnl'] - expected_pnl) < 1e-6 * max(1, abs(expected_pnl))
+    assert abs(snapshot['total']['margin'] - sum(p['amount'] for p in open_positions)) < 1e-6
+    print(f"미실현 손익 {snapshot['total']['unrealized_pnl']:.2f} (전체 재계산과 일치), "
+          f"증거금 {snapshot['total']['margin']:.2f}, 평균 레버리지 {snapshot['total']['leverage']:.2f}x")
+
+    # 한도 예약
+    limit = snapshot['total']['margin'] + 100
+    first = ledger.try_reserve('BTC/USDT', 80, limit)
+    second = ledger.try_reserve('ETH/USDT', 80, limit)
+    print(f"한도 예약: 첫 주문 {'승인' if first else '거부'}, 동시 두 번째 주문 {'승인' if second else '거부'}")
@@ -8,11 +8,24 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 import logging
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import sys
+import threading
+
+sys.path.append(str(Path(__file__).parent.parent))
+from records import Record, TradePosition
+from performance_aggregate import PerformanceAggregate
+from signal_index import RecentSignalIndex
 
 logger = logging.getLogger(__name__)
 
+# 최근 신호 인덱스 보관 기간 (분)
+SIGNAL_INDEX_MINUTES = 60
+
+# Firestore 배치당 최대 쓰기 수
+BATCH_WRITE_LIMIT = 500
+
 
 class FirestoreService:
     """
@@ -34,6 +47,14 @@ class FirestoreService:
         credentials_path : str, optional
             Firebase 인증 파일 경로
         """
+        # 성과 집계 (첫 조회 시 Firestore에서 로드)
+        self._performance = None
+        self._performance_lock = threading.Lock()
+
+        # 최근 신호 인덱스 (첫 조회 시 최근 신호로 채움, 이후 save_signal에서 갱신)
+        self._signal_index = None
+        self._signal_index_lock = threading.Lock()
+
         try:
             # Firebase 초기화 (이미 초기화되어 있으면 스킵)
             if not firebase_admin._apps:
@@ -74,6 +95,10 @@ class FirestoreService:
         """
         신호 저장
 
+        naive timestamp는 로컬 시간으로 보고 aware UTC로 바꿔 저장한다. Firestore는 naive
+        datetime을 UTC로 저장하므로, 그대로 쓰면 재시작 후 다시 읽은 시각이 UTC 오프셋만큼
+        밀려 메모리 인덱스와 Firestore 조회 결과가 달라진다.
+
         Parameters:
         -----------
         signal_data : Dict
@@ -84,9 +109,19 @@ class FirestoreService:
         str : 저장된 문서 ID
         """
         try:
+            if isinstance(signal_data, Record):
+                signal_data = signal_data.to_dict()
+
+            timestamp = signal_data.get('timestamp')
+            if isinstance(timestamp, datetime) and timestamp.tzinfo is None:
+                signal_data = {**signal_data, 'timestamp': timestamp.astimezone(timezone.utc)}
+
             doc_ref = self.db.collection('signals').document()
             doc_ref.set(signal_data)
 
+            if self._signal_index is not None:
+                self._signal_index.add({**signal_data, 'id': doc_ref.id})
+
             logger.info(f"💾 신호 저장: {doc_ref.id}")
             return doc_ref.id
 
@@ -173,6 +208,9 @@ class FirestoreService:
         str : 저장된 문서 ID
         """
         try:
+            if isinstance(position_data, Record):
+                position_data = position_data.to_dict()
+
             doc_ref = self.db.collection('positions').document(position_data['trade_id'])
             doc_ref.set(position_data)
 
@@ -183,7 +221,7 @@ class FirestoreService:
             logger.error(f"❌ 포지션 저장 실패: {e}")
             return None
 
-    def get_open_positions(self) -> List[Dict]:
+    def get_open_positions(self) -> List[TradePosition]:
         """열린 포지션 목록 조회"""
         try:
             query = self.db.collection('positions').where('status', '==', 'open')
@@ -193,7 +231,7 @@ class FirestoreService:
             for doc in docs:
                 data = doc.to_dict()
                 data['id'] = doc.id
-                positions.append(data)
+                positions.append(TradePosition.from_dict(data))
 
             return positions
 
@@ -201,7 +239,7 @@ class FirestoreService:
             logger.error(f"❌ 포지션 조회 실패: {e}")
             return []
 
-    def get_positions(self, status: Optional[str] = None, limit: int = 50) -> List[Dict]:
+    def get_positions(self, status: Optional[str] = None, limit: int = 50) -> List[TradePosition]:
         """
         포지션 목록 조회
 
@@ -214,7 +252,7 @@ class FirestoreService:
 
         Returns:
         --------
-        List[Dict] : 포지션 리스트
+        List[TradePosition] : 포지션 리스트
         """
         try:
             query = self.db.collection('positions')
@@ -230,7 +268,7 @@ class FirestoreService:
             for doc in docs:
                 data = doc.to_dict()
                 data['id'] = doc.id
-                positions.append(data)
+                positions.append(TradePosition.from_dict(data))
 
             return positions
 
@@ -262,10 +300,27 @@ class FirestoreService:
             logger.error(f"❌ 포지션 업데이트 실패: {e}")
             return False
 
+    def _get_signal_index(self) -> RecentSignalIndex:
+        """
+        최근 신호 인덱스 로드 (처음 한 번 보관 기간 안의 신호를 timestamp 단일 조건으로 읽어 채움)
+        """
+        with self._signal_index_lock:
+            if self._signal_index is None:
+                index = RecentSignalIndex(retention_minutes=SIGNAL_INDEX_MINUTES)
+                cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=SIGNAL_INDEX_MINUTES)
+                query = self.db.collection('signals').where('timestamp', '>=', cutoff_time)
+                loaded = index.add_many({**doc.to_dict(), 'id': doc.id} for doc in query.stream())
+                logger.info(f"📇 최근 신호 인덱스 로드: {loaded}건")
+                self._signal_index = index
+            return self._signal_index
+
     def get_recent_signals(self, coins: List[str], minutes: int = 60) -> List[Dict]:
         """
         최근 유사 신호 조회 (3계층 검증용)
 
+        보관 기간(SIGNAL_INDEX_MINUTES) 이내 조회는 메모리 인덱스로 응답하고,
+        더 긴 기간만 Firestore를 조회한다.
+
         Parameters:
         -----------
         coins : List[str]
@@ -278,7 +333,10 @@ class FirestoreService:
         List[Dict] : 신호 리스트
         """
         try:
-            cutoff_time = datetime.now() - timedelta(minutes=minutes)
+            if minutes <= SIGNAL_INDEX_MINUTES:
+                return [dict(signal) for signal in self._get_signal_index().recent(coins, minutes)]
+
+            cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=minutes)
 
             query = self.db.collection('signals') \
                 .where('timestamp', '>=', cutoff_time) \
@@ -298,43 +356,113 @@ class FirestoreService:
             logger.error(f"❌ 최근 신호 조회 실패: {e}")
             return []
 
+    def close_position(self, position: Dict, close_data: Dict) -> bool:
+        """
+        포지션 청산 기록 및 성과 집계 갱신
+
+        청산 기록에 performance_recorded=False를 함께 쓰고, 집계 문서와 플래그 해제는
+        한 배치로 저장한다. 그 사이에 중단되면 다음 집계 로드 때 한 번만 반영된다.
+
+        Parameters:
+        -----------
+        position : Dict
+            청산할 포지션
+        close_data : Dict
+            status, close_price, final_pnl, pnl_percent 등 청산 정보
+
+        Returns:
+        --------
+        bool : 성공 여부
+        """
+        if isinstance(position, Record):
+            position = position.to_dict()
+
+        # 청산 기록 전에 집계 로드 (재구성해도 아직 열린 이 포지션은 포함되지 않음)
+        try:
+            performance = self._get_performance()
+        except Exception as e:
+            logger.error(f"❌ 성과 집계 로드 실패: {e}")
+            performance = None
+
+        if not self.update_position(position['id'], {**close_data, 'performance_recorded': False}):
+            return False
+
+        if performance is not None:
+            try:
+                with self._performance_lock:
+                    self._record_performance(performance, [(position['id'], {**position, **close_data})])
+            except Exception as e:
+                logger.error(f"❌ 성과 집계 갱신 실패: {e}")
+
+        return True
+
+    def _record_performance(self, performance: PerformanceAggregate, closed: List[tuple]):
+        """
+        청산 포지션 (ID, 데이터) 목록을 집계에 반영하고 집계 문서와 performance_recorded 플래그를
+        같은 배치로 저장 (_performance_lock을 잡은 상태에서 호출)
+        """
+        aggregate_ref = self.db.collection('performance').document('aggregate')
+        positions = self.db.collection('positions')
+
+        # 배치마다 그 시점까지의 집계 스냅샷을 함께 저장 (집계와 플래그가 항상 일치)
+        chunk_size = BATCH_WRITE_LIMIT - 1
+        for start in range(0, max(len(closed), 1), chunk_size):
+            batch = self.db.batch()
+            for position_id, data in closed[start:start + chunk_size]:
+                performance.record(data, key=position_id)
+                if data.get('performance_recorded') is not True:
+                    batch.update(positions.document(position_id), {'performance_recorded': True})
+            batch.set(aggregate_ref, performance.to_dict())
+            batch.commit()
+
+    def _get_performance(self) -> PerformanceAggregate:
+        """
+        성과 집계 로드 (performance/aggregate 문서가 없으면 닫힌 포지션 전체로 한 번 재구성)
+
+        청산 기록 후 집계 저장 전에 중단된 포지션(performance_recorded=False)은 로드할 때 반영한다.
+        """
+        with self._performance_lock:
+            if self._performance is None:
+                doc = self.db.collection('performance').document('aggregate').get()
+                if doc.exists:
+                    performance = PerformanceAggregate.from_dict(doc.to_dict())
+                    query = self.db.collection('positions').where('performance_recorded', '==', False)
+                    pending = [(doc.id, doc.to_dict()) for doc in query.stream()]
+                    if pending:
+                        self._record_performance(performance, pending)
+                        logger.info(f"📊 미반영 청산 {len(pending)}건 성과 집계에 반영")
+                    self._performance = performance
+                else:
+                    self._performance = self.rebuild_performance()
+            return self._performance
+
+    def rebuild_performance(self) -> PerformanceAggregate:
+        """닫힌 포지션 전체를 스트리밍하며 성과 집계를 다시 만들고 저장"""
+        performance = PerformanceAggregate()
+        pending = []
+        query = self.db.collection('positions').where('status', '==', 'closed')
+        for doc in query.stream():
+            data = doc.to_dict()
+            if data.get('performance_recorded') is False:
+                pending.append((doc.id, data))
+            else:
+                performance.record(data, key=doc.id)
+
+        # 미반영 표시가 남은 포지션은 플래그 해제와 함께 저장
+        self._record_performance(performance, pending)
+        logger.info(f"📊 성과 집계 재구성: {performance.overall.count}건")
+        return performance
+
     def get_performance_stats(self) -> Dict:
         """
-        성과 통계 조회
+        성과 통계 조회 (메모리 집계, 전체 거래 기준)
 
         Returns:
         --------
-        Dict : 통계 데이터
+        Dict : 통계 데이터 (전체 + by_symbol + by_leverage)
         """
         try:
-            # 모든 닫힌 포지션 조회
-            closed_positions = self.get_positions(status='closed', limit=1000)
-
-            if not closed_positions:
-                return {
-                    'total_trades': 0,
-                    'win_rate': 0.0,
-                    'total_pnl': 0.0,
-                    'avg_pnl': 0.0
-                }
-
-            total_trades = len(closed_positions)
-            winning_trades = len([p for p in closed_positions if p.get('final_pnl', 0) > 0])
-            win_rate = winning_trades / total_trades if total_trades > 0 else 0
-
-            total_pnl = sum(p.get('final_pnl', 0) for p in closed_positions)
-            avg_pnl = total_pnl / total_trades if total_trades > 0 else 0
-
-            return {
-                'total_trades': total_trades,
-                'winning_trades': winning_trades,
-                'losing_trades': total_trades - winning_trades,
-                'win_rate': win_rate,
-                'total_pnl': total_pnl,
-                'avg_pnl': avg_pnl,
-                'best_trade': max((p.get('final_pnl', 0) for p in closed_positions), default=0),
-                'worst_trade': min((p.get('final_pnl', 0) for p in closed_positions), default=0)
-            }
+            return self._get_performance().to_stats()
 
         except Exception as e:
             logger.error(f"❌ 성과 통계 조회 실패: {e}")
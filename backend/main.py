@@ -19,11 +19,11 @@ from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from sentiment_analyzer import SentimentAnalyzer
-from signal_generator import SignalGenerator
-from position_manager import PositionManager
-from risk_manager import RiskManager
-from firestore_service import FirestoreService
+# 서비스 모듈(anthropic, ccxt, pandas, firebase 등)은 컨테이너 팩토리에서 첫 사용 시 import
+from event_bus import EventBus
+from coin_executor import CoinExecutor
+from service_container import ServiceContainer
+from tracing import get_tracer, trace_of
 
 # 로깅 설정
 logging.basicConfig(
@@ -48,32 +48,107 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 전역 서비스 인스턴스
-sentiment_analyzer = None
-signal_generator = None
-position_manager = None
-risk_manager = None
-firestore_service = None
+# ==================== 서비스 컨테이너 ====================
+
+def create_sentiment_analyzer():
+    from sentiment_analyzer import SentimentAnalyzer
+    return SentimentAnalyzer()
+
+
+def create_signal_generator():
+    from signal_generator import SignalGenerator
+    return SignalGenerator()
+
+
+def create_position_manager():
+    from position_manager import PositionManager
+    return PositionManager()
+
+
+def create_firestore_service():
+    from firestore_service import FirestoreService
+    return FirestoreService()
+
+
+def create_risk_manager(firestore_service):
+    from risk_manager import RiskManager
+    manager = RiskManager()
+
+    # 열린 포지션으로 노출 원장 복원
+    manager.load_open_positions(firestore_service.get_open_positions())
+    return manager
+
+
+def create_tail_risk_engine(signal_generator, risk_manager):
+    """꼬리 위험 엔진 (공유 캔들 캐시 + 노출 원장, 5초마다 재계산)"""
+    from tail_risk import TailRiskEngine
+    engine = TailRiskEngine(signal_generator.candles, risk_manager.exposure)
+    risk_manager.tail_risk = engine
+    engine.start(interval=5)
+    return engine
+
+
+def create_regime_detector(signal_generator, risk_manager):
+    """시장 국면 감지기 (지원 코인 5분봉 + 호가, 1분마다 갱신)"""
+    from regime_detector import RegimeDetector
+    detector = RegimeDetector(
+        signal_generator.candles,
+        signal_generator.exchange,
+        on_change=lambda coin, state: broadcast_update({
+            'type': 'regime_changed',
+            'coin': coin,
+            'regime': state['regime'],
+            'reason': state['reason'],
+            'timestamp': datetime.now().isoformat()
+        })
+    )
+    risk_manager.regime = detector
+    detector.start(interval=60)
+    return detector
+
+
+services = ServiceContainer()
+services.register('sentiment_analyzer', create_sentiment_analyzer)
+services.register('signal_generator', create_signal_generator)
+services.register('position_manager', create_position_manager)
+services.register('firestore_service', create_firestore_service)
+services.register('risk_manager', create_risk_manager, depends_on=['firestore_service'])
+services.register('tail_risk_engine', create_tail_risk_engine, depends_on=['signal_generator', 'risk_manager'])
+services.register('regime_detector', create_regime_detector, depends_on=['signal_generator', 'risk_manager'])
+
+# 전역 서비스 (첫 사용 시 생성, 서버 시작 후에는 백그라운드에서 미리 생성)
+sentiment_analyzer = services.lazy('sentiment_analyzer')
+signal_generator = services.lazy('signal_generator')
+position_manager = services.lazy('position_manager')
+risk_manager = services.lazy('risk_manager')
+firestore_service = services.lazy('firestore_service')
 scheduler = None
 
-# WebSocket 연결 관리
-active_connections: List[WebSocket] = []
+# 코인별 거래 실행 레인 (다른 코인은 병렬, 같은 코인은 순서대로)
+coin_executor = CoinExecutor(max_workers=8)
+
+# WebSocket 이벤트 버스 (스케줄러 스레드 -> 이벤트 루프 -> 클라이언트별 전송 태스크)
+event_bus = EventBus(queue_size=100)
+tracer = get_tracer()
+heartbeat_task = None
 
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 초기화"""
-    global sentiment_analyzer, signal_generator, position_manager, risk_manager, firestore_service, scheduler
+    global scheduler, heartbeat_task
 
     logger.info("🚀 CryptoLeverageAI 서버 시작 중...")
 
     try:
-        # 서비스 초기화
-        sentiment_analyzer = SentimentAnalyzer()
-        signal_generator = SignalGenerator()
-        position_manager = PositionManager()
-        risk_manager = RiskManager()
-        firestore_service = FirestoreService()
+        # 스케줄러 스레드의 이벤트를 이 루프로 전달
+        event_bus.bind(asyncio.get_running_loop())
+
+        # 서비스 병렬 예열 (기다리지 않음, 먼저 호출된 서비스는 그 자리에서 생성)
+        services.warm_up()
+
+        # 단계별 지연 히스토그램 주기적 내보내기
+        tracer.start(interval=10)
 
         # 스케줄러 설정
         scheduler = BackgroundScheduler()
@@ -108,6 +183,8 @@ async def startup_event():
         scheduler.start()
         logger.info("✅ 스케줄러 시작 완료")
 
+        heartbeat_task = asyncio.create_task(publish_heartbeat())
+
         logger.info("✅ CryptoLeverageAI 서버 준비 완료")
 
     except Exception as e:
@@ -123,6 +200,23 @@ async def shutdown_event():
     if scheduler:
         scheduler.shutdown()
 
+    coin_executor.shutdown()
+    services.shutdown()
+
+    # 생성된 엔진만 정지 (종료 중에 새로 만들지 않음)
+    tail_risk_engine = services.peek('tail_risk_engine')
+    if tail_risk_engine:
+        tail_risk_engine.stop()
+
+    regime_detector = services.peek('regime_detector')
+    if regime_detector:
+        regime_detector.stop()
+
+    tracer.stop()
+
+    if heartbeat_task:
+        heartbeat_task.cancel()
+
     logger.info("✅ 서버 종료 완료")
 
 
@@ -149,39 +243,45 @@ def collect_and_analyze_data():
         all_data = news_data + tweet_data
 
         for item in all_data:
-            sentiment_result = sentiment_analyzer.analyze(
-                text=item['content'],
-                source=item['source'],
-                author=item.get('author', 'unknown')
-            )
+            # 수집 단계에서 trace가 없으면 여기서 시작
+            context = trace_of(item) or tracer.start_trace(item['source'])
+
+            with tracer.span(context, 'analysis'):
+                sentiment_result = sentiment_analyzer.analyze(
+                    text=item['content'],
+                    source=item['source'],
+                    author=item.get('author', 'unknown')
+                )
 
             # 4. Firestore에 저장
-            firestore_service.save_signal({
-                'timestamp': datetime.now(),
-                'source': item['source'],
-                'author': item.get('author'),
-                'content': item['content'],
-                'sentiment': sentiment_result['sentiment'],
-                'coins': sentiment_result['coins'],
-                'impact_score': sentiment_result['impact'],
-                'confidence': sentiment_result['confidence'],
-                'verification_layers': {
-                    'layer1': True,  # 이벤트 감지 완료
-                    'layer2': False,  # 기술적 분석 대기
-                    'layer3': False   # 감정 검증 대기
-                },
-                'status': 'analyzing'
-            })
+            with tracer.span(context, 'signal_create'):
+                firestore_service.save_signal({
+                    'timestamp': datetime.now(),
+                    'source': item['source'],
+                    'author': item.get('author'),
+                    'content': item['content'],
+                    'sentiment': sentiment_result['sentiment'],
+                    'coins': sentiment_result['coins'],
+                    'impact_score': sentiment_result['impact'],
+                    'confidence': sentiment_result['confidence'],
+                    'verification_layers': {
+                        'layer1': True,  # 이벤트 감지 완료
+                        'layer2': False,  # 기술적 분석 대기
+                        'layer3': False   # 감정 검증 대기
+                    },
+                    'status': 'analyzing',
+                    'trace': context
+                })
 
             logger.info(f"✅ 신호 저장: {sentiment_result['coins']} - {sentiment_result['sentiment']} ({sentiment_result['confidence']:.2%})")
 
         # 5. WebSocket으로 실시간 알림
-        asyncio.create_task(broadcast_update({
+        broadcast_update({
             'type': 'data_collected',
             'news_count': len(news_data),
             'tweet_count': len(tweet_data),
             'timestamp': datetime.now().isoformat()
-        }))
+        })
 
         logger.info("✅ 데이터 수집 및 분석 완료")
 
@@ -192,6 +292,9 @@ def collect_and_analyze_data():
 def execute_trading_signals():
     """
     1분마다 실행: 저장된 신호를 기반으로 거래 실행 판단
+
+    신호의 코인마다 작업을 코인별 레인에 제출한다. 서로 다른 코인은 동시에 처리되고
+    같은 코인의 주문은 신호 순서대로 실행되므로, 실행 시간은 가장 오래 걸리는 코인에 맞춰진다.
     """
     logger.info("🔍 거래 신호 분석 시작...")
 
@@ -199,76 +302,18 @@ def execute_trading_signals():
         # 1. Firestore에서 분석 중인 신호 가져오기
         signals = firestore_service.get_signals_by_status('analyzing')
 
+        tasks = []
         for signal in signals:
             # 2. 신뢰도 체크
             if signal['confidence'] < 0.65:
                 logger.info(f"⏭️  신호 무시 (낮은 신뢰도): {signal['coins']} - {signal['confidence']:.2%}")
                 continue
 
-            # 3. 각 코인별 기술적 분석
             for coin in signal['coins']:
-                technical_result = signal_generator.analyze_technical(
-                    symbol=f"{coin}/USDT",
-                    sentiment_score=signal['sentiment'],
-                    impact_score=signal['impact_score']
-                )
+                tasks.append((coin, execute_signal_for_coin, signal, coin))
 
-                # 4. 3계층 검증
-                verification = verify_signal_3layers(signal, technical_result)
-
-                # 5. 검증 통과 시 거래 실행
-                if verification['approved']:
-                    # 리스크 관리 체크
-                    risk_check = risk_manager.check_trading_conditions(
-                        coin=coin,
-                        confidence=signal['confidence'],
-                        leverage=technical_result['recommended_leverage']
-                    )
-
-                    if risk_check['approved']:
-                        # 포지션 계산
-                        position_size = position_manager.calculate_position_size(
-                            confidence=signal['confidence'],
-                            leverage=technical_result['recommended_leverage'],
-                            risk_pct=risk_check['risk_percentage']
-                        )
-
-                        # 거래 실행
-                        trade_result = position_manager.execute_trade(
-                            symbol=f"{coin}/USDT",
-                            side=technical_result['action'],  # 'buy' or 'sell'
-                            leverage=technical_result['recommended_leverage'],
-                            amount=position_size,
-                            stop_loss_pct=risk_check['stop_loss_pct'],
-                            take_profit_pct=risk_check['take_profit_pct']
-                        )
-
-                        # Firestore 업데이트
-                        firestore_service.update_signal(signal['id'], {
-                            'status': 'executed',
-                            'verification_layers': verification['layers'],
-                            'trade_id': trade_result['trade_id']
-                        })
-
-                        firestore_service.save_position(trade_result)
-
-                        # 실시간 알림
-                        asyncio.create_task(broadcast_update({
-                            'type': 'trade_executed',
-                            'coin': coin,
-                            'action': technical_result['action'],
-                            'leverage': technical_result['recommended_leverage'],
-                            'confidence': signal['confidence'],
-                            'timestamp': datetime.now().isoformat()
-                        }))
-
-                        logger.info(f"✅ 거래 실행: {coin} {technical_result['action'].upper()} "
-                                  f"x{technical_result['recommended_leverage']} "
-                                  f"(신뢰도: {signal['confidence']:.2%})")
-                    else:
-                        logger.warning(f"⚠️  리스크 체크 실패: {coin} - {risk_check['reason']}")
-                else:
-                    logger.info(f"❌ 검증 실패: {coin} - {verification['reason']}")
+        # 3. 코인별 병렬 실행 후 모두 끝날 때까지 대기
+        coin_executor.run_all(tasks)
 
         logger.info("✅ 거래 신호 분석 완료")
 
@@ -276,6 +321,103 @@ def execute_trading_signals():
         logger.error(f"❌ 거래 신호 분석 실패: {e}")
 
 
+def execute_signal_for_coin(signal: Dict, coin: str):
+    """
+    신호 하나의 코인 하나에 대한 분석/검증/리스크 체크/주문 (코인 레인에서 실행)
+    """
+    # 같은 신호의 코인들은 다른 레인에서 동시에 실행되므로 코인마다 하위 trace 사용
+    context = tracer.fork(trace_of(signal), coin)
+
+    # 기술적 분석
+    with tracer.span(context, 'technical', coin=coin):
+        technical_result = signal_generator.analyze_technical(
+            symbol=f"{coin}/USDT",
+            sentiment_score=signal['sentiment'],
+            impact_score=signal['impact_score']
+        )
+
+    # 3계층 검증
+    with tracer.span(context, 'verification', coin=coin):
+        verification = verify_signal_3layers(signal, technical_result)
+
+    # 검증 통과 시 거래 실행
+    if not verification['approved']:
+        logger.info(f"❌ 검증 실패: {coin} - {verification['reason']}")
+        return
+
+    # 리스크 관리 체크
+    with tracer.span(context, 'risk_check', coin=coin):
+        risk_check = risk_manager.check_trading_conditions(
+            coin=coin,
+            confidence=signal['confidence'],
+            leverage=technical_result['recommended_leverage'],
+            account_balance=position_manager.account_balance,
+            side=technical_result['action']
+        )
+
+    if not risk_check['approved']:
+        logger.warning(f"⚠️  리스크 체크 실패: {coin} - {risk_check['reason']}")
+        return
+
+    # 리스크 체크에서 조정된 레버리지 사용 (신뢰도 상한, 청산 확률)
+    leverage = risk_check['leverage']
+
+    # 포지션 계산
+    position_size = position_manager.calculate_position_size(
+        confidence=signal['confidence'],
+        leverage=leverage,
+        risk_pct=risk_check['risk_percentage']
+    )
+
+    # 전체 노출 한도 안에서 증거금 예약 (동시에 실행 중인 다른 코인 주문 포함)
+    reservation = risk_manager.reserve_exposure(f"{coin}/USDT", position_size, position_manager.account_balance)
+    if reservation is None:
+        logger.warning(f"⚠️  리스크 체크 실패: {coin} - 전체 노출 한도 초과")
+        return
+
+    # 거래 실행 (주문 접수/체결 시점은 execute_trade 안에서 기록)
+    with tracer.span(context, 'order', coin=coin):
+        trade_result = position_manager.execute_trade(
+            symbol=f"{coin}/USDT",
+            side=technical_result['action'],  # 'buy' or 'sell'
+            leverage=leverage,
+            amount=position_size,
+            stop_loss_pct=risk_check['stop_loss_pct'],
+            take_profit_pct=risk_check['take_profit_pct'],
+            trace=context
+        )
+
+    if trade_result.get('status') == 'failed':
+        risk_manager.release_exposure(reservation)
+        logger.error(f"❌ 거래 실패: {coin} - {trade_result.get('error')}")
+        return
+
+    risk_manager.record_fill(trade_result, reservation)
+
+    # Firestore 업데이트
+    firestore_service.update_signal(signal['id'], {
+        'status': 'executed',
+        'verification_layers': verification['layers'],
+        'trade_id': trade_result['trade_id']
+    })
+
+    firestore_service.save_position(trade_result)
+
+    # 실시간 알림
+    broadcast_update({
+        'type': 'trade_executed',
+        'coin': coin,
+        'action': technical_result['action'],
+        'leverage': leverage,
+        'confidence': signal['confidence'],
+        'timestamp': datetime.now().isoformat()
+    })
+
+    logger.info(f"✅ 거래 실행: {coin} {technical_result['action'].upper()} "
+              f"x{leverage} "
+              f"(신뢰도: {signal['confidence']:.2%})")
+
+
 def monitor_positions():
     """
     30초마다 실행: 열린 포지션 모니터링 및 관리
@@ -287,6 +429,7 @@ def monitor_positions():
         for position in open_positions:
             # 현재 가격 확인
             current_price = position_manager.get_current_price(position['symbol'])
+            risk_manager.update_mark_price(position['symbol'], current_price)
 
             # 손익 계산
             pnl = position_manager.calculate_pnl(
@@ -315,24 +458,26 @@ def monitor_positions():
             if should_close:
                 # 포지션 청산
                 close_result = position_manager.close_position(position)
+                risk_manager.record_close(position['trade_id'])
 
-                firestore_service.update_position(position['id'], {
+                firestore_service.close_position(position, {
                     'status': 'closed',
                     'close_price': current_price,
                     'close_reason': reason,
                     'final_pnl': pnl['pnl'],
+                    'pnl_percent': pnl['pnl_percent'],
                     'closed_at': datetime.now()
                 })
 
                 # 실시간 알림
-                asyncio.create_task(broadcast_update({
+                broadcast_update({
                     'type': 'position_closed',
                     'coin': position['symbol'],
                     'reason': reason,
                     'pnl': pnl['pnl'],
                     'pnl_percent': pnl['pnl_percent'],
                     'timestamp': datetime.now().isoformat()
-                }))
+                })
 
                 logger.info(f"🔒 포지션 청산: {position['symbol']} - {reason} "
                           f"(손익: {pnl['pnl_percent']:.2%})")
@@ -355,10 +500,11 @@ def verify_signal_3layers(signal: Dict, technical_result: Dict) -> Dict:
         'layer3': False
     }
 
-    # Layer 2: 기술적 분석 확인
+    # Layer 2: 기술적 분석 확인 (상위/하위 타임프레임 추세 일치 포함)
     if (technical_result['macd_signal'] and
         technical_result['rsi_signal'] and
-        technical_result['volume_confirmed']):
+        technical_result['volume_confirmed'] and
+        technical_result.get('mtf_confirmed', True)):
         layers['layer2'] = True
 
     # Layer 3: 감정 지속성 확인 (시간 경과 확인)
@@ -403,7 +549,8 @@ async def root():
         "status": "running",
         "service": "CryptoLeverageAI",
         "version": "1.0.0",
-        "timestamp": datetime.now().isoformat()
+        "timestamp": datetime.now().isoformat(),
+        "services": services.status()
     }
 
 
@@ -425,7 +572,7 @@ async def get_positions(status: Optional[str] = 'open'):
             positions = firestore_service.get_open_positions()
         else:
             positions = firestore_service.get_positions(status=status)
-        return {"success": True, "data": positions}
+        return {"success": True, "data": [position.to_dict() for position in positions]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -435,11 +582,27 @@ async def get_performance():
     """성과 통계 조회"""
     try:
         stats = firestore_service.get_performance_stats()
+        stats['exposure'] = risk_manager.get_exposure_snapshot()
+        tail_risk_engine = services.peek('tail_risk_engine')
+        stats['tail_risk'] = tail_risk_engine.latest() if tail_risk_engine else None
         return {"success": True, "data": stats}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/market-regime")
+async def get_market_regime():
+    """코인별 시장 국면 조회"""
+    regime_detector = services.peek('regime_detector')
+    return {"success": True, "data": regime_detector.get_states() if regime_detector else {}}
+
+
+@app.get("/api/latency")
+async def get_latency():
+    """단계별 지연 히스토그램 조회 (수집 → 분석 → 시그널 → 검증 → 주문 접수/체결)"""
+    return {"success": True, "data": tracer.histograms()}
+
+
 @app.post("/api/manual-trade")
 async def manual_trade(
     symbol: str,
@@ -466,37 +629,50 @@ async def manual_trade(
 async def websocket_endpoint(websocket: WebSocket):
     """실시간 데이터 스트리밍"""
     await websocket.accept()
-    active_connections.append(websocket)
+    subscription = event_bus.subscribe()
 
-    logger.info(f"🔌 WebSocket 연결: {len(active_connections)}개 활성")
+    logger.info(f"🔌 WebSocket 연결: {event_bus.subscriber_count}개 활성")
 
     try:
+        # 구독 대기열의 이벤트를 이 클라이언트에게만 전송 (느린 클라이언트는 버스가 끊음)
         while True:
-            # 실시간 데이터 전송
-            data = {
-                'type': 'heartbeat',
-                'timestamp': datetime.now().isoformat(),
-                'active_signals': len(firestore_service.get_signals_by_status('analyzing')),
-                'open_positions': len(firestore_service.get_open_positions())
-            }
-
-            await websocket.send_json(data)
-            await asyncio.sleep(5)  # 5초마다 하트비트
+            message = await subscription.get()
+            if message is None:
+                break
+            await websocket.send_json(message)
 
     except Exception as e:
         logger.error(f"❌ WebSocket 오류: {e}")
     finally:
-        active_connections.remove(websocket)
-        logger.info(f"🔌 WebSocket 연결 해제: {len(active_connections)}개 활성")
+        event_bus.unsubscribe(subscription)
+        logger.info(f"🔌 WebSocket 연결 해제: {event_bus.subscriber_count}개 활성")
 
 
-async def broadcast_update(message: Dict):
-    """모든 연결된 클라이언트에 메시지 브로드캐스트"""
-    for connection in active_connections:
+async def publish_heartbeat():
+    """5초마다 하트비트를 모든 구독자에게 발행 (Firestore 조회는 클라이언트 수와 무관하게 한 번)"""
+    while True:
         try:
-            await connection.send_json(message)
+            if event_bus.subscriber_count:
+                active_signals, open_positions = await asyncio.gather(
+                    # 서비스 생성(첫 접근)도 이벤트 루프 밖에서
+                    asyncio.to_thread(lambda: firestore_service.get_signals_by_status('analyzing')),
+                    asyncio.to_thread(lambda: firestore_service.get_open_positions())
+                )
+                broadcast_update({
+                    'type': 'heartbeat',
+                    'timestamp': datetime.now().isoformat(),
+                    'active_signals': len(active_signals),
+                    'open_positions': len(open_positions)
+                })
         except Exception as e:
-            logger.error(f"❌ 브로드캐스트 실패: {e}")
+            logger.error(f"❌ 하트비트 실패: {e}")
+
+        await asyncio.sleep(5)  # 5초마다 하트비트
+
+
+def broadcast_update(message: Dict):
+    """모든 연결된 클라이언트에 메시지 브로드캐스트 (어느 스레드에서나 호출 가능)"""
+    event_bus.publish(message)
 
 
 # ==================== 서버 실행 ====================
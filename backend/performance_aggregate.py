@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+성과 통계 집계 모듈
+청산된 포지션마다 O(1)로 갱신되는 누적 성과 통계
+"""
+
+import math
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PnlStats:
+    """
+    손익 누적 통계 (거래 수, 승리 수, 합계, 최소/최대, 수익률 평균/분산)
+
+    수익률 평균과 분산은 Welford 방식으로 누적하므로 거래가 아무리 많아도
+    원본 거래 없이 정확한 샤프 비율 입력값을 유지한다.
+    """
+
+    __slots__ = ('count', 'wins', 'total_pnl', 'best', 'worst', 'mean_return', 'm2_return')
+
+    def __init__(self):
+        self.count = 0
+        self.wins = 0
+        self.total_pnl = 0.0
+        self.best = None
+        self.worst = None
+        self.mean_return = 0.0
+        self.m2_return = 0.0
+
+    def add(self, pnl: float, pnl_percent: float):
+        """청산 거래 하나 반영"""
+        self.count += 1
+        if pnl > 0:
+            self.wins += 1
+        self.total_pnl += pnl
+        self.best = pnl if self.best is None else max(self.best, pnl)
+        self.worst = pnl if self.worst is None else min(self.worst, pnl)
+
+        delta = pnl_percent - self.mean_return
+        self.mean_return += delta / self.count
+        self.m2_return += delta * (pnl_percent - self.mean_return)
+
+    def sharpe_ratio(self) -> float:
+        """거래당 수익률 기준 샤프 비율 (무위험 수익률 0, 연율화하지 않음)"""
+        if self.count < 2:
+            return 0.0
+        std = math.sqrt(self.m2_return / (self.count - 1))
+        return self.mean_return / std if std > 0 else 0.0
+
+    def to_stats(self) -> Dict:
+        """API 응답 형식"""
+        return {
+            'total_trades': self.count,
+            'winning_trades': self.wins,
+            'losing_trades': self.count - self.wins,
+            'win_rate': self.wins / self.count if self.count else 0.0,
+            'total_pnl': self.total_pnl,
+            'avg_pnl': self.total_pnl / self.count if self.count else 0.0,
+            'best_trade': self.best if self.best is not None else 0,
+            'worst_trade': self.worst if self.worst is not None else 0,
+            'avg_return': self.mean_return,
+            'sharpe_ratio': self.sharpe_ratio()
+        }
+
+    def to_dict(self) -> Dict:
+        """Firestore 저장 형식"""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'PnlStats':
+        stats = cls()
+        for name in cls.__slots__:
+            if name in data:
+                setattr(stats, name, data[name])
+        return stats
+
+
+class PerformanceAggregate:
+    """
+    전체/코인별/레버리지별 성과 집계
+
+    포지션이 청산될 때 record()로 한 번씩 반영하고, 조회는 메모리의 집계만 읽는다.
+    key를 넘기면 이 객체에서 이미 반영한 포지션은 다시 반영하지 않는다.
+    """
+
+    def __init__(self):
+        self.overall = PnlStats()
+        self.by_symbol: Dict[str, PnlStats] = {}
+        self.by_leverage: Dict[str, PnlStats] = {}
+        self._recorded = set()
+        self._lock = threading.Lock()
+
+    def record(self, position: Dict, key: Optional[str] = None) -> bool:
+        """
+        청산된 포지션 반영
+
+        Parameters:
+        -----------
+        position : Dict
+            symbol, leverage, final_pnl, pnl_percent를 포함한 포지션 정보
+        key : str, optional
+            포지션 ID (중복 반영 방지)
+
+        Returns:
+        --------
+        bool : 반영 여부 (이미 반영한 key면 False)
+        """
+        pnl = position.get('final_pnl') or 0
+        pnl_percent = position.get('pnl_percent') or 0
+        symbol = position.get('symbol') or 'unknown'
+        leverage = str(position.get('leverage') or 'unknown')
+
+        with self._lock:
+            if key is not None:
+                if key in self._recorded:
+                    return False
+                self._recorded.add(key)
+            self.overall.add(pnl, pnl_percent)
+            self.by_symbol.setdefault(symbol, PnlStats()).add(pnl, pnl_percent)
+            self.by_leverage.setdefault(leverage, PnlStats()).add(pnl, pnl_percent)
+        return True
+
+    def to_stats(self) -> Dict:
+        """성과 통계 (get_performance_stats 응답)"""
+        with self._lock:
+            stats = self.overall.to_stats()
+            stats['by_symbol'] = {symbol: s.to_stats() for symbol, s in self.by_symbol.items()}
+            stats['by_leverage'] = {leverage: s.to_stats() for leverage, s in self.by_leverage.items()}
+            return stats
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                'overall': self.overall.to_dict(),
+                'by_symbol': {symbol: s.to_dict() for symbol, s in self.by_symbol.items()},
+                'by_leverage': {leverage: s.to_dict() for leverage, s in self.by_leverage.items()}
+            }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'PerformanceAggregate':
+        aggregate = cls()
+        if data:
+            aggregate.overall = PnlStats.from_dict(data.get('overall', {}))
+            aggregate.by_symbol = {k: PnlStats.from_dict(v) for k, v in data.get('by_symbol', {}).items()}
+            aggregate.by_leverage = {k: PnlStats.from_dict(v) for k, v in data.get('by_leverage', {}).items()}
+        return aggregate
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import random
+
+    random.seed(1)
+    positions = [
+        {
+            'symbol': random.choice(['BTC/USDT', 'ETH/USDT', 'DOGE/USDT']),
+            'leverage': random.choice([3, 5, 10]),
+            'final_pnl': random.gauss(5, 40),
+            'pnl_percent': random.gauss(0.01, 0.05)
+        }
+        for _ in range(100000)
+    ]
+
+    aggregate = PerformanceAggregate()
+    start = time.perf_counter()
+    for position in positions:
+        aggregate.record(position)
+    print(f"10만 건 반영: {time.perf_counter() - start:.3f}초")
+
+    start = time.perf_counter()
+    stats = aggregate.to_stats()
+    print(f"통계 조회: {(time.perf_counter() - start) * 1000:.3f}ms")
+
+    returns = [p['pnl_percent'] for p in positions]
+    mean = sum(returns) / len(returns)
+    std = math.sqrt(sum((r - mean) ** 2 for r in returns) / (len(returns) - 1))
+    assert abs(stats['sharpe_ratio'] - mean / std) < 1e-9
+    assert stats['best_trade'] == max(p['final_pnl'] for p in positions)
+    assert PerformanceAggregate.from_dict(aggregate.to_dict()).to_stats() == stats
+    print({k: v for k, v in stats.items() if not k.startswith('by_')})
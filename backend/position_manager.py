@@ -6,13 +6,14 @@ PRD 3.1.4 자동 거래 실행 모듈 구현
 
 import ccxt
 import logging
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
 from binance_trader import BinanceTrader
+from tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
@@ -116,7 +117,8 @@ class PositionManager:
         leverage: int,
         amount: float,
         stop_loss_pct: float = 0.03,
-        take_profit_pct: float = 0.10
+        take_profit_pct: float = 0.10,
+        trace: Optional[Dict] = None
     ) -> Dict:
         """
         거래 실행
@@ -135,6 +137,8 @@ class PositionManager:
             손절 비율 (기본 3%)
         take_profit_pct : float
             익절 비율 (기본 10%)
+        trace : Dict, optional
+            신호의 trace 컨텍스트 (주문 접수/체결 시점 기록)
 
         Returns:
         --------
@@ -157,12 +161,23 @@ class PositionManager:
 
             # 주문 실행 (시장가)
             order = None
+            tracer = get_tracer()
             if self.trader:
                 order = self.exchange.create_market_order(
                     symbol=symbol,
                     side=side,
                     amount=quantity
                 )
+                tracer.mark(trace, 'order_ack', symbol=symbol, order_id=order.get('id'))
+
+                # 시장가 주문이 응답 시점에 체결됐으면 체결 시점 기록
+                if order.get('status') == 'closed' or (order.get('filled') or 0) >= quantity:
+                    tracer.mark(trace, 'fill', symbol=symbol, filled=order.get('filled'),
+                                average=order.get('average'))
+            else:
+                # 테스트 모드는 주문 없이 즉시 체결로 간주
+                tracer.mark(trace, 'order_ack', symbol=symbol, simulated=True)
+                tracer.mark(trace, 'fill', symbol=symbol, simulated=True)
 
             # 손절/익절 가격 계산
             if side == 'buy':
@@ -187,6 +202,8 @@ class PositionManager:
                 'order': order,
                 'executed_at': datetime.now().isoformat()
             }
+            if trace:
+                result['trace'] = trace
 
             logger.info(f"✅ 거래 성공: {result['trade_id']}")
             logger.info(f"   손절가: ${stop_loss_price:.2f} (-{stop_loss_pct:.1%})")
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+시장 국면 감지 모듈
+공유 캔들/시세로 코인별 실현 변동성, ATR, 거래량 z-score, 스프레드/호가 깊이를 증분 계산해 국면 상태 게시
+"""
+
+import time
+import logging
+import threading
+from pathlib import Path
+import sys
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from config import SUPPORTED_COINS
+
+logger = logging.getLogger(__name__)
+
+
+class RollingStats:
+    """
+    고정 길이 롤링 윈도우 (NumPy 링 버퍼)
+
+    값 하나를 넣을 때 합계/제곱합만 갱신하므로 평균/표준편차가 O(1)이다.
+    부동소수점 오차가 쌓이지 않도록 윈도우가 한 바퀴 돌 때마다 버퍼에서 다시 합산한다.
+    """
+
+    __slots__ = ('size', 'buffer', 'count', 'pos', 'total', 'total_sq')
+
+    def __init__(self, size: int):
+        self.size = size
+        self.buffer = np.zeros(size)
+        self.count = 0
+        self.pos = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def push(self, value: float):
+        old = self.buffer[self.pos]
+        self.buffer[self.pos] = value
+        self.pos = (self.pos + 1) % self.size
+        if self.count < self.size:
+            self.count += 1
+            self.total += value
+            self.total_sq += value * value
+        else:
+            self.total += value - old
+            self.total_sq += value * value - old * old
+        if self.pos == 0:
+            self.total = float(self.buffer.sum())
+            self.total_sq = float(np.dot(self.buffer, self.buffer))
+
+    @property
+    def full(self) -> bool:
+        return self.count == self.size
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return float(np.sqrt(max(variance, 0.0)))
+
+
+class CoinRegime:
+    """코인 하나의 롤링 지표"""
+
+    def __init__(self, short_window: int, long_window: int):
+        self.returns_short = RollingStats(short_window)
+        self.returns_long = RollingStats(long_window)
+        self.true_range = RollingStats(short_window)
+        self.volume = RollingStats(long_window)
+        self.last_timestamp = None
+        self.last_close = None
+        self.last_volume = 0.0
+        self.spread_bps = None
+        self.depth = None
+
+    def add_bar(self, high: float, low: float, close: float, volume: float):
+        """닫힌 봉 하나 반영"""
+        if self.last_close:
+            self.returns_short.push(np.log(close / self.last_close))
+            self.returns_long.push(np.log(close / self.last_close))
+            true_range = max(high, self.last_close) - min(low, self.last_close)
+        else:
+            true_range = high - low
+        self.true_range.push(true_range / close if close else 0.0)
+        self.volume.push(volume)
+        self.last_close = close
+        self.last_volume = volume
+
+
+class RegimeDetector:
+    """
+    코인별 시장 국면 감지기
+
+    캔들 캐시에서 새로 닫힌 봉만 읽어 롤링 지표를 갱신하고, 시세(fetch_tickers 1회)로
+    스프레드와 최우선 호가 깊이를 갱신한다. 계산된 국면은 코인별 dict로 통째 교체해
+    게시하므로 주문 경로의 get_state()는 잠금 없이 O(1)로 읽는다.
+    """
+
+    def __init__(
+        self,
+        candle_cache,
+        exchange=None,
+        coins: Optional[List[str]] = None,
+        timeframe: str = '5m',
+        short_window: int = 12,
+        long_window: int = 288,
+        on_change: Optional[Callable[[str, Dict], None]] = None
+    ):
+        """
+        Parameters:
+        -----------
+        candle_cache : CandleCache
+            공유 캔들 캐시
+        exchange : ccxt.Exchange, optional
+            시세(호가) 조회용 거래소 (없으면 스프레드/깊이 생략)
+        coins : List[str]
+            감시할 코인 (기본값: config.SUPPORTED_COINS)
+        timeframe : str
+            지표 계산 봉 단위
+        short_window : int
+            단기 변동성/ATR 윈도우 (봉 수, 기본 1시간)
+        long_window : int
+            장기 변동성/거래량 기준 윈도우 (봉 수, 기본 24시간)
+        on_change : Callable, optional
+            국면이 바뀔 때 호출할 함수 (coin, state)
+        """
+        self.candle_cache = candle_cache
+        self.exchange = exchange
+        self.coins = list(coins or SUPPORTED_COINS)
+        self.timeframe = timeframe
+        self.short_window = short_window
+        self.long_window = long_window
+        self.on_change = on_change
+
+        # 국면 판정 기준
+        self.volatility_ratio_high = 2.0     # 단기/장기 변동성 비율 -> 고변동성
+        self.volatility_ratio_extreme = 4.0  # -> 거래 중지
+        self.atr_extreme = 0.05              # 봉당 ATR 5% 이상 -> 거래 중지
+        self.volume_z_extreme = 6.0          # 거래량 z-score -> 거래 중지
+        self.spread_bps_max = 50.0           # 스프레드 50bp 초과 -> 유동성 부족
+        self.depth_min = 1000.0              # 최우선 호가 깊이 (USDT) 미만 -> 유동성 부족
+
+        self._coins: Dict[str, CoinRegime] = {}
+        self._states: Dict[str, Dict] = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _update_candles(self, coin: str, rows: np.ndarray):
+        regime = self._coins.setdefault(coin, CoinRegime(self.short_window, self.long_window))
+
+        # 마지막 행은 진행 중인 봉이므로 닫힌 봉 중 아직 반영하지 않은 것만 처리
+        closed = rows[:-1]
+        if regime.last_timestamp is not None:
+            closed = closed[closed[:, 0] > regime.last_timestamp]
+        else:
+            closed = closed[-(self.long_window + 1):]
+
+        for timestamp, _, high, low, close, volume in closed:
+            regime.add_bar(high, low, close, volume)
+            regime.last_timestamp = timestamp
+
+    def _update_tickers(self):
+        if self.exchange is None:
+            return
+        symbols = [f"{coin}/USDT" for coin in self._coins]
+        try:
+            tickers = self.exchange.fetch_tickers(symbols)
+        except Exception as e:
+            logger.error(f"❌ 시세 조회 실패: {e}")
+            return
+
+        for coin, regime in self._coins.items():
+            ticker = tickers.get(f"{coin}/USDT") or {}
+            bid, ask = ticker.get('bid'), ticker.get('ask')
+            if bid and ask:
+                regime.spread_bps = (ask - bid) / ((ask + bid) / 2) * 10000
+                bid_volume, ask_volume = ticker.get('bidVolume'), ticker.get('askVolume')
+                if bid_volume is not None and ask_volume is not None:
+                    regime.depth = min(bid * bid_volume, ask * ask_volume)
+
+    def _classify(self, coin: str, regime: CoinRegime) -> Dict:
+        long_std = regime.returns_long.std
+        short_std = regime.returns_short.std
+        volatility_ratio = short_std / long_std if long_std > 0 else 1.0
+        atr = regime.true_range.mean
+        volume_std = regime.volume.std
+        volume_z = (regime.last_volume - regime.volume.mean) / volume_std if volume_std > 0 else 0.0
+
+        reasons = []
+        if volatility_ratio >= self.volatility_ratio_extreme:
+            reasons.append(f'변동성 급등 ({volatility_ratio:.1f}배)')
+        if atr >= self.atr_extreme:
+            reasons.append(f'ATR {atr:.1%}')
+        if abs(volume_z) >= self.volume_z_extreme:
+            reasons.append(f'거래량 이상 (z={volume_z:.1f})')
+
+        if reasons:
+            name = 'extreme'
+        elif (regime.spread_bps is not None and regime.spread_bps > self.spread_bps_max) or \
+                (regime.depth is not None and regime.depth < self.depth_min):
+            name = 'illiquid'
+            reasons.append(f'유동성 부족 (스프레드 {regime.spread_bps:.1f}bp)')
+        elif volatility_ratio >= self.volatility_ratio_high:
+            name = 'high_volatility'
+        elif not regime.returns_long.full:
+            name = 'warming_up'
+        else:
+            name = 'normal'
+
+        return {
+            'coin': coin,
+            'regime': name,
+            'safe_to_trade': name not in ('extreme', 'illiquid'),
+            'reason': ', '.join(reasons) if reasons else name,
+            'realized_volatility': short_std,
+            'volatility_ratio': volatility_ratio,
+            'atr_pct': atr,
+            'volume_z': volume_z,
+            'spread_bps': regime.spread_bps,
+            'depth': regime.depth,
+            'bars': regime.returns_long.count,
+            'updated_at': time.time()
+        }
+
+    def update(self):
+        """모든 코인의 새 봉/시세 반영 후 국면 게시"""
+        for coin in self.coins:
+            rows = self.candle_cache.refresh(f"{coin}/USDT", self.timeframe)
+            if rows is not None and len(rows) > 1:
+                self._update_candles(coin, rows)
+        self._update_tickers()
+
+        for coin, regime in self._coins.items():
+            state = self._classify(coin, regime)
+            previous = self._states.get(coin)
+            self._states[coin] = state
+            if previous and previous['regime'] != state['regime']:
+                logger.info(f"📈 {coin} 시장 국면 변경: {previous['regime']} -> {state['regime']} ({state['reason']})")
+                if self.on_change:
+                    self.on_change(coin, state)
+
+    def get_state(self, coin: str) -> Optional[Dict]:
+        """코인 국면 (O(1), 네트워크 요청 없음)"""
+        return self._states.get(coin)
+
+    def get_states(self) -> Dict[str, Dict]:
+        return dict(self._states)
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.update()
+            except Exception as e:
+                logger.error(f"❌ 시장 국면 갱신 실패: {e}")
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 60.0):
+        """백그라운드 주기 갱신 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='regime', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    class ReplayCache:
+        """준비된 5분봉을 한 봉씩 공개하는 테스트용 캐시"""
+
+        def __init__(self, data):
+            self.data = data
+            self.visible = 400
+
+        def refresh(self, symbol, timeframe='5m'):
+            rows = self.data.get(symbol)
+            return rows[:self.visible] if rows is not None else None
+
+    class FakeExchange:
+        def fetch_tickers(self, symbols):
+            return {s: {'bid': 99.9, 'ask': 100.1, 'bidVolume': 50, 'askVolume': 50} for s in symbols}
+
+    rng = np.random.default_rng(0)
+    bars = 800
+    data = {}
+    for coin in SUPPORTED_COINS:
+        returns = rng.normal(0, 0.002, bars)
+        if coin == 'DOGE':
+            returns[600:] *= 10  # 600번째 봉부터 변동성 급등
+        close = 100 * np.exp(np.cumsum(returns))
+        high, low = close * (1 + np.abs(returns)), close * (1 - np.abs(returns))
+        volume = rng.lognormal(10, 0.3, bars)
+        data[f"{coin}/USDT"] = np.column_stack([np.arange(bars) * 300000.0, close, high, low, close, volume])
+
+    cache = ReplayCache(data)
+    detector = RegimeDetector(cache, FakeExchange(),
+                              on_change=lambda coin, state: print(f"  -> {coin}: {state['regime']} ({state['reason']})"))
+
+    start = time.perf_counter()
+    detector.update()
+    print(f"초기 {len(SUPPORTED_COINS)}개 코인 x 400봉: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    start = time.perf_counter()
+    while cache.visible < bars:
+        cache.visible += 1
+        detector.update()
+    elapsed = time.perf_counter() - start
+    print(f"증분 갱신 {bars - 400}회: 회당 {elapsed / (bars - 400) * 1000:.3f}ms")
+
+    start = time.perf_counter()
+    for _ in range(100000):
+        detector.get_state('BTC')
+    print(f"get_state: {(time.perf_counter() - start) / 100000 * 1e6:.2f}µs")
+    for coin in ('BTC', 'DOGE'):
+        state = detector.get_state(coin)
+        print(f"{coin}: {state['regime']}, 변동성 비율 {state['volatility_ratio']:.2f}, "
+              f"ATR {state['atr_pct']:.3%}, 스프레드 {state['spread_bps']:.1f}bp, 거래 가능 {state['safe_to_trade']}")
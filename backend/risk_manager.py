@@ -5,9 +5,12 @@ PRD 6. 리스크 관리 구현
 """
 
 import logging
-from typing import Dict
+import threading
+from typing import Dict, Iterable, Optional
 from datetime import datetime, timedelta
 
+from exposure_ledger import ExposureLedger
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,13 +42,29 @@ class RiskManager:
         self.daily_trades = []
         self.daily_pnl = 0.0
 
+        # 열린 포지션 노출 원장 (체결/청산/시세마다 증분 갱신)
+        self.exposure = ExposureLedger()
+
+        # 꼬리 위험 엔진 (TailRiskEngine, 연결되면 레버리지 승인 전에 참조)
+        self.tail_risk = None
+        self.max_liquidation_probability = 0.05  # 신규 포지션 청산 확률 한도 5%
+        self.max_portfolio_cvar = 0.10           # 포트폴리오 CVaR 한도 (잔고 대비 10%)
+
+        # 시장 국면 감지기 (RegimeDetector, 연결되면 코인별 국면 상태 조회)
+        self.regime = None
+
+        # 코인별 실행 레인이 동시에 호출하므로 전역 한도 확인/갱신은 잠금 안에서 수행
+        self._lock = threading.RLock()
+
         logger.info("✅ Risk Manager 초기화 완료")
 
     def check_trading_conditions(
         self,
         coin: str,
         confidence: float,
-        leverage: int
+        leverage: int,
+        account_balance: Optional[float] = None,
+        side: Optional[str] = None
     ) -> Dict:
         """
         거래 조건 확인
@@ -58,72 +77,111 @@ class RiskManager:
             신호 신뢰도
         leverage : int
             요청 레버리지
+        account_balance : float, optional
+            계좌 잔고 (주어지면 전체 노출/CVaR 한도 확인)
+        side : str, optional
+            'buy' 또는 'sell' (청산 확률 계산용, 없으면 두 방향 중 큰 값)
 
         Returns:
         --------
         Dict : 승인 여부 및 조정된 매개변수
         """
-        # 1. 신뢰도별 레버리지 검증
-        if confidence >= 0.85:
-            confidence_level = 'highest'
-        elif confidence >= 0.75:
-            confidence_level = 'high'
-        elif confidence >= 0.65:
-            confidence_level = 'medium'
-        else:
+        with self._lock:
+            # 1. 신뢰도별 레버리지 검증
+            if confidence >= 0.85:
+                confidence_level = 'highest'
+            elif confidence >= 0.75:
+                confidence_level = 'high'
+            elif confidence >= 0.65:
+                confidence_level = 'medium'
+            else:
+                return {
+                    'approved': False,
+                    'reason': f'신뢰도 너무 낮음 ({confidence:.2%} < 65%)'
+                }
+
+            # 레버리지 제한 확인
+            limits = self.leverage_limits[confidence_level]
+            min_lev, max_lev = limits['range']
+
+            if leverage > max_lev:
+                leverage = max_lev
+                logger.warning(f"⚠️  레버리지 조정: {leverage} -> {max_lev} ({confidence_level})")
+
+            # 꼬리 위험: 청산 확률이 한도 안에 들 때까지 레버리지 하향 (마지막 시뮬레이션 경로 조회)
+            if self.tail_risk is not None:
+                symbol = f"{coin}/USDT"
+                probability = self.tail_risk.liquidation_probability(symbol, leverage, side)
+                while probability is not None and probability > self.max_liquidation_probability and leverage > min_lev:
+                    leverage -= 1
+                    probability = self.tail_risk.liquidation_probability(symbol, leverage, side)
+
+                if probability is not None and probability > self.max_liquidation_probability:
+                    return {
+                        'approved': False,
+                        'reason': f'청산 확률 과다 ({probability:.2%} @ {leverage}x)'
+                    }
+
+            # 2. 일일 손실 한도 확인
+            if abs(self.daily_pnl) >= self.max_daily_loss:
+                return {
+                    'approved': False,
+                    'reason': f'일일 손실 한도 도달 ({self.daily_pnl:.2%})'
+                }
+
+            # 3. 전체 노출 한도 확인 (원장 조회, O(1))
+            if account_balance:
+                used = self.exposure.used_margin()
+                if used >= self.max_total_exposure * account_balance:
+                    return {
+                        'approved': False,
+                        'reason': f'전체 노출 한도 도달 ({used / account_balance:.2%} >= {self.max_total_exposure:.0%})'
+                    }
+
+            # 4. 포트폴리오 꼬리 위험 (CVaR) 확인
+            tail = self.tail_risk.latest() if self.tail_risk is not None else None
+            if tail and account_balance and tail['cvar'] >= self.max_portfolio_cvar * account_balance:
+                return {
+                    'approved': False,
+                    'reason': f'포트폴리오 CVaR 한도 초과 (${tail["cvar"]:.2f})'
+                }
+
+            # 5. 시장 상황 확인
+            market_condition = self._check_market_conditions(coin)
+            if not market_condition['safe_to_trade']:
+                return {
+                    'approved': False,
+                    'reason': f'시장 상황 불안정: {market_condition["reason"]}'
+                }
+
+            # 6. 승인
             return {
-                'approved': False,
-                'reason': f'신뢰도 너무 낮음 ({confidence:.2%} < 65%)'
+                'approved': True,
+                'leverage': leverage,
+                'risk_percentage': self.max_risk_per_trade,
+                'stop_loss_pct': limits['stop_loss'],
+                'take_profit_pct': self._calculate_take_profit(leverage),
+                'confidence_level': confidence_level
             }
 
-        # 레버리지 제한 확인
-        limits = self.leverage_limits[confidence_level]
-        min_lev, max_lev = limits['range']
-
-        if leverage > max_lev:
-            leverage = max_lev
-            logger.warning(f"⚠️  레버리지 조정: {leverage} -> {max_lev} ({confidence_level})")
-
-        # 2. 일일 손실 한도 확인
-        if abs(self.daily_pnl) >= self.max_daily_loss:
-            return {
-                'approved': False,
-                'reason': f'일일 손실 한도 도달 ({self.daily_pnl:.2%})'
-            }
-
-        # 3. 시장 상황 확인
-        market_condition = self._check_market_conditions()
-        if not market_condition['safe_to_trade']:
-            return {
-                'approved': False,
-                'reason': f'시장 상황 불안정: {market_condition["reason"]}'
-            }
-
-        # 4. 승인
-        return {
-            'approved': True,
-            'leverage': leverage,
-            'risk_percentage': self.max_risk_per_trade,
-            'stop_loss_pct': limits['stop_loss'],
-            'take_profit_pct': self._calculate_take_profit(leverage),
-            'confidence_level': confidence_level
-        }
-
-    def _check_market_conditions(self) -> Dict:
+    def _check_market_conditions(self, coin: Optional[str] = None) -> Dict:
         """
         시장 상황 모니터링
 
-        TODO: 실제 공포/탐욕 지수 API 연동
+        RegimeDetector가 백그라운드에서 게시한 코인별 국면 상태를 읽기만 한다 (O(1), 네트워크 요청 없음).
+        감지기가 없거나 아직 해당 코인 데이터가 없으면 거래를 막지 않는다.
         """
-        # 현재는 항상 안전하다고 가정
-        # 실제 구현 시:
-        # - Fear & Greed Index 확인
-        # - 변동성 지표 확인
-        # - 거래량 확인
+        state = self.regime.get_state(coin) if self.regime is not None and coin else None
+        if state is None:
+            return {
+                'safe_to_trade': True,
+                'reason': 'normal_market' if self.regime is None else 'no_regime_data'
+            }
 
         return {
-            'safe_to_trade': True,
-            'reason': 'normal_market'
+            'safe_to_trade': state['safe_to_trade'],
+            'reason': state['reason'],
+            'regime': state['regime']
         }
 
     def _calculate_take_profit(self, leverage: int) -> float:
@@ -139,38 +197,87 @@ class RiskManager:
         else:
             return 0.15  # 15%
 
+    def reserve_exposure(self, symbol: str, amount: float, account_balance: float) -> Optional[int]:
+        """
+        주문 직전 증거금 예약 (전체 노출 한도 안일 때만, 원자적)
+
+        Parameters:
+        -----------
+        symbol : str
+            거래 심볼 (예: 'BTC/USDT')
+        amount : float
+            주문 금액 (USDT)
+        account_balance : float
+            계좌 잔고
+
+        Returns:
+        --------
+        int : 예약 ID (한도 초과 시 None)
+        """
+        return self.exposure.try_reserve(symbol, amount, self.max_total_exposure * account_balance)
+
+    def release_exposure(self, reservation_id: int):
+        """주문 실패 시 예약 해제"""
+        self.exposure.release(reservation_id)
+
+    def record_fill(self, position: Dict, reservation_id: Optional[int] = None):
+        """체결된 포지션을 노출 원장에 반영"""
+        self.exposure.record_fill(position, reservation_id)
+
+    def record_close(self, trade_id: str):
+        """청산된 포지션을 노출 원장에서 제거"""
+        self.exposure.record_close(trade_id)
+
+    def update_mark_price(self, symbol: str, price: float):
+        """시세 갱신 (미실현 손익 재평가)"""
+        self.exposure.update_mark(symbol, price)
+
+    def load_open_positions(self, positions: Iterable[Dict]):
+        """서버 시작 시 열린 포지션으로 노출 원장 복원"""
+        for position in positions:
+            self.exposure.record_fill(position)
+        logger.info(f"📒 노출 원장 복원: {self.exposure.snapshot()['total']['positions']}개 포지션")
+
+    def get_exposure_snapshot(self) -> Dict:
+        """전체/코인별 노출 스냅샷 (스레드 안전)"""
+        snapshot = self.exposure.snapshot()
+        snapshot['max_total_exposure'] = self.max_total_exposure
+        return snapshot
+
     def update_daily_pnl(self, pnl: float):
         """일일 손익 업데이트"""
-        today = datetime.now().date()
+        with self._lock:
+            today = datetime.now().date()
 
-        # 날짜가 바뀌면 초기화
-        if self.daily_trades and self.daily_trades[0]['date'] != today:
-            self.daily_trades = []
-            self.daily_pnl = 0.0
+            # 날짜가 바뀌면 초기화
+            if self.daily_trades and self.daily_trades[0]['date'] != today:
+                self.daily_trades = []
+                self.daily_pnl = 0.0
 
-        self.daily_pnl += pnl
+            self.daily_pnl += pnl
 
-        self.daily_trades.append({
-            'date': today,
-            'pnl': pnl,
-            'timestamp': datetime.now()
-        })
+            self.daily_trades.append({
+                'date': today,
+                'pnl': pnl,
+                'timestamp': datetime.now()
+            })
 
-        logger.info(f"📊 일일 손익 업데이트: {self.daily_pnl:+.2%}")
+            logger.info(f"📊 일일 손익 업데이트: {self.daily_pnl:+.2%}")
 
-        # 일일 손실 한도 경고
-        if abs(self.daily_pnl) >= self.max_daily_loss * 0.8:
-            logger.warning(f"⚠️  일일 손실 한도 80% 도달: {self.daily_pnl:.2%}")
+            # 일일 손실 한도 경고
+            if abs(self.daily_pnl) >= self.max_daily_loss * 0.8:
+                logger.warning(f"⚠️  일일 손실 한도 80% 도달: {self.daily_pnl:.2%}")
 
     def get_risk_report(self) -> Dict:
         """리스크 현황 보고서"""
-        return {
-            'daily_pnl': self.daily_pnl,
-            'daily_trades_count': len(self.daily_trades),
-            'max_daily_loss': self.max_daily_loss,
-            'remaining_risk_capacity': self.max_daily_loss - abs(self.daily_pnl),
-            'safe_to_trade': abs(self.daily_pnl) < self.max_daily_loss
-        }
+        with self._lock:
+            return {
+                'daily_pnl': self.daily_pnl,
+                'daily_trades_count': len(self.daily_trades),
+                'max_daily_loss': self.max_daily_loss,
+                'remaining_risk_capacity': self.max_daily_loss - abs(self.daily_pnl),
+                'safe_to_trade': abs(self.daily_pnl) < self.max_daily_loss
+            }
 
 
 # 테스트 코드
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+서비스 컨테이너 모듈
+무거운 클라이언트(anthropic, ccxt, selenium, firebase 등)를 첫 사용 시 생성하고 백그라운드에서 병렬 예열
+"""
+
+import time
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyService:
+    """
+    컨테이너 서비스 대리 객체
+
+    속성에 처음 접근할 때 서비스를 생성(또는 예열이 끝나기를 기다림)하므로, 모듈 전역
+    변수로 두고 기존처럼 service.method(...)로 호출할 수 있다.
+    """
+
+    __slots__ = ('_container', '_name')
+
+    def __init__(self, container: 'ServiceContainer', name: str):
+        self._container = container
+        self._name = name
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._container.get(self._name), attr)
+
+    def __repr__(self) -> str:
+        return f"<LazyService {self._name}>"
+
+
+class ServiceContainer:
+    """
+    지연 생성 서비스 컨테이너
+
+    register()로 팩토리와 의존 서비스만 등록해 두고, get()이 처음 호출될 때 의존 서비스부터
+    생성한다. 팩토리 안에서 모듈을 import하므로 서버 import 시점에는 무거운 라이브러리를
+    불러오지 않는다. warm_up()은 스레드 풀에서 모든 서비스를 병렬로 생성하며 즉시 반환한다.
+    서비스별 잠금으로 예열과 요청이 동시에 같은 서비스를 만들지 않는다.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, tuple] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._errors: Dict[str, str] = {}
+        self._timings: Dict[str, float] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def register(self, name: str, factory: Callable, depends_on: Iterable[str] = ()):
+        """
+        서비스 등록 (생성하지 않음)
+
+        Parameters:
+        -----------
+        name : str
+            서비스 이름
+        factory : Callable
+            의존 서비스 인스턴스를 순서대로 받아 서비스를 만드는 함수
+        depends_on : Iterable[str]
+            먼저 생성해야 하는 서비스 이름
+        """
+        self._factories[name] = (factory, tuple(depends_on))
+        self._locks[name] = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        """서비스 조회 (처음 호출 시 의존 서비스와 함께 생성)"""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        factory, depends_on = self._factories[name]
+        with self._locks[name]:
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+
+            dependencies = [self.get(dependency) for dependency in depends_on]
+            start = time.perf_counter()
+            try:
+                instance = factory(*dependencies)
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.error(f"❌ 서비스 생성 실패 ({name}): {e}")
+                raise
+
+            self._timings[name] = time.perf_counter() - start
+            self._errors.pop(name, None)
+            self._instances[name] = instance
+            logger.info(f"✅ 서비스 준비: {name} ({self._timings[name] * 1000:.0f}ms)")
+            return instance
+
+    def peek(self, name: str) -> Optional[Any]:
+        """이미 생성된 서비스만 반환 (없으면 None, 생성하지 않음)"""
+        return self._instances.get(name)
+
+    def lazy(self, name: str) -> LazyService:
+        """첫 속성 접근 시 생성되는 대리 객체"""
+        return LazyService(self, name)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, max_workers: int = 4) -> List:
+        """
+        백그라운드 병렬 예열 (즉시 반환)
+
+        Returns:
+        --------
+        List[Future] : 서비스별 생성 작업
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='warm-up')
+
+        futures = []
+        for name in (names or list(self._factories)):
+            future = self._executor.submit(self.get, name)
+            # 실패는 get()에서 기록하므로 예외를 꺼내 두기만 함 (요청 시 재시도)
+            future.add_done_callback(lambda f: f.exception())
+            futures.append(future)
+        return futures
+
+    def status(self) -> Dict[str, Dict]:
+        """서비스별 상태 ('ready' / 'failed' / 'pending')와 생성 시간"""
+        status = {}
+        for name in self._factories:
+            if name in self._instances:
+                status[name] = {'state': 'ready', 'init_ms': round(self._timings[name] * 1000, 1)}
+            elif name in self._errors:
+                status[name] = {'state': 'failed', 'error': self._errors[name]}
+            else:
+                status[name] = {'state': 'pending'}
+        return status
+
+    def shutdown(self):
+        """예열 스레드 정리 (시작하지 않은 예열은 취소)"""
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    def slow(name, seconds):
+        def factory(*dependencies):
+            time.sleep(seconds)
+            return type(name, (), {'name': name, 'dependencies': [d.name for d in dependencies]})()
+        return factory
+
+    container = ServiceContainer()
+    container.register('firestore', slow('firestore', 0.3))
+    container.register('sentiment', slow('sentiment', 0.4))
+    container.register('signals', slow('signals', 0.3))
+    container.register('positions', slow('positions', 0.5))
+    container.register('risk', slow('risk', 0.1), depends_on=['firestore'])
+
+    risk = container.lazy('risk')
+    print(f"등록 직후: {container.status()}")
+
+    start = time.perf_counter()
+    futures = container.warm_up()
+    print(f"warm_up 반환: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    print(f"risk 의존: {risk.dependencies} ({(time.perf_counter() - start) * 1000:.0f}ms)")
+    for future in futures:
+        future.result()
+    print(f"전체 예열 {(time.perf_counter() - start):.2f}s (순차 생성 시 1.60s)")
+    print(container.status())
+    container.shutdown()
@@ -16,9 +16,14 @@ from pathlib import Path
 # 기존 모듈 임포트
 sys.path.append(str(Path(__file__).parent.parent))
 from BaseTradingStrategy import BaseTradingStrategy
+from candle_cache import CandleCache
 
 logger = logging.getLogger(__name__)
 
+# 다중 타임프레임 확인에 쓰는 상위/하위 봉 (1분봉 리샘플이라 추가 네트워크 요청 없음)
+CONFIRM_TIMEFRAMES = ('15m', '4h')
+CONFIRM_EMA_PERIOD = 20
+
 
 class SignalGenerator:
     """
@@ -33,6 +38,9 @@ class SignalGenerator:
             'enableRateLimit': True,
         })
 
+        # 캔들 공유 캐시 (리스크 엔진도 같은 캔들을 사용)
+        self.candles = CandleCache(self.exchange)
+
         # 기술적 분석 전략 (Base클래스는 인스턴스화 불가하므로 주석 처리)
         # self.strategy = BaseTradingStrategy()
 
@@ -64,18 +72,8 @@ class SignalGenerator:
         Dict : 기술적 분석 결과
         """
         try:
-            # OHLCV 데이터 가져오기
-            ohlcv = self.exchange.fetch_ohlcv(
-                symbol,
-                timeframe=timeframe,
-                limit=100
-            )
-
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            # OHLCV 데이터 가져오기 (캐시에서 새 봉만 증분 갱신)
+            df = self.candles.get_frame(symbol, timeframe=timeframe, limit=100)
 
             # MACD 분석
             macd_signal = self._calculate_macd(df)
@@ -99,6 +97,10 @@ class SignalGenerator:
                 volume_confirmed=volume_confirmed
             )
 
+            # 다중 타임프레임 추세 확인
+            mtf_trends = self._check_multi_timeframe(symbol, timeframe)
+            mtf_confirmed = self._is_trend_confirmed(combined_signal['action'], mtf_trends)
+
             return {
                 'symbol': symbol,
                 'timeframe': timeframe,
@@ -106,6 +108,8 @@ class SignalGenerator:
                 'rsi_signal': rsi_signal,
                 'bb_signal': bb_signal,
                 'volume_confirmed': volume_confirmed,
+                'mtf_trends': mtf_trends,
+                'mtf_confirmed': mtf_confirmed,
                 'action': combined_signal['action'],
                 'confidence': combined_signal['confidence'],
                 'recommended_leverage': combined_signal['leverage'],
@@ -223,6 +227,42 @@ class SignalGenerator:
 
         return is_high_volume
 
+    def _check_multi_timeframe(self, symbol: str, timeframe: str) -> Dict[str, int]:
+        """
+        확인용 타임프레임별 추세 (종가가 EMA 위면 +1, 아래면 -1)
+
+        같은 1분봉 캐시에서 만든 봉을 복사 없이 읽으므로 추가 네트워크 요청이 없다.
+
+        Returns:
+        --------
+        Dict : {타임프레임: +1/-1} (데이터가 부족한 타임프레임은 제외)
+        """
+        trends = {}
+        for confirm_timeframe in CONFIRM_TIMEFRAMES:
+            if confirm_timeframe == timeframe:
+                continue
+            rows = self.candles.refresh(symbol, confirm_timeframe)
+            if rows is None or len(rows) < CONFIRM_EMA_PERIOD:
+                continue
+            close = pd.Series(rows[-CONFIRM_EMA_PERIOD * 5:, 4])
+            ema = close.ewm(span=CONFIRM_EMA_PERIOD, adjust=False).mean().iloc[-1]
+            trends[confirm_timeframe] = 1 if close.iloc[-1] >= ema else -1
+        return trends
+
+    def _is_trend_confirmed(self, action: str, trends: Dict[str, int]) -> bool:
+        """
+        매매 방향이 모든 확인용 타임프레임 추세와 일치하는지 확인
+
+        Returns:
+        --------
+        bool : True if confirmed (hold이거나 확인할 데이터가 없으면 True)
+        """
+        if action == 'buy':
+            return all(trend > 0 for trend in trends.values())
+        if action == 'sell':
+            return all(trend < 0 for trend in trends.values())
+        return True
+
     def _combine_signals(
         self,
         sentiment_score: float,
@@ -316,3 +356,4 @@ if __name__ == "__main__":
     print(f"  RSI: {'✅' if result['rsi_signal'] else '❌'}")
     print(f"  BB: {'✅' if result['bb_signal'] else '❌'}")
     print(f"  Volume: {'✅' if result['volume_confirmed'] else '❌'}")
+    print(f"  MTF {result['mtf_trends']}: {'✅' if result['mtf_confirmed'] else '❌'}")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+최근 신호 인덱스 모듈
+코인별/분 단위 버킷으로 최근 신호를 메모리에 유지 (3계층 검증의 유사 신호 조회용)
+"""
+
+import logging
+import threading
+from pathlib import Path
+import sys
+from typing import Dict, Iterable, List, Optional
+
+sys.path.append(str(Path(__file__).parent.parent))
+from timeUtils import to_epoch_ms, now_ms
+
+logger = logging.getLogger(__name__)
+
+MINUTE_MS = 60 * 1000
+
+
+class RecentSignalIndex:
+    """
+    슬라이딩 윈도우 신호 인덱스
+
+    신호를 coins의 각 코인에 대해 (코인, 분) 버킷에 넣는다. "최근 N분 안의 유사 신호" 조회는
+    코인마다 N+1개 버킷만 확인하므로 전체 신호 수와 무관하고, retention_minutes보다 오래된
+    버킷은 새 분이 시작될 때 정리한다.
+    """
+
+    def __init__(self, retention_minutes: int = 60):
+        """
+        Parameters:
+        -----------
+        retention_minutes : int
+            보관 기간 (분), 이보다 긴 기간 조회는 지원하지 않음
+        """
+        self.retention_minutes = retention_minutes
+        self._buckets: Dict[str, Dict[int, List]] = {}
+        self._last_prune_minute = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len({id(signal) for buckets in self._buckets.values()
+                        for bucket in buckets.values() for _, signal in bucket})
+
+    def add(self, signal: Dict) -> bool:
+        """
+        신호 추가
+
+        Parameters:
+        -----------
+        signal : Dict
+            timestamp와 coins를 포함한 신호
+
+        Returns:
+        --------
+        bool : 인덱스에 추가되었는지 여부 (보관 기간 밖이거나 시각 파싱 실패 시 False)
+        """
+        timestamp_ms = to_epoch_ms(signal.get('timestamp'))
+        if timestamp_ms is None:
+            return False
+
+        current_minute = now_ms() // MINUTE_MS
+        minute = timestamp_ms // MINUTE_MS
+        if minute < current_minute - self.retention_minutes:
+            return False
+
+        with self._lock:
+            for coin in set(signal.get('coins') or []):
+                self._buckets.setdefault(coin, {}).setdefault(minute, []).append((timestamp_ms, signal))
+            self._prune(current_minute)
+        return True
+
+    def add_many(self, signals: Iterable[Dict]) -> int:
+        """여러 신호 추가 (추가된 개수 반환)"""
+        return sum(1 for signal in signals if self.add(signal))
+
+    def _prune(self, current_minute: int):
+        """보관 기간이 지난 버킷 삭제 (분이 바뀔 때 한 번)"""
+        if self._last_prune_minute == current_minute:
+            return
+        self._last_prune_minute = current_minute
+
+        oldest = current_minute - self.retention_minutes
+        for coin in list(self._buckets):
+            buckets = self._buckets[coin]
+            for minute in [m for m in buckets if m < oldest]:
+                del buckets[minute]
+            if not buckets:
+                del self._buckets[coin]
+
+    def recent(self, coins: List[str], minutes: int = 60, now: Optional[int] = None) -> List[Dict]:
+        """
+        최근 유사 신호 조회 (coins 중 하나라도 포함한 신호, 중복 제거)
+
+        Parameters:
+        -----------
+        coins : List[str]
+            코인 리스트
+        minutes : int
+            조회 기간 (분, retention_minutes 이하)
+        now : int, optional
+            기준 시각 (epoch ms, 기본값: 현재)
+
+        Returns:
+        --------
+        List[Dict] : 신호 리스트 (시각순)
+        """
+        if minutes > self.retention_minutes:
+            raise ValueError(f"조회 기간({minutes}분)이 보관 기간({self.retention_minutes}분)보다 깁니다")
+
+        now = now_ms() if now is None else now
+        cutoff_ms = now - minutes * MINUTE_MS
+        first_minute = cutoff_ms // MINUTE_MS
+        last_minute = now // MINUTE_MS
+
+        seen = set()
+        matches = []
+        with self._lock:
+            for coin in set(coins):
+                buckets = self._buckets.get(coin)
+                if not buckets:
+                    continue
+                for minute in range(first_minute, last_minute + 1):
+                    for timestamp_ms, signal in buckets.get(minute, ()):
+                        if timestamp_ms >= cutoff_ms and id(signal) not in seen:
+                            seen.add(id(signal))
+                            matches.append((timestamp_ms, signal))
+
+        matches.sort(key=lambda match: match[0])
+        return [signal for _, signal in matches]
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import random
+    from datetime import datetime, timedelta
+
+    logging.basicConfig(level=logging.INFO)
+
+    random.seed(0)
+    coins = ['BTC', 'ETH', 'DOGE', 'SHIB', 'XRP', 'SOL', 'TRUMP', 'PEPE']
+    now = datetime.now()
+    signals = [
+        {
+            'id': str(i),
+            'timestamp': now - timedelta(seconds=random.uniform(0, 90 * 60)),
+            'coins': random.sample(coins, random.randint(1, 3))
+        }
+        for i in range(20000)
+    ]
+
+    index = RecentSignalIndex(retention_minutes=60)
+    start = time.perf_counter()
+    added = index.add_many(signals)
+    print(f"신호 {len(signals)}개 중 {added}개 인덱싱: {time.perf_counter() - start:.3f}초")
+
+    query = ['BTC', 'DOGE']
+    cutoff_ms = to_epoch_ms(now) - 60 * MINUTE_MS
+    expected = {s['id'] for s in signals if to_epoch_ms(s['timestamp']) >= cutoff_ms and set(s['coins']) & set(query)}
+
+    start = time.perf_counter()
+    for _ in range(100):
+        result = index.recent(query, minutes=60, now=to_epoch_ms(now))
+    print(f"최근 60분 {query} 조회: {len(result)}개, {(time.perf_counter() - start) * 10:.3f}ms/회")
+    assert {s['id'] for s in result} == expected
+    print("전체 스캔 결과와 일치")
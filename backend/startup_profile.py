@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+서버 시작 시간 측정 모듈
+import 시간 프로파일(python -X importtime)과 콜드 스타트부터 첫 "/" 응답까지의 시간 측정
+"""
+
+import sys
+import time
+import json
+import logging
+import subprocess
+from pathlib import Path
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).parent
+
+# 콜드 스타트 목표 (초)
+COLD_START_TARGET = 1.0
+
+# 새 프로세스에서 main을 import하고 시작 이벤트 후 "/" 첫 응답까지 측정
+COLD_START_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    started = time.perf_counter()
+    response = client.get('/')
+    responded = time.perf_counter()
+    print(json.dumps({
+        'import': imported - start,
+        'startup': started - imported,
+        'first_response': responded - start,
+        'status_code': response.status_code,
+        'services': response.json().get('services')
+    }))
+"""
+
+
+def profile_imports(module: str = 'main', top: int = 15) -> List[Dict]:
+    """
+    새 프로세스에서 module을 import할 때 오래 걸린 모듈 목록 (python -X importtime)
+
+    Parameters:
+    -----------
+    module : str
+        측정할 모듈 이름
+    top : int
+        반환할 모듈 수
+
+    Returns:
+    --------
+    List[Dict] : 누적 시간 순 [{'module', 'self_ms', 'cumulative_ms'}]
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append({
+            'module': name.strip(),
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000
+        })
+    return sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:top]
+
+
+def measure_cold_start(runs: int = 3) -> Dict:
+    """
+    새 프로세스에서 import + 시작 이벤트 + 첫 "/" 응답까지의 시간 (runs회 중 중앙값)
+
+    Returns:
+    --------
+    Dict : import/startup/first_response (초), status_code, 응답 시점의 서비스 상태
+    """
+    results = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, '-c', COLD_START_SCRIPT],
+            cwd=BACKEND_DIR, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip().splitlines()[-1])
+        results.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    results.sort(key=lambda r: r['first_response'])
+    return results[len(results) // 2]
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        print("=== import 시간 상위 모듈 (main) ===")
+        for row in profile_imports('main'):
+            print(f"{row['cumulative_ms']:8.1f}ms (자체 {row['self_ms']:6.1f}ms)  {row['module']}")
+
+        cold_start = measure_cold_start()
+        passed = cold_start['first_response'] < COLD_START_TARGET
+        print(f"\n=== 콜드 스타트 ===")
+        print(f"import {cold_start['import']:.3f}s, startup {cold_start['startup']:.3f}s, "
+              f"첫 '/' 응답 {cold_start['first_response']:.3f}s "
+              f"({'✅' if passed else '❌'} 목표 {COLD_START_TARGET:.1f}s)")
+        print(f"응답 시점 서비스 상태: {cold_start['services']}")
+    except Exception as e:
+        logger.error(f"❌ 시작 시간 측정 실패: {e}")
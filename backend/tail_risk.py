@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+꼬리 위험 엔진 모듈
+캐시된 캔들로 상관된 수익률 경로를 시뮬레이션해 포트폴리오 VaR/CVaR와 포지션별 청산 확률 계산
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class TailRiskEngine:
+    """
+    몬테카를로 꼬리 위험 엔진
+
+    모든 심볼의 같은 시각 로그 수익률 행을 통째로 복원 추출(bootstrap)해 경로를 만들므로
+    코인 간 상관관계와 두꺼운 꼬리가 그대로 유지된다. 한 번의 벡터 연산으로 경로 배열
+    (경로 수, 기간, 심볼 수)을 만들고, 포트폴리오 손익 분포와 모든 포지션의 청산선 도달
+    여부를 함께 계산한다. 경로 수는 직전 실행 시간을 기준으로 cpu_budget 안에 들도록 조정한다.
+    """
+
+    def __init__(
+        self,
+        candle_cache,
+        exposure_ledger,
+        timeframe: str = '1h',
+        horizon_bars: int = 24,
+        lookback_bars: int = 500,
+        min_coverage: float = 0.9,
+        n_paths: int = 5000,
+        min_paths: int = 500,
+        confidence: float = 0.99,
+        maintenance_margin: float = 0.005,
+        cpu_budget: float = 0.25,
+        seed: Optional[int] = None
+    ):
+        """
+        Parameters:
+        -----------
+        candle_cache : CandleCache
+            공유 캔들 캐시
+        exposure_ledger : ExposureLedger
+            열린 포지션 원장
+        timeframe : str
+            시뮬레이션에 쓰는 봉 단위
+        horizon_bars : int
+            시뮬레이션 기간 (봉 수, 기본 24시간)
+        lookback_bars : int
+            수익률 표본으로 쓰는 최근 봉 수
+        min_coverage : float
+            보유하지 않은 심볼을 추가할 때 유지해야 하는 공통 구간 비율 (lookback_bars 대비)
+        n_paths : int
+            최대 경로 수
+        min_paths : int
+            최소 경로 수 (CPU 예산이 부족해도 유지)
+        confidence : float
+            VaR/CVaR 신뢰수준
+        maintenance_margin : float
+            유지 증거금률 (청산 가격 계산용)
+        cpu_budget : float
+            1회 실행 목표 시간 (초)
+        """
+        self.candle_cache = candle_cache
+        self.exposure_ledger = exposure_ledger
+        self.timeframe = timeframe
+        self.horizon_bars = horizon_bars
+        self.lookback_bars = lookback_bars
+        self.min_coverage = min_coverage
+        self.max_paths = n_paths
+        self.min_paths = min_paths
+        self.n_paths = n_paths
+        self.confidence = confidence
+        self.maintenance_margin = maintenance_margin
+        self.cpu_budget = cpu_budget
+        self.rng = np.random.default_rng(seed)
+
+        self._result: Optional[Dict] = None
+        self._dropped = set()
+        self._paths: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _aligned_returns(self, symbols: List[str], required: Iterable[str] = ()):
+        """
+        심볼들의 공통 시각 로그 수익률 행렬 (봉 수, 심볼 수)
+
+        보유 심볼(required)은 항상 포함하고, 나머지는 공통 구간이 최소 겹침 아래로 줄지 않을
+        때만 추가한다. 신규 상장이나 결측이 많은 심볼 하나가 전체 표본을 줄이지 않도록 한다.
+        """
+        series = {}
+        for symbol in symbols:
+            rows = self.candle_cache.get(symbol, self.timeframe)
+            if rows is not None and len(rows) > self.horizon_bars:
+                series[symbol] = rows[-(self.lookback_bars + 1):]
+        if not series:
+            return [], None
+
+        required = set(required)
+        min_overlap = max(self.horizon_bars + 1, int(self.lookback_bars * self.min_coverage))
+
+        names = []
+        common = None
+        dropped = []
+        for symbol in sorted(series, key=lambda s: s not in required):
+            timestamps = series[symbol][:, 0]
+            candidate = timestamps if common is None else np.intersect1d(common, timestamps, assume_unique=True)
+            if symbol not in required and len(candidate) < min_overlap:
+                dropped.append(symbol)
+                continue
+            names.append(symbol)
+            common = candidate
+
+        if set(dropped) != self._dropped:
+            self._dropped = set(dropped)
+            if dropped:
+                logger.info(f"꼬리 위험: 공통 구간이 {min_overlap}봉 미만이 되는 심볼 제외 {dropped}")
+        if common is None or len(common) < 2:
+            return [], None
+        if len(common) < min_overlap:
+            logger.warning(f"꼬리 위험: 보유 심볼 공통 구간 {len(common)}봉 (권장 {min_overlap}봉 이상)")
+
+        closes = np.column_stack([
+            series[symbol][np.isin(series[symbol][:, 0], common), 4] for symbol in names
+        ])
+        return names, np.diff(np.log(closes), axis=0)
+
+    def simulate(self) -> Optional[Dict]:
+        """
+        경로 시뮬레이션 1회 실행 및 결과 갱신
+
+        Returns:
+        --------
+        Dict : VaR/CVaR/포지션별 청산 확률 (캔들이 없으면 None)
+        """
+        start = time.perf_counter()
+        positions = self.exposure_ledger.positions()
+        watch = set(self.candle_cache.symbols(self.timeframe)) | {p[1] for p in positions}
+        symbols, returns = self._aligned_returns(sorted(watch), required={p[1] for p in positions})
+        if returns is None:
+            return None
+
+        n_paths = self.n_paths
+        # (경로, 기간, 심볼) 로그 수익률 -> 누적 가격 비율 경로
+        rows = self.rng.integers(0, len(returns), size=(n_paths, self.horizon_bars))
+        log_paths = np.cumsum(returns[rows], axis=1)
+        final_ratio = np.exp(log_paths[:, -1, :])
+        min_ratio = np.exp(np.minimum(log_paths.min(axis=1), 0.0))
+        max_ratio = np.exp(np.maximum(log_paths.max(axis=1), 0.0))
+
+        result = {
+            'symbols': symbols,
+            'n_paths': n_paths,
+            'horizon_bars': self.horizon_bars,
+            'timeframe': self.timeframe,
+            'confidence': self.confidence,
+            'var': 0.0,
+            'cvar': 0.0,
+            'positions': {}
+        }
+
+        if positions:
+            index = {symbol: i for i, symbol in enumerate(symbols)}
+            held = [p for p in positions if p[1] in index and p[6]]
+            if held:
+                trade_ids = [p[0] for p in held]
+                cols = np.array([index[p[1]] for p in held])
+                margin = np.array([p[2] for p in held])
+                leverage = np.array([p[3] for p in held])
+                entry = np.array([p[4] for p in held])
+                direction = np.array([p[5] for p in held])
+                mark = np.array([p[6] for p in held])
+
+                # 현재 시세 기준 기간 말 손익 (경로, 포지션)
+                exposure = direction * margin * leverage * mark / entry
+                pnl = (final_ratio[:, cols] - 1.0) * exposure
+                portfolio = pnl.sum(axis=1)
+                cutoff = np.quantile(portfolio, 1 - self.confidence)
+                result['var'] = float(-cutoff)
+                result['cvar'] = float(-portfolio[portfolio <= cutoff].mean())
+
+                # 격리 증거금 청산 가격을 현재 시세 대비 비율로 환산
+                threshold = 1.0 / leverage - self.maintenance_margin
+                long_liq = entry * (1 - threshold) / mark
+                short_liq = entry * (1 + threshold) / mark
+                hit = np.where(
+                    direction > 0,
+                    min_ratio[:, cols] <= long_liq,
+                    max_ratio[:, cols] >= short_liq
+                )
+                probabilities = hit.mean(axis=0)
+                result['positions'] = {
+                    trade_id: {
+                        'liquidation_probability': float(probability),
+                        'var_contribution': float(-pnl[portfolio <= cutoff, i].mean())
+                    }
+                    for i, (trade_id, probability) in enumerate(zip(trade_ids, probabilities))
+                }
+
+        elapsed = time.perf_counter() - start
+        result['elapsed'] = elapsed
+        result['computed_at'] = time.time()
+
+        with self._lock:
+            self._result = result
+            self._paths = {
+                'index': {symbol: i for i, symbol in enumerate(symbols)},
+                'min_ratio': min_ratio,
+                'max_ratio': max_ratio
+            }
+
+        # 다음 실행 경로 수를 CPU 예산에 맞춤
+        per_path = elapsed / n_paths
+        self.n_paths = int(min(self.max_paths, max(self.min_paths, self.cpu_budget / per_path)))
+        return result
+
+    def latest(self) -> Optional[Dict]:
+        """마지막 시뮬레이션 결과"""
+        with self._lock:
+            return self._result
+
+    def liquidation_probability(self, symbol: str, leverage: float, side: Optional[str] = None) -> Optional[float]:
+        """
+        현재 시세에 새 포지션을 열 때의 청산 확률 (마지막 경로 재사용, 재시뮬레이션 없음)
+
+        Parameters:
+        -----------
+        symbol : str
+            거래 심볼 (예: 'BTC/USDT')
+        leverage : float
+            레버리지
+        side : str, optional
+            'buy' 또는 'sell' (없으면 두 방향 중 큰 값)
+
+        Returns:
+        --------
+        float : 청산 확률 (해당 심볼 경로가 없으면 None)
+        """
+        with self._lock:
+            paths = self._paths
+        if paths is None or symbol not in paths['index']:
+            return None
+
+        col = paths['index'][symbol]
+        threshold = 1.0 / leverage - self.maintenance_margin
+        long_probability = float((paths['min_ratio'][:, col] <= 1 - threshold).mean())
+        short_probability = float((paths['max_ratio'][:, col] >= 1 + threshold).mean())
+        if side == 'buy':
+            return long_probability
+        if side == 'sell':
+            return short_probability
+        return max(long_probability, short_probability)
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                # 보유 코인 캔들은 엔진 스레드에서 갱신 (주문 경로에서는 조회만)
+                for symbol in {p[1] for p in self.exposure_ledger.positions()}:
+                    self.candle_cache.refresh(symbol, self.timeframe)
+                result = self.simulate()
+                if result:
+                    logger.debug(f"꼬리 위험: VaR {result['var']:.2f}, CVaR {result['cvar']:.2f} "
+                                 f"({result['n_paths']}경로, {result['elapsed'] * 1000:.0f}ms)")
+            except Exception as e:
+                logger.error(f"❌ 꼬리 위험 계산 실패: {e}")
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 5.0):
+        """백그라운드 주기 실행 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='tail-risk', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    from exposure_ledger import ExposureLedger
+
+    logging.basicConfig(level=logging.INFO)
+
+    class StaticCache:
+        """고정 캔들을 돌려주는 테스트용 캐시"""
+
+        def __init__(self, data):
+            self.data = data
+
+        def get(self, symbol, timeframe='1h'):
+            return self.data.get(symbol)
+
+        def refresh(self, symbol, timeframe='1h'):
+            return self.data.get(symbol)
+
+        def symbols(self, timeframe='1h'):
+            return list(self.data)
+
+    rng = np.random.default_rng(0)
+    bars = 1000
+    symbols = ['BTC/USDT', 'ETH/USDT', 'DOGE/USDT', 'SHIB/USDT', 'FLOKI/USDT', 'TRUMP/USDT', 'MAGA/USDT']
+    vols = np.array([0.006, 0.008, 0.012, 0.015, 0.02, 0.025, 0.03])
+    market = rng.standard_t(4, size=bars) * 0.5
+    shocks = (market[:, None] + rng.standard_t(4, size=(bars, len(symbols)))) * vols
+    timestamps = np.arange(bars) * 3600 * 1000.0
+    data = {}
+    for i, symbol in enumerate(symbols):
+        close = 100 * np.exp(np.cumsum(shocks[:, i]))
+        data[symbol] = np.column_stack([timestamps, close, close, close, close, np.ones(bars)])
+
+    ledger = ExposureLedger()
+    for i, (symbol, leverage, side) in enumerate([('BTC/USDT', 10, 'buy'), ('ETH/USDT', 5, 'sell'),
+                                                   ('DOGE/USDT', 10, 'buy'), ('MAGA/USDT', 3, 'buy')]):
+        price = data[symbol][-1, 4]
+        ledger.record_fill({'trade_id': f't{i}', 'symbol': symbol, 'side': side, 'leverage': leverage,
+                            'amount': 100, 'entry_price': price})
+
+    engine = TailRiskEngine(StaticCache(data), ledger, n_paths=5000, cpu_budget=0.1, seed=1)
+    for _ in range(3):
+        result = engine.simulate()
+        print(f"{result['n_paths']}경로 x {result['horizon_bars']}봉 x {len(result['symbols'])}심볼: "
+              f"{result['elapsed'] * 1000:.1f}ms, VaR99 ${result['var']:.2f}, CVaR99 ${result['cvar']:.2f}")
+    for trade_id, stats in result['positions'].items():
+        print(f"  {trade_id}: 청산 확률 {stats['liquidation_probability']:.2%}, "
+              f"VaR 기여 ${stats['var_contribution']:.2f}")
+    for leverage in (3, 5, 10):
+        print(f"DOGE {leverage}x 신규 롱 청산 확률: {engine.liquidation_probability('DOGE/USDT', leverage, 'buy'):.2%}")
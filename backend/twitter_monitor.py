@@ -5,12 +5,18 @@ reverageAI.py 기반 개선 버전
 """
 
 import os
+import sys
 import json
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import List, Dict
 from pathlib import Path
 
+# 상위 디렉토리 모듈 import
+sys.path.append(str(Path(__file__).parent.parent))
+from tracing import get_tracer
+
 logger = logging.getLogger(__name__)
 
 
@@ -70,6 +76,8 @@ def collect_influencer_tweets() -> List[Dict]:
     collected_tweets = []
 
     for influencer in INFLUENCERS:
+        fetch_started = time.monotonic_ns()
+
         # 현재는 더미 트윗 생성 (실제 구현 시 Twitter API v2 사용)
         tweets = _get_recent_tweets_dummy(
             username=influencer['twitter_username'],
@@ -87,6 +95,8 @@ def collect_influencer_tweets() -> List[Dict]:
             tweet['avg_reaction_time'] = influencer['avg_reaction_time_minutes']
             tweet['source'] = 'twitter'
             tweet['collected_at'] = datetime.now().isoformat()
+            tweet['trace'] = get_tracer().start_trace('twitter', started_ns=fetch_started,
+                                                      username=influencer['twitter_username'])
 
         collected_tweets.extend(crypto_tweets)
 
@@ -5,10 +5,14 @@ Real-time cryptocurrency trading via Binance API with comprehensive features.
 """
 
 import os
+import copy
 import json
 import ccxt
+import queue
 import sqlite3
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 from dotenv import load_dotenv
@@ -18,6 +22,22 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Statement text is kept constant so pooled connections reuse their prepared statements
+_UPSERT_USER_SETTING_SQL = '''
+    INSERT OR REPLACE INTO user_settings (user_id, setting_key, setting_value, updated_at)
+    VALUES (?, ?, ?, datetime('now'))
+'''
+_SELECT_USER_SETTINGS_SQL = 'SELECT setting_key, setting_value FROM user_settings WHERE user_id = ?'
+_UPSERT_EXCHANGE_CONFIG_SQL = '''
+    INSERT OR REPLACE INTO exchange_configs
+    (user_id, exchange_name, api_key, secret_key, is_sandbox, updated_at)
+    VALUES (?, ?, ?, ?, ?, datetime('now'))
+'''
+_SELECT_EXCHANGE_CONFIGS_SQL = '''
+    SELECT exchange_name, api_key, secret_key, is_sandbox FROM exchange_configs
+    WHERE user_id = ?
+'''
+
 class BinanceTrader:
     """
     Enhanced Binance trading client with real-time data and execution capabilities
@@ -363,113 +383,213 @@ class BinanceTrader:
             'demo': True
         }
 
+class SQLiteConnectionPool:
+    """
+    Fixed-size pool of long-lived SQLite connections in WAL mode
+
+    Connections are opened once and reused, so each call skips the file open
+    and keeps the per-connection prepared statement cache warm. WAL mode lets
+    readers proceed while a write is in progress.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        """
+        Args:
+            db_path: SQLite database file
+            size: Maximum number of open connections
+            timeout: Seconds to wait for a connection or a database lock
+        """
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout,
+                               check_same_thread=False, cached_statements=256)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.timeout * 1000)}')
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; commits on success and rolls back on error"""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=self.timeout)
+
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
 class TradingConfiguration:
     """
     Manages user trading settings and configurations
+
+    Reads go through an in-process cache that holds each user's full settings
+    and exchange configs, loaded with one query on first access and dropped
+    whenever this instance writes for that user. Writes from another process
+    are not seen until clear_cache() is called.
     """
 
-    def __init__(self, db_path: str = 'tradecoin.db'):
+    def __init__(self, db_path: str = 'tradecoin.db', pool_size: int = 4):
         self.db_path = db_path
+        self._pool = SQLiteConnectionPool(db_path, size=pool_size)
+        self._settings_cache: Dict[str, Dict[str, Any]] = {}
+        self._exchange_cache: Dict[str, Dict[str, Dict]] = {}
+        self._versions: Dict[str, int] = {}
+        self._cache_lock = threading.Lock()
         self._init_config_db()
 
     def _init_config_db(self):
         """Initialize configuration database tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # User settings table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_settings (
-                user_id TEXT NOT NULL,
-                setting_key TEXT NOT NULL,
-                setting_value TEXT NOT NULL,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (user_id, setting_key)
-            )
-        ''')
-
-        # Exchange configurations table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS exchange_configs (
-                user_id TEXT NOT NULL,
-                exchange_name TEXT NOT NULL,
-                api_key TEXT,
-                secret_key TEXT,
-                is_sandbox BOOLEAN DEFAULT 1,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (user_id, exchange_name)
-            )
-        ''')
-
-        conn.commit()
-        conn.close()
+        with self._pool.connection() as conn:
+            cursor = conn.cursor()
+
+            # User settings table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS user_settings (
+                    user_id TEXT NOT NULL,
+                    setting_key TEXT NOT NULL,
+                    setting_value TEXT NOT NULL,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, setting_key)
+                )
+            ''')
+
+            # Exchange configurations table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS exchange_configs (
+                    user_id TEXT NOT NULL,
+                    exchange_name TEXT NOT NULL,
+                    api_key TEXT,
+                    secret_key TEXT,
+                    is_sandbox BOOLEAN DEFAULT 1,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (user_id, exchange_name)
+                )
+            ''')
+
+    def _invalidate(self, cache: Dict, user_id: str):
+        with self._cache_lock:
+            self._versions[user_id] = self._versions.get(user_id, 0) + 1
+            cache.pop(user_id, None)
+
+    def _fill(self, cache: Dict, user_id: str, version: int, value: Dict):
+        """Cache a loaded value unless a write for the user happened while it was loading"""
+        with self._cache_lock:
+            if self._versions.get(user_id, 0) == version:
+                cache[user_id] = value
+
+    def clear_cache(self):
+        """Drop all cached settings (e.g. after another process wrote to the database)"""
+        with self._cache_lock:
+            self._settings_cache.clear()
+            self._exchange_cache.clear()
 
     def save_user_setting(self, user_id: str, key: str, value: Any):
         """Save user setting"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_settings (user_id, setting_key, setting_value, updated_at)
-            VALUES (?, ?, ?, datetime('now'))
-        ''', (user_id, key, json.dumps(value)))
-
-        conn.commit()
-        conn.close()
+        self.save_user_settings(user_id, {key: value})
+
+    def save_user_settings(self, user_id: str, settings: Dict[str, Any]):
+        """Save several user settings in one transaction"""
+        with self._pool.connection() as conn:
+            conn.executemany(_UPSERT_USER_SETTING_SQL,
+                             [(user_id, key, json.dumps(value)) for key, value in settings.items()])
+        self._invalidate(self._settings_cache, user_id)
+
+    def _load_user_settings(self, user_id: str) -> Dict[str, Any]:
+        """Cached settings of a user, loading all of them with one query on a miss"""
+        settings = self._settings_cache.get(user_id)
+        if settings is None:
+            version = self._versions.get(user_id, 0)
+            with self._pool.connection() as conn:
+                rows = conn.execute(_SELECT_USER_SETTINGS_SQL, (user_id,)).fetchall()
+            settings = {key: json.loads(value) for key, value in rows}
+            self._fill(self._settings_cache, user_id, version, settings)
+        return settings
+
+    def get_user_settings(self, user_id: str) -> Dict[str, Any]:
+        """Get all settings of a user"""
+        return copy.deepcopy(self._load_user_settings(user_id))
 
     def get_user_setting(self, user_id: str, key: str, default=None):
         """Get user setting"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT setting_value FROM user_settings
-            WHERE user_id = ? AND setting_key = ?
-        ''', (user_id, key))
-
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return json.loads(result[0])
-        return default
+        value = self._load_user_settings(user_id).get(key, default)
+        # Cached containers are shared, so hand out copies
+        return copy.deepcopy(value) if isinstance(value, (dict, list)) else value
 
     def save_exchange_config(self, user_id: str, exchange_name: str,
                            api_key: str, secret_key: str, is_sandbox: bool = True):
         """Save exchange configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            INSERT OR REPLACE INTO exchange_configs
-            (user_id, exchange_name, api_key, secret_key, is_sandbox, updated_at)
-            VALUES (?, ?, ?, ?, ?, datetime('now'))
-        ''', (user_id, exchange_name, api_key, secret_key, is_sandbox))
+        with self._pool.connection() as conn:
+            conn.execute(_UPSERT_EXCHANGE_CONFIG_SQL,
+                         (user_id, exchange_name, api_key, secret_key, is_sandbox))
+        self._invalidate(self._exchange_cache, user_id)
+
+    def _load_exchange_configs(self, user_id: str) -> Dict[str, Dict]:
+        configs = self._exchange_cache.get(user_id)
+        if configs is None:
+            version = self._versions.get(user_id, 0)
+            with self._pool.connection() as conn:
+                rows = conn.execute(_SELECT_EXCHANGE_CONFIGS_SQL, (user_id,)).fetchall()
+            configs = {
+                exchange_name: {
+                    'api_key': api_key,
+                    'secret_key': secret_key,
+                    'is_sandbox': bool(is_sandbox)
+                }
+                for exchange_name, api_key, secret_key, is_sandbox in rows
+            }
+            self._fill(self._exchange_cache, user_id, version, configs)
+        return configs
 
-        conn.commit()
-        conn.close()
+    def get_exchange_configs(self, user_id: str) -> Dict[str, Dict]:
+        """Get all exchange configurations of a user, keyed by exchange name"""
+        return {name: dict(config) for name, config in self._load_exchange_configs(user_id).items()}
 
     def get_exchange_config(self, user_id: str, exchange_name: str) -> Optional[Dict]:
         """Get exchange configuration"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            SELECT api_key, secret_key, is_sandbox FROM exchange_configs
-            WHERE user_id = ? AND exchange_name = ?
-        ''', (user_id, exchange_name))
+        config = self._load_exchange_configs(user_id).get(exchange_name)
+        return dict(config) if config is not None else None
 
-        result = cursor.fetchone()
-        conn.close()
-
-        if result:
-            return {
-                'api_key': result[0],
-                'secret_key': result[1],
-                'is_sandbox': bool(result[2])
-            }
-        return None
+    def close(self):
+        """Close pooled database connections"""
+        self._pool.close()
 
 class RegionCurrencyManager:
     """
@@ -566,4 +686,19 @@ if __name__ == '__main__':
     print("\n=== Testing Multi-Symbol Data ===")
     multi_data = trader.get_multiple_market_data(['BTC/USDT', 'ETH/USDT', 'BNB/USDT'])
     for data in multi_data:
-        print(f"{data['symbol']}: ${data['price']:,.2f} ({data['change_percent_24h']:+.2f}%)")
\ No newline at end of file
+        print(f"{data['symbol']}: ${data['price']:,.2f} ({data['change_percent_24h']:+.2f}%)")
+
+    print("\n=== Testing Settings Store ===")
+    import time
+    import tempfile
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = TradingConfiguration(os.path.join(tmp_dir, 'settings.db'))
+        config.save_user_settings('demo_user', get_default_trading_settings())
+        config.save_exchange_config('demo_user', 'binance', 'key', 'secret')
+        start = time.perf_counter()
+        for _ in range(10000):
+            config.get_user_setting('demo_user', 'max_leverage')
+            config.get_exchange_config('demo_user', 'binance')
+        elapsed = time.perf_counter() - start
+        print(f"10,000 cached lookups: {elapsed * 1000:.1f}ms ({elapsed / 20000 * 1e6:.2f}us per call)")
+        config.close()
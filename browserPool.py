@@ -0,0 +1,232 @@
+import time
+import queue
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    재사용 가능한 웹드라이버 풀
+
+    브라우저를 매 요청마다 띄우고 닫는 대신, 미리 띄워 둔 드라이버를 빌려주고 돌려받는다.
+    빌려줄 때 상태 점검(health check)을 하고, 일정 페이지 수를 넘기거나 JS 힙 메모리가
+    한도를 넘으면 드라이버를 종료하고 새로 만든다(recycling).
+    """
+
+    def __init__(self, driver_factory, size=2, max_pages=50, max_memory_mb=1024, acquire_timeout=120):
+        """
+        Parameters:
+        -----------
+        driver_factory : callable
+            새 드라이버를 만드는 함수 (실패 시 None 반환)
+        size : int
+            동시에 유지할 최대 드라이버 수
+        max_pages : int
+            드라이버 하나가 처리할 최대 페이지 수 (초과 시 재생성)
+        max_memory_mb : float
+            JS 힙 사용량 한도 (MB, Chrome에서만 측정 가능)
+        acquire_timeout : float
+            드라이버 대기 최대 시간 (초)
+        """
+        self.driver_factory = driver_factory
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.acquire_timeout = acquire_timeout
+
+        self._idle = queue.LifoQueue()  # 최근에 쓴(따뜻한) 드라이버부터 재사용
+        self._pages = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # 드라이버 생성/폐기
+    # ------------------------------------------------------------------
+    def _create(self):
+        start = time.time()
+        try:
+            driver = self.driver_factory()
+        except Exception:
+            # 예약한 자리 반환 (반환하지 않으면 실패가 쌓여 acquire가 대기만 함)
+            with self._lock:
+                self._created -= 1
+            raise
+        if driver is None:
+            with self._lock:
+                self._created -= 1
+            return None
+
+        self._pages[id(driver)] = 0
+        logger.info(f"브라우저 풀: 새 드라이버 생성 ({time.time() - start:.1f}초)")
+        return driver
+
+    def _discard(self, driver, reason=""):
+        with self._lock:
+            self._created -= 1
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        logger.info(f"브라우저 풀: 드라이버 폐기 {reason}")
+
+    def _is_healthy(self, driver):
+        """드라이버 세션이 살아 있는지 확인"""
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _memory_mb(self, driver):
+        """JS 힙 사용량 (MB, 측정 불가 시 0)"""
+        try:
+            used = driver.execute_script(
+                "return window.performance && window.performance.memory ? window.performance.memory.usedJSHeapSize : 0"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    # ------------------------------------------------------------------
+    # 대여/반납
+    # ------------------------------------------------------------------
+    def _get(self):
+        deadline = time.time() + self.acquire_timeout
+        while True:
+            if self._closed:
+                return None
+
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = None
+
+            if driver is not None:
+                if self._is_healthy(driver):
+                    return driver
+                self._discard(driver, "(상태 점검 실패)")
+                continue
+
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                return self._create()
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                logger.warning("브라우저 풀: 드라이버 대기 시간 초과")
+                return None
+            try:
+                driver = self._idle.get(timeout=remaining)
+                self._idle.put(driver)
+            except queue.Empty:
+                pass
+
+    def _put(self, driver, failed=False):
+        if self._closed:
+            self._discard(driver, "(풀 종료)")
+            return
+
+        pages = self._pages.get(id(driver), 0) + 1
+        self._pages[id(driver)] = pages
+
+        if failed and not self._is_healthy(driver):
+            self._discard(driver, "(오류 후 세션 종료)")
+        elif pages >= self.max_pages:
+            self._discard(driver, f"({pages}페이지 처리)")
+        elif self.max_memory_mb and self._memory_mb(driver) > self.max_memory_mb:
+            self._discard(driver, f"(메모리 {self.max_memory_mb}MB 초과)")
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def acquire(self):
+        """드라이버 대여 (with 블록 종료 시 자동 반납, 실패 시 None)"""
+        driver = self._get()
+        failed = False
+        try:
+            yield driver
+        except Exception:
+            failed = True
+            raise
+        finally:
+            if driver is not None:
+                self._put(driver, failed)
+
+    def map(self, func, items):
+        """
+        여러 항목을 드라이버 풀로 병렬 처리
+
+        Parameters:
+        -----------
+        func : callable
+            func(driver, item) 형태의 작업 함수
+        items : list
+            처리할 항목 목록
+
+        Returns:
+        --------
+        dict : {item: 결과} (드라이버를 얻지 못했거나 오류가 나면 None)
+        """
+        def run(item):
+            try:
+                with self.acquire() as driver:
+                    if driver is None:
+                        return None
+                    return func(driver, item)
+            except Exception as e:
+                logger.error(f"브라우저 풀 작업 오류 ({item}): {e}")
+                return None
+
+        items = list(items)
+        with ThreadPoolExecutor(max_workers=min(self.size, len(items)) or 1) as executor:
+            return dict(zip(items, executor.map(run, items)))
+
+    def close(self):
+        """모든 드라이버 종료"""
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver, "(풀 종료)")
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    class FakeDriver:
+        """브라우저 없이 풀 동작 확인용"""
+        def __init__(self):
+            time.sleep(0.5)  # 브라우저 기동 시간 흉내
+
+        def execute_script(self, script):
+            return 1
+
+        def quit(self):
+            pass
+
+    def scrape(driver, username):
+        time.sleep(0.1)
+        return f"{username} 처리 완료"
+
+    pool = BrowserPool(FakeDriver, size=2, max_pages=3)
+    usernames = ["elonmusk", "saylor", "VitalikButerin", "realDonaldTrump"]
+    for cycle in range(3):
+        start = time.time()
+        results = pool.map(scrape, usernames)
+        print(f"사이클 {cycle + 1}: {time.time() - start:.2f}초, {results}")
+    pool.close()
@@ -0,0 +1,280 @@
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+TIMEFRAME_MS = {
+    '1m': 60 * 1000,
+    '5m': 5 * 60 * 1000,
+    '15m': 15 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    '4h': 4 * 60 * 60 * 1000,
+    '1d': 24 * 60 * 60 * 1000
+}
+
+# 1분봉에서 만드는 타임프레임
+DERIVED_TIMEFRAMES = ('5m', '15m', '1h', '4h')
+
+
+class BarBuffer:
+    """
+    OHLCV 행을 담는 확장형 NumPy 버퍼
+
+    용량의 두 배를 미리 잡아 두고 끝에 덧붙인다. 가득 차면 최근 capacity개만 새 배열로
+    옮기므로(이전 뷰는 이전 배열을 그대로 가리킴) 덧붙이기는 분할 상환 O(1)이다.
+    """
+
+    __slots__ = ('capacity', 'data', 'count')
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = np.empty((capacity * 2, len(COLUMNS)))
+        self.count = 0
+
+    def append(self, row):
+        if self.count == len(self.data):
+            data = np.empty_like(self.data)
+            data[:self.capacity] = self.data[self.count - self.capacity:self.count]
+            self.data = data
+            self.count = self.capacity
+        self.data[self.count] = row
+        self.count += 1
+
+    def prepend(self, rows):
+        """과거 봉 채우기 (시드)"""
+        rows = np.concatenate([rows, self.data[:self.count]])[-self.capacity:]
+        self.data = np.empty((max(self.capacity, len(rows)) * 2, len(COLUMNS)))
+        self.data[:len(rows)] = rows
+        self.count = len(rows)
+
+    @property
+    def last(self):
+        return self.data[self.count - 1] if self.count else None
+
+    def view(self):
+        """최근 capacity개 봉의 복사 없는 읽기 전용 뷰"""
+        view = self.data[max(0, self.count - self.capacity):self.count]
+        view.flags.writeable = False
+        return view
+
+
+class SymbolBars:
+    """심볼 하나의 1분봉과 파생 타임프레임 봉"""
+
+    def __init__(self, timeframes, capacity):
+        self.minutes = BarBuffer(capacity)
+        self.bars = {tf: BarBuffer(capacity) for tf in timeframes}
+        # 타임프레임별로 1분봉 집계를 시작한 봉 시각 (그 이전은 시드 데이터)
+        self.start = {}
+        self.seeded = set()
+
+    def add_minute(self, row):
+        timestamp = row[0]
+        last = self.minutes.last
+        if last is not None and timestamp <= last[0]:
+            return False
+        self.minutes.append(row)
+
+        for tf, buffer in self.bars.items():
+            step = TIMEFRAME_MS[tf]
+            if tf not in self.start:
+                # 첫 분이 봉 중간이면 다음 봉 경계부터 집계 (불완전한 첫 봉 방지)
+                self.start[tf] = -(-timestamp // step) * step
+            if timestamp < self.start[tf]:
+                continue
+
+            bucket = timestamp - timestamp % step
+            current = buffer.last
+            if current is not None and current[0] == bucket:
+                current[2] = max(current[2], row[2])
+                current[3] = min(current[3], row[3])
+                current[4] = row[4]
+                current[5] += row[5]
+            else:
+                buffer.append((bucket, row[1], row[2], row[3], row[4], row[5]))
+        return True
+
+
+class CandleResampler:
+    """
+    1분봉 기반 다중 타임프레임 캔들
+
+    심볼마다 닫힌 1분봉만 받아 5m/15m/1h/4h 봉을 분이 닫힐 때마다 증분 갱신한다.
+    진행 중인 상위 봉은 마지막 행으로 계속 갱신되며, view()는 공유 버퍼의 복사 없는
+    읽기 전용 뷰를 돌려준다. 1분봉 수집 이전의 과거 구간은 seed()로 한 번만 채운다.
+    """
+
+    def __init__(self, timeframes=DERIVED_TIMEFRAMES, capacity=1000):
+        """
+        Parameters:
+        -----------
+        timeframes : tuple
+            1분봉에서 만들 타임프레임
+        capacity : int
+            심볼/타임프레임별 최대 보관 봉 수
+        """
+        self.timeframes = tuple(timeframes)
+        self.capacity = capacity
+        self._symbols = {}
+        self._lock = threading.RLock()
+
+    def supports(self, timeframe):
+        return timeframe == '1m' or timeframe in self.timeframes
+
+    def _get(self, symbol):
+        bars = self._symbols.get(symbol)
+        if bars is None:
+            bars = self._symbols[symbol] = SymbolBars(self.timeframes, self.capacity)
+        return bars
+
+    def add_minutes(self, symbol, rows):
+        """
+        닫힌 1분봉 반영 (이미 반영한 시각 이하는 무시)
+
+        Returns:
+        --------
+        int : 새로 반영한 1분봉 수
+        """
+        with self._lock:
+            bars = self._get(symbol)
+            return sum(1 for row in np.asarray(rows, dtype=np.float64) if bars.add_minute(row))
+
+    def seed(self, symbol, timeframe, rows):
+        """
+        1분봉 집계 시작 이전 구간을 거래소 봉으로 채움 (심볼/타임프레임당 한 번)
+
+        Parameters:
+        -----------
+        rows : array-like
+            같은 타임프레임의 과거 OHLCV 행
+        """
+        with self._lock:
+            bars = self._get(symbol)
+            rows = np.asarray(rows, dtype=np.float64).reshape(-1, len(COLUMNS))
+            start = bars.start.get(timeframe)
+            if start is not None:
+                rows = rows[rows[:, 0] < start]
+            if len(rows):
+                bars.bars[timeframe].prepend(rows)
+            bars.seeded.add(timeframe)
+
+    def symbols(self):
+        """1분봉이 있는 심볼 목록"""
+        with self._lock:
+            return [symbol for symbol, bars in self._symbols.items() if bars.minutes.count]
+
+    def needs_seed(self, symbol, timeframe):
+        with self._lock:
+            bars = self._symbols.get(symbol)
+            return timeframe != '1m' and (bars is None or timeframe not in bars.seeded)
+
+    def last_minute(self, symbol):
+        """마지막으로 반영한 1분봉 시각 (없으면 None)"""
+        with self._lock:
+            bars = self._symbols.get(symbol)
+            last = bars.minutes.last if bars else None
+            return int(last[0]) if last is not None else None
+
+    def view(self, symbol, timeframe):
+        """
+        타임프레임 봉 뷰 (복사 없음, 읽기 전용)
+
+        Returns:
+        --------
+        np.ndarray : (봉 수, 6) [timestamp, open, high, low, close, volume] (없으면 None)
+        """
+        with self._lock:
+            bars = self._symbols.get(symbol)
+            if bars is None:
+                return None
+            buffer = bars.minutes if timeframe == '1m' else bars.bars[timeframe]
+            return buffer.view()
+
+    def frame(self, symbol, timeframe, limit=100):
+        """최근 limit개 봉 DataFrame (timestamp 인덱스)"""
+        view = self.view(symbol, timeframe)
+        df = pd.DataFrame(view[-limit:] if view is not None else np.empty((0, len(COLUMNS))),
+                          columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        return df.set_index('timestamp')
+
+    def sync(self, exchange, symbol, timeframes=(), limit=1000):
+        """
+        거래소에서 새 1분봉만 받아 반영하고, 처음 쓰는 타임프레임은 과거 봉으로 시드
+
+        Parameters:
+        -----------
+        exchange : ccxt.Exchange
+            fetch_ohlcv를 제공하는 거래소 객체
+        symbol : str
+            거래 심볼
+        timeframes : tuple
+            시드가 필요한지 확인할 타임프레임
+        limit : int
+            처음 받아올 1분봉/시드 봉 수
+
+        Returns:
+        --------
+        int : 새로 반영한 1분봉 수
+        """
+        last = self.last_minute(symbol)
+        if last is None:
+            rows = exchange.fetch_ohlcv(symbol, timeframe='1m', limit=limit)
+        else:
+            rows = exchange.fetch_ohlcv(symbol, timeframe='1m', since=last + TIMEFRAME_MS['1m'])
+
+        # 마지막 행은 진행 중인 분이므로 닫힌 분만 반영
+        added = self.add_minutes(symbol, rows[:-1]) if len(rows) > 1 else 0
+
+        for timeframe in timeframes:
+            if self.needs_seed(symbol, timeframe):
+                self.seed(symbol, timeframe, exchange.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit))
+        return added
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+
+    logging.basicConfig(level=logging.INFO)
+
+    rng = np.random.default_rng(0)
+    minutes = 3 * 24 * 60
+    start = 1_700_000_000_000 - 1_700_000_000_000 % TIMEFRAME_MS['4h']
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, minutes)))
+    opens = np.concatenate([[100], close[:-1]])
+    rows = np.column_stack([
+        start + np.arange(minutes) * TIMEFRAME_MS['1m'], opens,
+        np.maximum(opens, close) * 1.0005, np.minimum(opens, close) * 0.9995, close,
+        rng.lognormal(3, 1, minutes)
+    ])
+
+    resampler = CandleResampler(capacity=5000)
+    t0 = time.perf_counter()
+    for row in rows[:-1]:
+        resampler.add_minutes('BTC/USDT', [row])
+    elapsed = time.perf_counter() - t0
+    print(f"1분봉 {minutes - 1}개 증분 반영: 분당 {elapsed / (minutes - 1) * 1e6:.1f}µs")
+
+    # 미리 받아 둔 뷰는 마지막 분이 닫힐 때 진행 중인 봉이 제자리에서 갱신됨
+    view = resampler.view('BTC/USDT', '1h')
+    before = (view[-1, 4], view[-1, 5])
+    resampler.add_minutes('BTC/USDT', rows[-1:])
+    print(f"같은 1시간 봉 뷰 갱신: 종가 {before[0]:.2f} -> {view[-1, 4]:.2f}, "
+          f"거래량 {before[1]:.1f} -> {view[-1, 5]:.1f}")
+
+    # pandas resample 결과와 비교
+    df = pd.DataFrame(rows, columns=COLUMNS)
+    df.index = pd.to_datetime(df['timestamp'], unit='ms')
+    for tf, rule in (('5m', '5min'), ('15m', '15min'), ('1h', '1h'), ('4h', '4h')):
+        expected = df.resample(rule).agg({'open': 'first', 'high': 'max', 'low': 'min',
+                                           'close': 'last', 'volume': 'sum'})
+        view = resampler.view('BTC/USDT', tf)
+        assert np.allclose(view[:, 1:], expected.values) and not view.flags.writeable
+        print(f"{tf}: {len(view)}봉, pandas resample과 일치")
+
@@ -0,0 +1,419 @@
+import os
+import re
+import glob
+import json
+import time
+import sqlite3
+import logging
+from datetime import datetime
+
+from timeUtils import to_epoch_ms
+from articleStore import article_key
+
+logger = logging.getLogger(__name__)
+
+# 뉴스 통합 스냅샷 파일명 (news_integration_YYYYMMDD_HHMM.json)
+SNAPSHOT_PATTERN = re.compile(r'news_integration_(\d{8}_\d{4})\.json$')
+
+# 스냅샷 섹션별로 원본 파일에 들어있던 필드 (reverageAI가 기대하는 형태 그대로 복원)
+# id와 timestamp는 수집할 때마다 바뀌므로 스냅샷 항목에, 나머지는 기사에 저장
+SECTION_FIELDS = {
+    'by_coin': ['id', 'title', 'url', 'source', 'timestamp', 'risk_level',
+                'related_influencers', 'special_categories'],
+    'by_influencer': ['id', 'title', 'url', 'source', 'timestamp', 'risk_level',
+                      'related_coins', 'special_categories'],
+    'high_risk': ['id', 'title', 'url', 'source', 'timestamp',
+                  'related_coins', 'related_influencers', 'special_categories']
+}
+LIST_FIELDS = ('related_coins', 'related_influencers', 'special_categories')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS snapshots (
+    snapshot_ms INTEGER PRIMARY KEY,
+    file TEXT UNIQUE,
+    timestamp TEXT,
+    total_count INTEGER,
+    source_file TEXT
+);
+CREATE TABLE IF NOT EXISTS articles (
+    article_key TEXT PRIMARY KEY,
+    title TEXT,
+    url TEXT,
+    source TEXT,
+    risk_level TEXT,
+    related_coins TEXT,
+    related_influencers TEXT,
+    special_categories TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS snapshot_items (
+    snapshot_ms INTEGER,
+    section TEXT,
+    key_order INTEGER,
+    position INTEGER,
+    section_key TEXT,
+    article_key TEXT,
+    id TEXT,
+    timestamp TEXT,
+    article_ms INTEGER,
+    PRIMARY KEY (snapshot_ms, section, key_order, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_items_key ON snapshot_items (section_key, snapshot_ms);
+CREATE INDEX IF NOT EXISTS idx_items_time ON snapshot_items (article_ms);
+CREATE INDEX IF NOT EXISTS idx_articles_source ON articles (source);
+'''
+
+
+class NewsArchive:
+    """
+    news_integration 스냅샷 아카이브
+
+    data/에 주기마다 쌓이는 news_integration_*.json 파일을 월별 SQLite 파티션
+    (data/archive/news_YYYYMM.db)으로 압축한다. 기사 본문 정보는 파티션마다
+    한 번만 저장하고, 스냅샷은 섹션(by_coin/by_influencer/high_risk)별 기사 키
+    목록만 저장한다. 조회 시 기간은 파티션 선택과 인덱스로, 코인/출처/위험도는
+    SQL 조건으로 걸러서 필요한 행만 읽는다.
+    """
+
+    def __init__(self, archive_dir="data/archive"):
+        self.archive_dir = archive_dir
+        os.makedirs(archive_dir, exist_ok=True)
+        self._connections = {}
+
+    @staticmethod
+    def exists(archive_dir="data/archive"):
+        """압축된 파티션이 하나라도 있는지 확인"""
+        return bool(glob.glob(os.path.join(archive_dir, "news_*.db")))
+
+    # ------------------------------------------------------------------
+    # 파티션 관리
+    # ------------------------------------------------------------------
+    def _partition_path(self, month):
+        return os.path.join(self.archive_dir, f"news_{month}.db")
+
+    def _connect(self, month):
+        """월별 파티션 연결 (프로세스 내에서 재사용)"""
+        conn = self._connections.get(month)
+        if conn is None:
+            conn = sqlite3.connect(self._partition_path(month))
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            self._connections[month] = conn
+        return conn
+
+    def partitions(self, start=None, end=None):
+        """기간과 겹치는 파티션 월(YYYYMM) 목록"""
+        months = []
+        for path in glob.glob(os.path.join(self.archive_dir, "news_*.db")):
+            match = re.search(r'news_(\d{6})\.db$', path)
+            if not match:
+                continue
+            month = match.group(1)
+            if start and month < start.strftime('%Y%m'):
+                continue
+            if end and month > end.strftime('%Y%m'):
+                continue
+            months.append(month)
+        return sorted(months)
+
+    def close(self):
+        for conn in self._connections.values():
+            conn.close()
+        self._connections = {}
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def add_snapshot(self, news_data, file_name, snapshot_time=None):
+        """
+        스냅샷 하나를 아카이브에 추가
+
+        Parameters:
+        -----------
+        news_data : dict
+            news_integration 파일 내용
+        file_name : str
+            원본 파일명 (중복 적재 방지용)
+        snapshot_time : datetime
+            스냅샷 시각 (없으면 news_data['timestamp'])
+
+        Returns:
+        --------
+        bool : 새로 추가되었으면 True (같은 파일명이 이미 있으면 False)
+        """
+        snapshot_time = snapshot_time or datetime.fromisoformat(news_data['timestamp'])
+        snapshot_ms = to_epoch_ms(snapshot_time)
+        conn = self._connect(snapshot_time.strftime('%Y%m'))
+
+        if conn.execute("SELECT 1 FROM snapshots WHERE file = ?", (os.path.basename(file_name),)).fetchone():
+            return False
+
+        # 같은 시각의 다른 파일은 1ms씩 뒤로 밀어 저장 (snapshot_ms가 기본 키)
+        while conn.execute("SELECT 1 FROM snapshots WHERE snapshot_ms = ?", (snapshot_ms,)).fetchone():
+            snapshot_ms += 1
+
+        articles = {}
+        items = []
+        sections = [('high_risk', 0, '', news_data.get('high_risk', []))]
+        for section in ('by_coin', 'by_influencer'):
+            for key_order, (key, section_articles) in enumerate(news_data.get(section, {}).items()):
+                sections.append((section, key_order, key, section_articles))
+
+        for section, key_order, section_key, section_articles in sections:
+            for position, article in enumerate(section_articles):
+                key = article_key(article)
+                merged = articles.setdefault(key, {})
+                # 섹션마다 빠진 필드가 달라서 합쳐서 저장
+                for field, value in article.items():
+                    if value is not None:
+                        merged.setdefault(field, value)
+                items.append((snapshot_ms, section, key_order, position, section_key, key,
+                               article.get('id'), article.get('timestamp'), to_epoch_ms(article.get('timestamp'))))
+
+        conn.execute(
+            "INSERT INTO snapshots VALUES (?, ?, ?, ?, ?)",
+            (snapshot_ms, os.path.basename(file_name), news_data.get('timestamp'),
+             news_data.get('total_count', 0), news_data.get('source_file'))
+        )
+        conn.executemany('''
+            INSERT INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(article_key) DO UPDATE SET
+                risk_level = COALESCE(articles.risk_level, excluded.risk_level),
+                related_coins = COALESCE(articles.related_coins, excluded.related_coins),
+                related_influencers = COALESCE(articles.related_influencers, excluded.related_influencers)
+        ''', [
+            (key, a.get('title'), a.get('url'), a.get('source'), a.get('risk_level'),
+             *(json.dumps(a[f], ensure_ascii=False) if f in a else None for f in LIST_FIELDS))
+            for key, a in articles.items()
+        ])
+        conn.executemany("INSERT INTO snapshot_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", items)
+        return True
+
+    def compact(self, data_dir="data", remove_files=False):
+        """
+        data/의 news_integration 스냅샷 파일을 아카이브로 압축
+
+        Parameters:
+        -----------
+        data_dir : str
+            스냅샷 파일 디렉토리
+        remove_files : bool
+            아카이브에 넣은 파일 삭제 여부 (latest 파일이 가리키는 파일은 유지,
+            모든 파티션을 커밋한 뒤 파일명으로 적재가 확인된 파일만 삭제)
+
+        Returns:
+        --------
+        int : 새로 추가된 스냅샷 수
+        """
+        latest_file = None
+        latest_state_path = os.path.join(data_dir, "news_integration_latest.json")
+        if os.path.exists(latest_state_path):
+            try:
+                with open(latest_state_path, 'r', encoding='utf-8') as f:
+                    latest_file = os.path.basename(json.load(f).get('latest_file', ''))
+            except Exception as e:
+                logger.error(f"최신 통합 상태 파일 로드 오류: {e}")
+
+        added = 0
+        archived = []
+        for path in sorted(glob.glob(os.path.join(data_dir, "news_integration_*.json"))):
+            match = SNAPSHOT_PATTERN.search(os.path.basename(path))
+            if not match:
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    news_data = json.load(f)
+                snapshot_time = datetime.fromisoformat(news_data['timestamp']) if news_data.get('timestamp') \
+                    else datetime.strptime(match.group(1), '%Y%m%d_%H%M')
+                if self.add_snapshot(news_data, path, snapshot_time):
+                    added += 1
+            except Exception as e:
+                logger.error(f"스냅샷 압축 오류 ({path}): {e}")
+                continue
+
+            # 새로 넣었거나 같은 파일명으로 이미 들어 있는 파일
+            archived.append(path)
+
+        for conn in self._connections.values():
+            conn.commit()
+
+        if remove_files:
+            for path in archived:
+                if os.path.basename(path) == latest_file:
+                    continue
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.error(f"스냅샷 파일 삭제 오류 ({path}): {e}")
+
+        logger.info(f"뉴스 스냅샷 {added}개 아카이브 완료")
+        return added
+
+    # ------------------------------------------------------------------
+    # 읽기
+    # ------------------------------------------------------------------
+    def _load_articles(self, conn, start_ms, end_ms):
+        """기간 내 스냅샷이 참조하는 기사를 한 번씩만 읽어서 파싱"""
+        articles = {}
+        for row in conn.execute('''
+            SELECT * FROM articles WHERE article_key IN (
+                SELECT DISTINCT article_key FROM snapshot_items WHERE snapshot_ms BETWEEN ? AND ?)
+        ''', (start_ms, end_ms)):
+            article = dict(row)
+            for field in LIST_FIELDS:
+                article[field] = json.loads(article[field]) if article[field] else []
+            articles[article['article_key']] = article
+        return articles
+
+    def iter_snapshots(self, start=None, end=None, coins=None):
+        """
+        기간 내 스냅샷을 원본 news_integration 형식으로 순서대로 생성
+
+        Parameters:
+        -----------
+        start, end : datetime
+            조회 기간 (포함)
+        coins : list
+            지정 시 by_coin과 high_risk를 해당 코인으로만 한정
+
+        Yields:
+        -------
+        (datetime, dict) : 스냅샷 시각과 news_integration 형식 데이터
+        """
+        start_ms = to_epoch_ms(start) if start else 0
+        end_ms = to_epoch_ms(end) if end else 2 ** 62
+        coins = set(coins) if coins else None
+
+        for month in self.partitions(start, end):
+            conn = self._connect(month)
+            snapshots = {
+                row['snapshot_ms']: {
+                    'timestamp': row['timestamp'],
+                    'by_coin': {},
+                    'by_influencer': {},
+                    'high_risk': [],
+                    'total_count': row['total_count'],
+                    'source_file': row['source_file']
+                }
+                for row in conn.execute(
+                    "SELECT * FROM snapshots WHERE snapshot_ms BETWEEN ? AND ? ORDER BY snapshot_ms",
+                    (start_ms, end_ms))
+            }
+            if not snapshots:
+                continue
+
+            articles = self._load_articles(conn, start_ms, end_ms)
+            query = '''
+                SELECT snapshot_ms, section, section_key, article_key, id, timestamp
+                FROM snapshot_items WHERE snapshot_ms BETWEEN ? AND ?
+                ORDER BY snapshot_ms, section, key_order, position
+            '''
+            for snapshot_ms, section, section_key, key, article_id, timestamp in conn.execute(
+                    query, (start_ms, end_ms)):
+                stored = articles[key]
+                if coins and section == 'by_coin' and section_key not in coins:
+                    continue
+                if coins and section == 'high_risk' and not coins.intersection(stored['related_coins']):
+                    continue
+
+                article = {field: stored.get(field) for field in SECTION_FIELDS[section]}
+                article['id'] = article_id
+                article['timestamp'] = timestamp
+                snapshot = snapshots[snapshot_ms]
+                if section == 'high_risk':
+                    snapshot['high_risk'].append(article)
+                else:
+                    snapshot[section].setdefault(section_key, []).append(article)
+
+            for snapshot_ms, snapshot in snapshots.items():
+                yield datetime.fromtimestamp(snapshot_ms / 1000), snapshot
+
+    def latest_snapshot(self, at=None):
+        """
+        지정 시각(기본: 전체) 이전의 가장 최근 스냅샷
+
+        Returns:
+        --------
+        dict : news_integration 형식 데이터, 없으면 None
+        """
+        at_ms = to_epoch_ms(at) if at else 2 ** 62
+        for month in reversed(self.partitions(end=at)):
+            row = self._connect(month).execute(
+                "SELECT snapshot_ms FROM snapshots WHERE snapshot_ms <= ? ORDER BY snapshot_ms DESC LIMIT 1",
+                (at_ms,)).fetchone()
+            if row:
+                snapshot_time = datetime.fromtimestamp(row['snapshot_ms'] / 1000)
+                for _, snapshot in self.iter_snapshots(snapshot_time, snapshot_time):
+                    return snapshot
+        return None
+
+    def query_articles(self, start=None, end=None, coins=None, sources=None, risk_levels=None):
+        """
+        기간/코인/출처/위험도 조건으로 기사 조회 (기사당 한 건, 최초 수집 시각 포함)
+
+        Returns:
+        --------
+        list : 기사 dict 목록 (first_seen 시각 순)
+        """
+        start_ms = to_epoch_ms(start) if start else 0
+        end_ms = to_epoch_ms(end) if end else 2 ** 62
+
+        conditions = ["i.snapshot_ms BETWEEN ? AND ?"]
+        params = [start_ms, end_ms]
+        if coins:
+            conditions.append(f"i.section = 'by_coin' AND i.section_key IN ({', '.join('?' * len(coins))})")
+            params += list(coins)
+        if sources:
+            conditions.append(f"a.source IN ({', '.join('?' * len(sources))})")
+            params += list(sources)
+        if risk_levels:
+            conditions.append(f"a.risk_level IN ({', '.join('?' * len(risk_levels))})")
+            params += list(risk_levels)
+
+        query = f'''
+            SELECT a.*, i.id, i.timestamp, MIN(i.snapshot_ms) AS first_seen_ms
+            FROM snapshot_items i JOIN articles a ON a.article_key = i.article_key
+            WHERE {' AND '.join(conditions)}
+            GROUP BY a.article_key
+        '''
+
+        results = {}
+        for month in self.partitions(start, end):
+            for row in self._connect(month).execute(query, params):
+                article = dict(row)
+                for field in LIST_FIELDS:
+                    article[field] = json.loads(article[field]) if article[field] else []
+                article['first_seen'] = datetime.fromtimestamp(article.pop('first_seen_ms') / 1000)
+                # 월 경계에 걸친 기사는 가장 먼저 수집된 것만 유지
+                existing = results.get(article['article_key'])
+                if existing is None or article['first_seen'] < existing['first_seen']:
+                    results[article['article_key']] = article
+
+        return sorted(results.values(), key=lambda article: article['first_seen'])
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    archive = NewsArchive()
+    start = time.perf_counter()
+    archive.compact()
+    print(f"압축: {time.perf_counter() - start:.2f}초")
+
+    # JSON 파일 직접 읽기와 아카이브 읽기 비교
+    start = time.perf_counter()
+    count = 0
+    for path in glob.glob("data/news_integration_*.json"):
+        if SNAPSHOT_PATTERN.search(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                json.load(f)
+            count += 1
+    print(f"JSON 파일 {count}개 읽기: {time.perf_counter() - start:.2f}초")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in archive.iter_snapshots())
+    print(f"아카이브 스냅샷 {count}개 읽기: {time.perf_counter() - start:.2f}초")
+
+    articles = archive.query_articles(coins=['BTC'], risk_levels=['HIGH'])
+    print(f"BTC 고위험 기사: {len(articles)}개")
@@ -0,0 +1,221 @@
+import time
+import queue
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# 스테이지 종료 표시
+_DONE = object()
+
+
+class Stage:
+    """
+    파이프라인 단계 하나
+
+    batch_size가 없으면 func(item)을 항목마다 호출하고 반환값(None이면 버림)을 다음 단계로 넘긴다.
+    batch_size가 있으면 최대 batch_size개(첫 항목 후 batch_timeout초까지)를 모아 func(items)를
+    호출하고, 반환된 목록을 다음 단계로 넘긴다.
+    """
+
+    def __init__(self, name, func, workers=1, batch_size=None, batch_timeout=0.5):
+        """
+        Parameters:
+        -----------
+        name : str
+            단계 이름 (통계/로그용)
+        func : callable
+            항목 처리 함수 (배치 단계는 목록 처리 함수)
+        workers : int
+            동시에 실행할 작업 스레드 수
+        batch_size : int
+            배치 크기 (None이면 항목 단위)
+        batch_timeout : float
+            배치를 채우기 위해 기다리는 최대 시간 (초)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+
+        self.received = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, received, emitted, busy, error=False):
+        with self._lock:
+            self.received += received
+            self.emitted += emitted
+            self.busy_seconds += busy
+            if error:
+                self.errors += 1
+
+    def process(self, items):
+        """항목(또는 배치)을 처리하고 다음 단계로 넘길 목록 반환 (오류 시 빈 목록)"""
+        start = time.perf_counter()
+        try:
+            if self.batch_size:
+                outputs = [item for item in (self.func(items) or []) if item is not None]
+            else:
+                output = self.func(items[0])
+                outputs = [] if output is None else [output]
+            self._record(len(items), len(outputs), time.perf_counter() - start)
+            return outputs
+        except Exception as e:
+            logger.error(f"파이프라인 단계 오류 ({self.name}): {e}")
+            self._record(len(items), 0, time.perf_counter() - start, error=True)
+            return []
+
+    def stats(self):
+        return {
+            'received': self.received,
+            'emitted': self.emitted,
+            'errors': self.errors,
+            'busy_seconds': round(self.busy_seconds, 3)
+        }
+
+
+class Pipeline:
+    """
+    단계별 스레드와 크기 제한 대기열로 연결한 처리 파이프라인
+
+    각 단계는 자기 작업 스레드에서 동시에 실행되므로 전체 소요 시간은 항목별 왕복 시간의
+    합이 아니라 가장 느린 단계에 맞춰진다. 대기열 크기를 제한해 느린 단계 앞에 항목이
+    무한정 쌓이지 않도록 한다(backpressure).
+    """
+
+    def __init__(self, stages, queue_size=100):
+        """
+        Parameters:
+        -----------
+        stages : list
+            Stage 목록 (순서대로 연결)
+        queue_size : int
+            단계 사이 대기열 최대 크기
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+
+    def _worker(self, index, inbox, outbox, finished):
+        stage = self.stages[index]
+        done = False
+        while not done:
+            item = inbox.get()
+            if item is _DONE:
+                break
+
+            batch = [item]
+            if stage.batch_size:
+                deadline = time.monotonic() + stage.batch_timeout
+                while len(batch) < stage.batch_size:
+                    try:
+                        item = inbox.get(timeout=max(0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _DONE:
+                        done = True
+                        break
+                    batch.append(item)
+
+            for output in stage.process(batch):
+                outbox.put(output)
+
+        # 단계의 마지막 작업 스레드가 다음 단계 작업 스레드 수만큼 종료 표시 전달
+        with finished['lock']:
+            finished['count'] += 1
+            last = finished['count'] == stage.workers
+        if last:
+            next_workers = self.stages[index + 1].workers if index + 1 < len(self.stages) else 1
+            for _ in range(next_workers):
+                outbox.put(_DONE)
+
+    def run(self, source):
+        """
+        소스의 모든 항목을 파이프라인으로 처리
+
+        Parameters:
+        -----------
+        source : iterable
+            입력 항목 (생성기면 첫 단계와 동시에 읽힘)
+
+        Returns:
+        --------
+        list : 마지막 단계가 내보낸 항목
+        """
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = queue.Queue()
+        outboxes = queues[1:] + [results]
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            finished = {'count': 0, 'lock': threading.Lock()}
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues[index], outboxes[index], finished),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+
+        try:
+            for item in source:
+                queues[0].put(item)
+        except Exception as e:
+            logger.error(f"파이프라인 입력 오류: {e}")
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_DONE)
+
+        for thread in threads:
+            thread.join()
+
+        outputs = []
+        while True:
+            item = results.get_nowait()
+            if item is _DONE:
+                break
+            outputs.append(item)
+        return outputs
+
+    def stats(self):
+        """단계별 처리 통계"""
+        return {stage.name: stage.stats() for stage in self.stages}
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    def slow_io(delay):
+        def func(item):
+            time.sleep(delay)
+            return item
+        return func
+
+    def batch_io(items):
+        time.sleep(0.05)  # 배치당 한 번의 왕복
+        return items
+
+    items = list(range(40))
+
+    start = time.perf_counter()
+    for item in items:
+        slow_io(0.02)(item)
+        slow_io(0.05)(item)
+        batch_io([item])
+    print(f"순차 처리: {time.perf_counter() - start:.2f}초")
+
+    pipeline = Pipeline([
+        Stage('analyze', slow_io(0.02), workers=2),
+        Stage('price', slow_io(0.05), workers=4),
+        Stage('persist', batch_io, batch_size=10, batch_timeout=0.1)
+    ], queue_size=8)
+    start = time.perf_counter()
+    outputs = pipeline.run(iter(items))
+    print(f"파이프라인 처리: {time.perf_counter() - start:.2f}초, 출력 {len(outputs)}개")
+    print(pipeline.stats())
@@ -1,5 +1,4 @@
 import time
-import json
 import os
 import logging
 import requests
@@ -9,6 +8,11 @@ import traceback
 from datetime import datetime
 from bs4 import BeautifulSoup
 from concurrent.futures import ThreadPoolExecutor
+from articleStore import ArticleStore
+from timeUtils import to_epoch_ms, now_ms
+from records import Article
+from tracing import get_tracer
+import serialization
 
 # 로깅 설정
 logging.basicConfig(
@@ -229,10 +233,20 @@ COIN_PATTERNS = {
 # 이미 처리한 뉴스 URL 저장
 processed_news_urls = set()
 
+# 기사 단일 저장소 (URL 해시 키 + 역색인)
+_article_store = None
+
+def get_article_store():
+    """기사 저장소 (처음 호출 시 로그에서 로드)"""
+    global _article_store
+    if _article_store is None:
+        _article_store = ArticleStore("news/article_store.jsonl")
+    return _article_store
+
 # 폴더 생성 함수
 def ensure_directories_exist():
     """필요한 데이터 폴더 생성"""
-    directories = ['data', 'news', 'news/coins', 'news/influencers', 'news/special', 'logs']
+    directories = ['data', 'news', 'logs']
     for directory in directories:
         os.makedirs(directory, exist_ok=True)
 
@@ -240,8 +254,7 @@ def ensure_directories_exist():
 def save_to_json(data, filename):
     """데이터를 JSON 파일로 저장"""
     try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+        serialization.dump(data, filename)
         return True
     except Exception as e:
         logger.error(f"JSON 저장 오류 ({filename}): {e}")
@@ -251,10 +264,7 @@ def save_to_json(data, filename):
 def load_from_json(filename):
     """JSON 파일에서 데이터 로드"""
     try:
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {}
+        return serialization.load(filename, {})
     except Exception as e:
         logger.error(f"JSON 로드 오류 ({filename}): {e}")
         return {}
@@ -336,35 +346,11 @@ def check_special_keywords(text):
 
 # 최신 정보 필터링 함수 강화
 def is_recent_article(article_date, max_hours_old=24):
-    """기사가 최근 것인지 확인 (기본값: 최근 24시간 이내)"""
-    if isinstance(article_date, str):
-        try:
-            # 다양한 날짜 형식 처리
-            if 'T' in article_date:  # ISO 형식
-                article_date = datetime.fromisoformat(article_date.replace('Z', '+00:00'))
-            elif '.' in article_date:  # 2023.05.08 형식
-                article_date = datetime.strptime(article_date, '%Y.%m.%d %H:%M')
-            elif '/' in article_date:  # 05/08 형식
-                current_year = datetime.now().year
-                article_date = datetime.strptime(f"{current_year}/{article_date}", '%Y/%m/%d')
-            elif ':' in article_date:  # 시:분 형식 (오늘)
-                today = datetime.now().date()
-                time_obj = datetime.strptime(article_date, '%H:%M').time()
-                article_date = datetime.combine(today, time_obj)
-        except:
-            # 날짜 파싱 실패 시 최신 기사로 가정 (안전)
-            return True
-    
-    now = datetime.now()
-    if not isinstance(article_date, datetime):
-        return True  # 확인 불가능한 경우 기본적으로 포함
-        
-    # 시간대 정보가 없는 경우 로컬 시간 기준으로 계산
-    if article_date.tzinfo is not None:
-        now = datetime.now(article_date.tzinfo)
-        
-    time_diff = now - article_date
-    return time_diff.total_seconds() <= max_hours_old * 3600  # 시간을 초로 변환
+    """기사가 최근 것인지 확인 (기본값: 최근 24시간 이내, 파싱 실패는 집계 후 제외)"""
+    article_ms = to_epoch_ms(article_date)
+    if article_ms is None:
+        return False
+    return now_ms() - article_ms <= max_hours_old * 3600 * 1000
 
 # 뉴스 수집 함수에 최신성 필터 적용
 def fetch_all_news(max_articles_per_site=15, max_hours_old=24):
@@ -385,7 +371,7 @@ def fetch_all_news(max_articles_per_site=15, max_hours_old=24):
             # 최신 기사만 필터링
             recent_articles = []
             for article in articles:
-                if is_recent_article(article.get('timestamp'), max_hours_old):
+                if is_recent_article(article.get('timestamp_ms', article.get('timestamp')), max_hours_old):
                     recent_articles.append(article)
             
             all_articles.extend(recent_articles)
@@ -394,7 +380,7 @@ def fetch_all_news(max_articles_per_site=15, max_hours_old=24):
             logger.error(f"{source_key} 처리 중 오류: {e}")
     
     # 기사 분류 및 저장
-    categorize_and_save_articles(all_articles)
+    categorize_and_save_articles(all_articles, max_hours_old)
     
     logger.info(f"총 {len(all_articles)}개의 최신 기사 수집 완료")
     return all_articles
@@ -412,6 +398,7 @@ def fetch_news_from_site(source_key, max_articles=15):
     base_url = source_info['base_url']
     
     logger.info(f"{source_key} 뉴스 사이트에서 기사 수집 중...")
+    fetch_started = time.monotonic_ns()
 
     # 헤더 정의를 먼저 합니다
     headers = {
@@ -520,18 +507,19 @@ def fetch_news_from_site(source_key, max_articles=15):
                 special_categories = check_special_keywords(title)
                 
                 # 기사 정보 추가
-                article = {
-                    'id': f"{source_key}_{int(time.time())}_{i}",
-                    'title': title,
-                    'url': link,
-                    'source': source_key,
-                    'timestamp': datetime.now().isoformat(),
-                    'risk_level': risk_level,
-                    'language': source_info['language'],
-                    'related_coins': related_coins,
-                    'related_influencers': related_influencers,
-                    'special_categories': special_categories
-                }
+                article = Article(
+                    id=f"{source_key}_{int(time.time())}_{i}",
+                    title=title,
+                    url=link,
+                    source=source_key,
+                    timestamp=datetime.now().isoformat(),
+                    timestamp_ms=now_ms(),
+                    risk_level=risk_level,
+                    language=source_info['language'],
+                    related_coins=related_coins,
+                    related_influencers=related_influencers,
+                    special_categories=special_categories
+                )
                 
                 # 중요한 기사인 경우 내용 수집
                 importance_criteria = (
@@ -573,6 +561,8 @@ def fetch_news_from_site(source_key, max_articles=15):
                 # URL 처리 기록
                 processed_news_urls.add(link)
                 
+                # 수집 시점 trace (scrape span: 목록 요청 ~ 기사 처리 완료)
+                article['trace'] = get_tracer().start_trace('news', started_ns=fetch_started, site=source_key)
                 articles.append(article)
                 
             except Exception as e:
@@ -678,6 +668,7 @@ def fetch_news_from_html_site(source_key, max_articles=15):
     
     site_info = special_sites[source_key]
     source_info = ALL_NEWS_SOURCES.get(source_key)
+    fetch_started = time.monotonic_ns()
     
     try:
         # 헤더 설정
@@ -749,18 +740,19 @@ def fetch_news_from_html_site(source_key, max_articles=15):
                 # 최신 기사만 포함
                 if is_today:
                     # 기사 정보 생성
-                    article = {
-                        'id': f"{source_key}_{int(time.time())}_{i}",
-                        'title': title,
-                        'url': link,
-                        'source': source_key,
-                        'timestamp': datetime.now().isoformat(),
-                        'risk_level': determine_risk_level(title),
-                        'language': source_info.get('language', 'ko'),
-                        'related_coins': [],
-                        'related_influencers': [],
-                        'special_categories': []
-                    }
+                    article = Article(
+                        id=f"{source_key}_{int(time.time())}_{i}",
+                        title=title,
+                        url=link,
+                        source=source_key,
+                        timestamp=datetime.now().isoformat(),
+                        timestamp_ms=now_ms(),
+                        risk_level=determine_risk_level(title),
+                        language=source_info.get('language', 'ko'),
+                        related_coins=[],
+                        related_influencers=[],
+                        special_categories=[]
+                    )
                     
                     # 코인 관련성 체크
                     for coin_symbol in COIN_PATTERNS.keys():
@@ -775,6 +767,7 @@ def fetch_news_from_html_site(source_key, max_articles=15):
                     # 특별 키워드 카테고리 체크
                     article['special_categories'] = check_special_keywords(title)
                     
+                    article['trace'] = get_tracer().start_trace('news', started_ns=fetch_started, site=source_key)
                     articles.append(article)
             except Exception as e:
                 logger.error(f"{source_key} 기사 처리 오류: {e}")
@@ -788,76 +781,43 @@ def fetch_news_from_html_site(source_key, max_articles=15):
         return []
 
 # 기사 분류 및 저장 함수
-def categorize_and_save_articles(articles):
-    """수집한 기사를 분류하고 저장"""
+def categorize_and_save_articles(articles, max_hours_old=24):
+    """수집한 기사를 단일 저장소에 저장하고 색인으로 분류 (수집 기준보다 오래된 기사는 삭제)"""
+    # 새 기사가 없는 주기에도 저장소가 수집 기간 밖의 기사로 커지지 않도록 먼저 정리
+    store = get_article_store()
+    removed = store.remove_older_than(max_hours_old)
+    if removed:
+        logger.info(f"{max_hours_old}시간 지난 기사 {removed}개 저장소에서 삭제")
+    
     if not articles:
         return {}
     
+    # 기사는 저장소에 한 번만 기록 (코인/인플루언서/카테고리/위험도 색인은 삽입 시 갱신)
+    batch_keys = store.add_many(articles)
+    
     # 1. 코인별 분류
     articles_by_coin = {}
     for coin in COIN_PATTERNS:
-        # 코인 관련 기사 필터링
-        coin_articles = []
-        for article in articles:
-            if coin in article.get('related_coins', []):
-                coin_articles.append(article)
-        
+        coin_articles = store.select(batch_keys, coin=coin)
         if coin_articles:
             articles_by_coin[coin] = coin_articles
-            # 코인별 뉴스 저장
-            save_to_json(
-                coin_articles,
-                f"news/coins/{coin}_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            )
     
     # 2. 인플루언서별 분류
     articles_by_influencer = {}
     for influencer in INFLUENCERS:
-        influencer_name = influencer['name']
-        # 인플루언서 관련 기사 필터링
-        influencer_articles = []
-        for article in articles:
-            if influencer_name in article.get('related_influencers', []):
-                influencer_articles.append(article)
-        
+        influencer_articles = store.select(batch_keys, influencer=influencer['name'])
         if influencer_articles:
-            articles_by_influencer[influencer_name] = influencer_articles
-            # 인플루언서별 뉴스 저장
-            save_to_json(
-                influencer_articles,
-                f"news/influencers/{influencer_name.replace(' ', '_')}_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            )
+            articles_by_influencer[influencer['name']] = influencer_articles
     
     # 3. 특별 카테고리별 분류
     articles_by_category = {}
     for category in SPECIAL_KEYWORDS.keys():
-        # 카테고리 관련 기사 필터링
-        category_articles = []
-        for article in articles:
-            if category in article.get('special_categories', []):
-                category_articles.append(article)
-        
+        category_articles = store.select(batch_keys, category=category)
         if category_articles:
             articles_by_category[category] = category_articles
-            # 카테고리별 뉴스 저장
-            save_to_json(
-                category_articles,
-                f"news/special/{category}_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            )
     
     # 4. 위험도별 분류
-    high_risk_articles = [a for a in articles if a.get('risk_level') == "HIGH"]
-    if high_risk_articles:
-        save_to_json(
-            high_risk_articles,
-            f"news/high_risk_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-        )
-    
-    # 5. 전체 뉴스 저장
-    save_to_json(
-        articles,
-        f"news/all_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-    )
+    high_risk_articles = store.select(batch_keys, risk_level="HIGH")
     
     # 최신 뉴스 상태 파일 저장 (다른 모듈과의 통합용)
     latest_news_state = {
@@ -867,7 +827,8 @@ def categorize_and_save_articles(articles):
         'influencers': {name: len(articles) for name, articles in articles_by_influencer.items()},
         'categories': {category: len(articles) for category, articles in articles_by_category.items()},
         'high_risk_count': len(high_risk_articles),
-        'latest_file': f"news/all_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
+        'latest_file': store.path,
+        'article_keys': batch_keys
     }
     
     save_to_json(latest_news_state, "news/latest_state.json")
@@ -879,42 +840,47 @@ def categorize_and_save_articles(articles):
         'high_risk': high_risk_articles
     }
 
+# 통합 데이터용 기사 요약 (크기 축소)
+def _summarize_article(article, fields):
+    summary = {
+        'id': article.get('id'),
+        'title': article.get('title'),
+        'url': article.get('url'),
+        'source': article.get('source'),
+        'timestamp': article.get('timestamp'),
+        # 분석 단계가 수집 시점 trace를 이어가도록 함께 전달
+        'trace': article.get('trace')
+    }
+    for field in fields:
+        summary[field] = article.get(field) if field == 'risk_level' else article.get(field, [])
+    return summary
+
 # 뉴스 데이터 추출 및 공유 함수 (leverageAI.py와의 통합용)
 def get_news_data_for_integration():
     """분석 모듈(leverageAI.py)과의 통합을 위한 뉴스 데이터 준비"""
     # 최신 상태 파일 확인
     latest_state = load_from_json("news/latest_state.json")
     
-    if not latest_state or 'latest_file' not in latest_state:
+    if not latest_state or 'article_keys' not in latest_state:
         logger.warning("최신 뉴스 상태 파일을 찾을 수 없음")
         return None
     
-    # 최신 뉴스 파일 로드
-    latest_news_file = latest_state['latest_file']
-    all_news = load_from_json(latest_news_file)
+    # 최신 수집 배치를 저장소 색인에서 조회
+    store = get_article_store()
+    store.refresh()
+    batch_keys = latest_state['article_keys']
     
-    if not all_news:
-        logger.warning(f"최신 뉴스 파일을 로드할 수 없음: {latest_news_file}")
+    if not store.get_many(batch_keys):
+        logger.warning(f"기사 저장소에서 최신 배치를 찾을 수 없음: {store.path}")
         return None
     
     # 코인별 뉴스 정보 추출
     news_by_coin = {}
     for coin in COIN_PATTERNS.keys():
-        coin_news = []
-        for article in all_news:
-            if coin in article.get('related_coins', []):
-                # 필요한 정보만 추출 (크기 축소)
-                coin_news.append({
-                    'id': article.get('id'),
-                    'title': article.get('title'),
-                    'url': article.get('url'),
-                    'source': article.get('source'),
-                    'timestamp': article.get('timestamp'),
-                    'risk_level': article.get('risk_level'),
-                    'related_influencers': article.get('related_influencers', []),
-                    'special_categories': article.get('special_categories', [])
-                })
-        
+        coin_news = [
+            _summarize_article(article, ['risk_level', 'related_influencers', 'special_categories'])
+            for article in store.select(batch_keys, coin=coin)
+        ]
         if coin_news:
             news_by_coin[coin] = coin_news
     
@@ -922,40 +888,18 @@ def get_news_data_for_integration():
     news_by_influencer = {}
     for influencer in INFLUENCERS:
         influencer_name = influencer['name']
-        influencer_news = []
-        
-        for article in all_news:
-            if influencer_name in article.get('related_influencers', []):
-                # 필요한 정보만 추출 (크기 축소)
-                influencer_news.append({
-                    'id': article.get('id'),
-                    'title': article.get('title'),
-                    'url': article.get('url'),
-                    'source': article.get('source'),
-                    'timestamp': article.get('timestamp'),
-                    'risk_level': article.get('risk_level'),
-                    'related_coins': article.get('related_coins', []),
-                    'special_categories': article.get('special_categories', [])
-                })
-        
+        influencer_news = [
+            _summarize_article(article, ['risk_level', 'related_coins', 'special_categories'])
+            for article in store.select(batch_keys, influencer=influencer_name)
+        ]
         if influencer_news:
             news_by_influencer[influencer_name] = influencer_news
     
     # 중요 뉴스 정보 추출 (HIGH 리스크 레벨)
-    high_risk_news = []
-    for article in all_news:
-        if article.get('risk_level') == "HIGH":
-            # 필요한 정보만 추출 (크기 축소)
-            high_risk_news.append({
-                'id': article.get('id'),
-                'title': article.get('title'),
-                'url': article.get('url'),
-                'source': article.get('source'),
-                'timestamp': article.get('timestamp'),
-                'related_coins': article.get('related_coins', []),
-                'related_influencers': article.get('related_influencers', []),
-                'special_categories': article.get('special_categories', [])
-            })
+    high_risk_news = [
+        _summarize_article(article, ['related_coins', 'related_influencers', 'special_categories'])
+        for article in store.select(batch_keys, risk_level="HIGH")
+    ]
     
     # 통합 데이터 구조 생성
     integration_data = {
@@ -963,8 +907,8 @@ def get_news_data_for_integration():
         'by_coin': news_by_coin,
         'by_influencer': news_by_influencer,
         'high_risk': high_risk_news,
-        'total_count': len(all_news),
-        'source_file': latest_news_file
+        'total_count': len(batch_keys),
+        'source_file': store.path
     }
     
     # 통합용 파일 저장
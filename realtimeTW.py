@@ -1,19 +1,18 @@
 import time
-import json
 import os
 import logging
 import random
 import schedule
 import re
-from datetime import datetime, timedelta
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager  # 웹드라이버 자동 관리
+import threading
+from datetime import datetime, timedelta, timezone
+# selenium/webdriver-manager는 무거우므로 브라우저를 실제로 쓰는 함수 안에서 import
+from browserPool import BrowserPool
+from tweetStore import TweetStore
+from timeUtils import to_epoch_ms, now_ms
+from records import Tweet
+from tracing import get_tracer
+import serialization
 
 # 로깅 설정
 logging.basicConfig(
@@ -90,6 +89,15 @@ coin_patterns = {
 # 이미 처리한 트윗 ID 저장
 processed_tweet_ids = set()
 
+# 브라우저 풀 설정 (동시 브라우저 수, 드라이버당 최대 페이지 수)
+BROWSER_POOL_SIZE = int(os.getenv("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_PAGES = 50
+
+# 크롬드라이버 경로 캐시 (ChromeDriverManager 버전 확인은 프로세스당 한 번만)
+_chromedriver_path = os.getenv("CHROMEDRIVER_PATH")
+_browser_pool = None
+_tweet_store = None
+
 # 민감도 판단 함수
 def determine_risk(text):
     for level in ["HIGH", "MEDIUM"]:
@@ -128,9 +136,31 @@ def fetch_coinreaders_news():
         print(f"⚠️ 뉴스 수집 에러: {e}")
         return []
 
+# 크롬드라이버 경로 조회 (캐시)
+def get_chromedriver_path():
+    """설치된 크롬드라이버 경로 반환 (처음 한 번만 ChromeDriverManager 호출)"""
+    global _chromedriver_path
+    if not _chromedriver_path or not os.path.exists(_chromedriver_path):
+        from webdriver_manager.chrome import ChromeDriverManager  # 웹드라이버 자동 관리
+        _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+# 브라우저 풀 조회
+def get_browser_pool():
+    """재사용 웹드라이버 풀 (처음 호출 시 생성)"""
+    global _browser_pool
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(initialize_webdriver, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES)
+    return _browser_pool
+
 # 웹드라이버 초기화 함수 (개선된 버전)
 def initialize_webdriver():
     """webdriver-manager를 사용하여 Chrome 웹드라이버 자동 초기화"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.chrome.service import Service
+    from webdriver_manager.chrome import ChromeDriverManager
+
     try:
         # Chrome 옵션 설정
         chrome_options = Options()
@@ -165,7 +195,7 @@ def initialize_webdriver():
         # 자동으로 최신 크롬드라이버 설치 및 서비스 생성
         try:
             # 표준 크롬 드라이버 시도
-            service = Service(ChromeDriverManager().install())
+            service = Service(get_chromedriver_path())
             driver = webdriver.Chrome(service=service, options=chrome_options)
         except Exception as chrome_error:
             logger.warning(f"기본 크롬 드라이버 초기화 실패, 다른 방법 시도: {chrome_error}")
@@ -217,6 +247,7 @@ def initialize_webdriver():
 def initialize_safari_webdriver():
     """Safari 웹드라이버 초기화 (macOS 전용)"""
     try:
+        from selenium import webdriver
         from selenium.webdriver.safari.options import Options as SafariOptions
         
         safari_options = SafariOptions()
@@ -231,59 +262,238 @@ def initialize_safari_webdriver():
 
 # 트윗의 최신성 확인 함수
 def is_recent_tweet(created_at, max_days_old=2):
-    """트윗이 최근 것인지 확인 (기본값: 최근 2일 이내)"""
-    if isinstance(created_at, str):
-        try:
-            created_at = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        except:
-            # 날짜 파싱 실패 시 현재 시간 기준 (안전)
-            return True
-    
-    now = datetime.now()
-    if not isinstance(created_at, datetime):
-        return True  # 확인 불가능한 경우 기본적으로 포함
-        
-    # 시간대 정보가 없는 경우 로컬 시간 기준으로 계산
-    if created_at.tzinfo is not None:
-        now = datetime.now(created_at.tzinfo)
-        
-    time_diff = now - created_at
-    return time_diff.days <= max_days_old
+    """트윗이 최근 것인지 확인 (기본값: 최근 2일 이내, 파싱 실패는 집계 후 제외)"""
+    created_ms = to_epoch_ms(created_at)
+    if created_ms is None:
+        return False
+    return now_ms() - created_ms <= (max_days_old + 1) * 86400 * 1000
 
 # 트위터(X) 접속 및 트윗 가져오기
 def get_recent_tweets_via_selenium(username, max_tweets=5):
-    """Selenium을 사용하여 트위터에서 최근 트윗 가져오기"""
-    driver = None
+    """Selenium을 사용하여 트위터에서 최근 트윗 가져오기 (브라우저 풀의 드라이버 재사용)"""
     try:
         logger.info(f"{username}의 최근 트윗 가져오기 시도")
         
-        # 웹드라이버 초기화
-        driver = initialize_webdriver()
-        if not driver:
-            return []
-        
-        # 트윗 수집 방법 1: 직접 트위터(X) 접속
+        with get_browser_pool().acquire() as driver:
+            if not driver:
+                return []
+            
+            # 트윗 수집 방법 1: 직접 트위터(X) 접속
+            try:
+                return get_tweets_from_twitter(driver, username, max_tweets)
+            except Exception as twitter_error:
+                logger.warning(f"트위터에서 트윗 가져오기 실패: {twitter_error}")
+                return []
+    
+    except Exception as e:
+        logger.error(f"트윗 가져오기 오류: {e}")
+        return []
+
+# 여러 사용자의 트윗 병렬 수집
+def get_recent_tweets_parallel(usernames, max_tweets=5):
+    """브라우저 풀로 여러 사용자의 최근 트윗을 동시에 가져오기"""
+    def scrape(driver, username):
         try:
             return get_tweets_from_twitter(driver, username, max_tweets)
         except Exception as twitter_error:
-            logger.warning(f"트위터에서 트윗 가져오기 실패: {twitter_error}")
+            logger.warning(f"{username} 트윗 가져오기 실패: {twitter_error}")
             return []
     
-    except Exception as e:
-        logger.error(f"트윗 가져오기 오류: {e}")
-        return []
+    results = get_browser_pool().map(scrape, usernames)
+    return {username: tweets or [] for username, tweets in results.items()}
+
+# 사용자별 마지막으로 본 트윗 (high-water mark) 파일
+HIGH_WATER_MARK_FILE = 'tweets/high_water_marks.json'
+MAX_SCROLLS = 3
+_high_water_marks = None
+# 수집했지만 트윗 저장 전이라 아직 파일에 쓰지 않은 mark
+_pending_high_water_marks = {}
+_high_water_lock = threading.Lock()
+
+# high-water mark 로드
+def load_high_water_marks():
+    """사용자별 마지막 트윗 ID/시각 로드 ({username: {'last_id', 'last_timestamp'}})"""
+    global _high_water_marks
+    if _high_water_marks is None:
+        try:
+            _high_water_marks = serialization.load(HIGH_WATER_MARK_FILE, {})
+        except Exception as e:
+            logger.error(f"high-water mark 로드 오류: {e}")
+            _high_water_marks = {}
+    return _high_water_marks
+
+# high-water mark 보류
+def stage_high_water_mark(username, last_id, last_timestamp=None):
+    """파싱한 트윗 중 가장 최신 ID를 보류 (트윗을 저장한 뒤 commit_high_water_mark로 기록)"""
+    with _high_water_lock:
+        pending = _pending_high_water_marks.get(username)
+        if pending is None or int(pending['last_id']) < int(last_id):
+            _pending_high_water_marks[username] = {
+                'last_id': last_id,
+                'last_timestamp': last_timestamp
+            }
+
+# high-water mark 갱신
+def commit_high_water_mark(username):
+    """보류한 high-water mark로 사용자 mark 갱신 후 저장 (수집한 트윗을 저장소에 기록한 뒤 호출)"""
+    with _high_water_lock:
+        pending = _pending_high_water_marks.pop(username, None)
+        if pending is None:
+            return
+        
+        marks = load_high_water_marks()
+        current = marks.get(username, {})
+        if int(current.get('last_id', 0)) >= int(pending['last_id']):
+            return
+        
+        marks[username] = pending
+        try:
+            serialization.dump(marks, HIGH_WATER_MARK_FILE)
+        except Exception as e:
+            logger.error(f"high-water mark 저장 오류: {e}")
+
+# 트윗 요소에서 정보 추출
+def extract_tweet(tweet_elem, username):
+    """
+    트윗 요소 하나를 파싱
+
+    Returns:
+    --------
+    tuple : (트윗 ID, 트윗 dict 또는 None, 고정 트윗 여부)
+    """
+    from selenium.webdriver.common.by import By
+
+    # 트윗 ID 추출
+    links = tweet_elem.find_elements(By.XPATH, ".//a[contains(@href, '/status/')]")
+    if not links:
+        return None, None, False
+        
+    href = links[0].get_attribute("href")
+    tweet_id_match = re.search(r'/status/(\d+)', href)
+    
+    if not tweet_id_match:
+        return None, None, False
+        
+    tweet_id = tweet_id_match.group(1)
+    
+    # 고정(Pinned) 트윗 여부 - 고정 트윗은 오래됐어도 맨 위에 표시됨
+    is_pinned = False
+    try:
+        social_context = tweet_elem.find_elements(By.XPATH, ".//div[@data-testid='socialContext']")
+        is_pinned = bool(social_context) and any(word in social_context[0].text for word in ("Pinned", "고정"))
+    except:
+        pass
+    
+    # 이미 처리한 트윗인지 확인
+    if tweet_id in processed_tweet_ids:
+        return tweet_id, None, is_pinned
+    
+    # 트윗 내용 추출
+    text_elements = tweet_elem.find_elements(By.XPATH, ".//div[@data-testid='tweetText']")
+    if not text_elements:
+        return tweet_id, None, is_pinned
+        
+    tweet_text = text_elements[0].text
+    
+    # 리트윗 여부 확인
+    if "RT @" in tweet_text:
+        return tweet_id, None, is_pinned
     
-    finally:
-        if driver:
+    # 날짜 텍스트 추출 (연도 포함 여부 확인)
+    date_text = ""
+    is_recent = True  # 기본값은 최신 트윗으로 가정
+    
+    try:
+        # 시간 요소 찾기
+        time_elements = tweet_elem.find_elements(By.XPATH, ".//time")
+        if time_elements:
+            # 날짜 텍스트 가져오기
+            date_text = time_elements[0].get_attribute("datetime")
+            
+            # 화면에 표시되는 날짜 텍스트 (연도 포함 여부 확인용)
+            displayed_date = ""
             try:
-                driver.quit()
-                logger.info("웹드라이버 종료")
+                displayed_date = time_elements[0].find_element(By.XPATH, "./..").text
             except:
                 pass
+            
+            # 연도가 표시되어 있으면 최신 트윗이 아님
+            # 트위터는 최신 트윗에 "n분 전", "n시간 전", "n일 전" 또는 "1월 15일"처럼 표시 (연도 없음)
+            # 오래된 트윗은 "2023년 1월 15일"처럼 연도를 포함하여 표시
+            is_recent = "년" not in displayed_date and "20" not in displayed_date[:4]
+    except:
+        pass
+    
+    # 날짜 파싱 (수집 시점에 epoch ms로 한 번만 변환, 실패 시 수집 시각 사용)
+    created_at_ms = to_epoch_ms(date_text) if date_text else None
+    if created_at_ms is None:
+        created_at_ms = now_ms()
+    created_at = datetime.fromtimestamp(created_at_ms / 1000, tz=timezone.utc)
+    
+    # 좋아요 수, 리트윗 수 추출
+    likes_count = 0
+    retweets_count = 0
+    
+    try:
+        metrics = tweet_elem.find_elements(By.XPATH, ".//*[@data-testid='like' or @data-testid='retweet']")
+        for metric in metrics:
+            aria_label = metric.get_attribute("aria-label")
+            if not aria_label:
+                continue
+                
+            if "like" in aria_label.lower():
+                likes_text = aria_label.split()[0]
+                likes_count = parse_count(likes_text)
+            elif "retweet" in aria_label.lower():
+                retweets_text = aria_label.split()[0]
+                retweets_count = parse_count(retweets_text)
+    except:
+        pass
+    
+    # ID 기록 (중복 방지)
+    processed_tweet_ids.add(tweet_id)
+    
+    if not is_recent:
+        return tweet_id, None, is_pinned
+    
+    # 트윗 객체 생성
+    tweet = Tweet(
+        id=tweet_id,
+        text=tweet_text,
+        created_at=created_at,
+        created_at_ms=created_at_ms,
+        author_id=username,
+        public_metrics={
+            'like_count': likes_count,
+            'retweet_count': retweets_count,
+            'reply_count': 0,
+            'quote_count': 0
+        },
+        url=f"https://twitter.com/{username}/status/{tweet_id}",
+        source='twitter',
+        is_recent=is_recent
+    )
+    return tweet_id, tweet, is_pinned
 
-# 트위터에서 직접 트윗 가져오기 (날짜 형식 기반 필터링 개선)
+# 트위터에서 직접 트윗 가져오기 (high-water mark 기반 증분 수집)
 def get_tweets_from_twitter(driver, username, max_tweets=5):
-    """트위터(X)에서 직접 트윗 가져오기 - 최신 트윗 필터링 강화"""
+    """
+    트위터(X)에서 직접 트윗 가져오기
+
+    타임라인 위에서부터 읽다가 지난 실행에서 본 트윗 ID(high-water mark)에 닿으면 멈춘다.
+    새 트윗이 없으면 페이지 한 번 로드로 끝나고, 부족할 때만 스크롤한다.
+    max_tweets는 스크롤을 멈추는 기준이며, 로드한 새 트윗은 모두 반환한다.
+
+    필터로 제외된 트윗까지 포함해 파싱한 가장 최신 ID를 새 mark로 보류하고,
+    호출 측이 트윗을 저장한 뒤 commit_high_water_mark()로 기록한다.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException, NoSuchElementException
+
+    fetch_started = time.monotonic_ns()
+
     # 트위터 프로필 페이지 접속
     url = f"https://twitter.com/{username}"
     
@@ -309,166 +519,102 @@ def get_tweets_from_twitter(driver, username, max_tweets=5):
             
         raise TimeoutException("트위터 페이지 로딩 실패")
     
-    # 트윗 요소 찾기
-    tweet_elements = driver.find_elements(By.XPATH, "//article[@data-testid='tweet']")
-    
-    if not tweet_elements:
-        logger.warning(f"트위터에서 {username}의 트윗을 찾을 수 없음")
-        raise NoSuchElementException("트윗 요소를 찾을 수 없음")
+    last_seen_id = int(load_high_water_marks().get(username, {}).get('last_id', 0))
     
-    logger.info(f"트위터에서 {len(tweet_elements)}개의 트윗 요소 발견")
+    recent_tweets = []
+    seen_ids = set()
+    reached_known = False
+    newest_id = None
+    newest_timestamp = None
     
-    # 필요한 경우 스크롤하여 더 많은 트윗 로드
-    if len(tweet_elements) < max_tweets:
-        scroll_twitter_page(driver, scroll_count=2)
+    for scroll in range(MAX_SCROLLS + 1):
+        # 트윗 요소 찾기
         tweet_elements = driver.find_elements(By.XPATH, "//article[@data-testid='tweet']")
-        logger.info(f"스크롤 후 {len(tweet_elements)}개의 트윗 요소 발견")
-    
-    # 트윗을 저장할 리스트
-    tweets = []
-    recent_tweets = []  # 최신 트윗(연도 표시 없는)
-    older_tweets = []   # 오래된 트윗(연도 표시 있는)
-    
-    for tweet_elem in tweet_elements:
-        try:
-            # 트윗 ID 추출
-            links = tweet_elem.find_elements(By.XPATH, ".//a[contains(@href, '/status/')]")
-            if not links:
-                continue
-                
-            href = links[0].get_attribute("href")
-            tweet_id_match = re.search(r'/status/(\d+)', href)
-            
-            if not tweet_id_match:
-                continue
-                
-            tweet_id = tweet_id_match.group(1)
-            
-            # 이미 처리한 트윗인지 확인
-            if tweet_id in processed_tweet_ids:
-                continue
-            
-            # 트윗 내용 추출
-            text_elements = tweet_elem.find_elements(By.XPATH, ".//div[@data-testid='tweetText']")
-            if not text_elements:
+        
+        if not tweet_elements and scroll == 0:
+            logger.warning(f"트위터에서 {username}의 트윗을 찾을 수 없음")
+            raise NoSuchElementException("트윗 요소를 찾을 수 없음")
+        
+        for tweet_elem in tweet_elements:
+            try:
+                tweet_id, tweet, is_pinned = extract_tweet(tweet_elem, username)
+            except Exception as e:
+                logger.error(f"트위터 트윗 추출 오류: {e}")
                 continue
-                
-            tweet_text = text_elements[0].text
             
-            # 리트윗 여부 확인
-            if "RT @" in tweet_text:
+            if tweet_id is None or tweet_id in seen_ids:
                 continue
+            seen_ids.add(tweet_id)
             
-            # 날짜 텍스트 추출 (연도 포함 여부 확인)
-            date_text = ""
-            is_recent = True  # 기본값은 최신 트윗으로 가정
+            if newest_id is None or int(tweet_id) > int(newest_id):
+                newest_id = tweet_id
+                newest_timestamp = tweet['created_at'] if tweet else None
             
-            try:
-                # 시간 요소 찾기
-                time_elements = tweet_elem.find_elements(By.XPATH, ".//time")
-                if time_elements:
-                    # 날짜 텍스트 가져오기
-                    date_text = time_elements[0].get_attribute("datetime")
-                    
-                    # 화면에 표시되는 날짜 텍스트 (연도 포함 여부 확인용)
-                    displayed_date = ""
-                    try:
-                        displayed_date = time_elements[0].find_element(By.XPATH, "./..").text
-                    except:
-                        pass
-                    
-                    # 연도가 표시되어 있으면 최신 트윗이 아님
-                    # 트위터는 최신 트윗에 "n분 전", "n시간 전", "n일 전" 또는 "1월 15일"처럼 표시 (연도 없음)
-                    # 오래된 트윗은 "2023년 1월 15일"처럼 연도를 포함하여 표시
-                    is_recent = "년" not in displayed_date and "20" not in displayed_date[:4]
-            except:
-                pass
+            # 지난번에 본 트윗에 도달하면 이후는 모두 이미 수집한 트윗
+            if last_seen_id and int(tweet_id) <= last_seen_id:
+                if is_pinned:
+                    continue
+                reached_known = True
+                break
             
-            # 날짜 파싱
-            created_at = datetime.now()  # 기본값
-            try:
-                if date_text:
-                    created_at = datetime.fromisoformat(date_text.replace('Z', '+00:00'))
-            except:
-                pass
-            
-            # 좋아요 수, 리트윗 수 추출
-            likes_count = 0
-            retweets_count = 0
-            
-            try:
-                metrics = tweet_elem.find_elements(By.XPATH, ".//*[@data-testid='like' or @data-testid='retweet']")
-                for metric in metrics:
-                    aria_label = metric.get_attribute("aria-label")
-                    if not aria_label:
-                        continue
-                        
-                    if "like" in aria_label.lower():
-                        likes_text = aria_label.split()[0]
-                        likes_count = parse_count(likes_text)
-                    elif "retweet" in aria_label.lower():
-                        retweets_text = aria_label.split()[0]
-                        retweets_count = parse_count(retweets_text)
-            except:
-                pass
-            
-            # 트윗 객체 생성
-            if is_recent:
-                tweet = {
-                    'id': tweet_id,
-                    'text': tweet_text,
-                    'created_at': created_at,
-                    'author_id': username,
-                    'public_metrics': {
-                        'like_count': likes_count,
-                        'retweet_count': retweets_count,
-                        'reply_count': 0,
-                        'quote_count': 0
-                    },
-                    'url': f"https://twitter.com/{username}/status/{tweet_id}",
-                    'source': 'twitter',
-                    'is_recent': is_recent
-                }
+            if tweet:
+                tweet['trace'] = get_tracer().start_trace('twitter', started_ns=fetch_started, username=username)
                 recent_tweets.append(tweet)
-            
-            # ID 기록 (중복 방지)
-            processed_tweet_ids.add(tweet_id)
-            
-        except Exception as e:
-            logger.error(f"트위터 트윗 추출 오류: {e}")
+        
+        if reached_known or len(recent_tweets) >= max_tweets:
+            break
+        
+        # 더 필요한 경우에만 스크롤 (새 트윗 요소가 붙을 때까지 대기)
+        if scroll < MAX_SCROLLS and not scroll_twitter_page(driver, scroll_count=1):
+            break
     
-    # 최신 트윗 우선, 오래된 트윗은 그 다음에 추가 (최대 개수 제한)
-    tweets = recent_tweets + older_tweets
-    if len(tweets) > max_tweets:
-        tweets = tweets[:max_tweets]
+    # max_tweets를 넘긴 새 트윗도 반환 (잘라내면 mark보다 오래된 트윗이 되어 다시 수집되지 않음)
+    tweets = recent_tweets
+    if newest_id is not None:
+        stage_high_water_mark(username, newest_id, newest_timestamp)
     
-    logger.info(f"트위터에서 {len(tweets)}개의 트윗 가져오기 성공 (최신 트윗: {len(recent_tweets)}개, 오래된 트윗: {len(older_tweets)}개)")
+    logger.info(f"트위터에서 {len(tweets)}개의 새 트윗 가져오기 성공 (스크롤 {scroll}회, 기존 트윗 도달: {reached_known})")
     return tweets
 
 # 트위터 페이지 스크롤 함수 (더 많은 트윗 로드)
-def scroll_twitter_page(driver, scroll_count=3, wait_time=1):
-    """트위터 페이지를 스크롤하여 더 많은 트윗 로드"""
+def scroll_twitter_page(driver, scroll_count=3, timeout=5):
+    """
+    트위터 페이지를 스크롤하여 더 많은 트윗 로드
+
+    고정 대기 대신 페이지 높이나 트윗 요소 수가 바뀔 때까지 기다린다.
+
+    Returns:
+    --------
+    bool : 새 트윗이 로드되었는지 여부
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    loaded = False
     try:
         for i in range(scroll_count):
+            height = driver.execute_script("return document.body.scrollHeight")
+            count = len(driver.find_elements(By.XPATH, "//article[@data-testid='tweet']"))
+            
             # 페이지 맨 아래로 스크롤
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
             
-            # 로딩 대기
-            time.sleep(wait_time)
-            
-            # 새 트윗 로드 확인 시도
+            # 새 트윗 요소가 붙을 때까지 대기 (타임라인은 가상 스크롤이라 높이 변화도 확인)
             try:
-                # 더 로드 중 표시 확인
-                loading_elements = driver.find_elements(By.XPATH, "//div[contains(@aria-label, 'Loading')]")
-                if loading_elements:
-                    # 로딩이 완료될 때까지 추가 대기
-                    time.sleep(wait_time * 2)
-            except:
-                pass
+                WebDriverWait(driver, timeout).until(
+                    lambda d: d.execute_script("return document.body.scrollHeight") > height
+                    or len(d.find_elements(By.XPATH, "//article[@data-testid='tweet']")) != count
+                )
+                loaded = True
+            except TimeoutException:
+                logger.info(f"스크롤 {i+1}/{scroll_count}: 추가 트윗 없음")
+                break
                 
             logger.info(f"스크롤 {i+1}/{scroll_count} 완료")
     except Exception as e:
         logger.error(f"스크롤 오류: {e}")
+    return loaded
 
 # 숫자 텍스트 파싱 (1.5K -> 1500)
 def parse_count(count_text):
@@ -499,93 +645,28 @@ def search_tweets_for_keywords(tweets, keywords):
     
     return matching_tweets
 
-# 트윗을 JSON 파일에 저장
-def save_tweets_to_file(tweets, username):
-    """트윗을 JSON 파일로 저장"""
-    if not tweets:
-        return
-        
-    # 폴더 생성
-    os.makedirs('tweets', exist_ok=True)
-    
-    # 파일명 설정
-    filename = f"tweets/{username}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-    
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(tweets, f, ensure_ascii=False, indent=2, default=str)
-        logger.info(f"{username}의 {len(tweets)}개 트윗을 {filename}에 저장")
-    except Exception as e:
-        logger.error(f"트윗 저장 오류: {e}")
+# 사용자별 트윗 저장소 조회
+def get_tweet_store():
+    """사용자별 추가 전용 트윗 저장소 (처음 호출 시 세그먼트 로드)"""
+    global _tweet_store
+    if _tweet_store is None:
+        _tweet_store = TweetStore('tweets/store')
+    return _tweet_store
 
-# 모든 트윗을 한 파일에 저장 (실시간 업데이트)
+# 새 트윗을 사용자 세그먼트에 추가 (실시간 업데이트)
 def update_all_tweets_file(username, tweets):
-    """모든 트윗을 하나의 파일에 업데이트"""
-    if not tweets:
-        return
-        
-    # 폴더 생성
-    os.makedirs('tweets', exist_ok=True)
-    
-    # 파일명 설정
-    filename = 'tweets/all_tweets.json'
-    
+    """새 트윗만 사용자별 저장소 세그먼트에 추가하고 보류한 high-water mark 기록"""
     try:
-        # 기존 파일 읽기
-        all_tweets = {}
-        
-        if os.path.exists(filename):
-            with open(filename, 'r', encoding='utf-8') as f:
-                all_tweets = json.load(f)
-        
-        # 사용자 트윗 업데이트
-        if username not in all_tweets:
-            all_tweets[username] = []
-            
-        # 새 트윗만 추가
-        existing_ids = {t['id'] for t in all_tweets[username] if 'id' in t}
-        new_tweets = [t for t in tweets if t['id'] not in existing_ids]
-        
+        new_tweets = get_tweet_store().append(username, tweets) if tweets else []
         if new_tweets:
-            all_tweets[username] = new_tweets + all_tweets[username]
-            
-            # 최대 100개만 유지 (메모리 관리)
-            all_tweets[username] = all_tweets[username][:100]
-            
-            # 파일에 저장
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(all_tweets, f, ensure_ascii=False, indent=2, default=str)
-            
-            logger.info(f"{username}의 {len(new_tweets)}개 새 트윗을 {filename}에 추가")
+            logger.info(f"{username}의 {len(new_tweets)}개 새 트윗을 저장소에 추가")
     except Exception as e:
         logger.error(f"트윗 업데이트 오류: {e}")
-
-# 코인별 트윗 분류 및 저장
-def categorize_and_save_coin_tweets(all_new_tweets):
-    """코인별로 트윗 분류하여 저장"""
-    # 폴더 생성
-    os.makedirs('tweets/coins', exist_ok=True)
+        return []
     
-    # 코인별 트윗 필터링 및 저장
-    for coin, pattern in coin_patterns.items():
-        keywords = pattern.get('positiveKeywords', []) + pattern.get('negativeKeywords', []) + [coin.lower()]
-        coin_tweets = []
-        
-        for username, tweets in all_new_tweets.items():
-            matching_tweets = search_tweets_for_keywords(tweets, keywords)
-            coin_tweets.extend(matching_tweets)
-        
-        if coin_tweets:
-            # 파일명 설정
-            filename = f"tweets/coins/{coin}_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            
-            # 파일에 저장
-            try:
-                with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(coin_tweets, f, ensure_ascii=False, indent=2, default=str)
-                logger.info(f"{coin} 관련 {len(coin_tweets)}개 트윗을 {filename}에 저장")
-            except Exception as e:
-                logger.error(f"{coin} 트윗 저장 오류: {e}")
+    # 저장이 끝난 뒤에만 mark를 올림 (그 전에 중단되면 다음 실행에서 다시 수집)
+    commit_high_water_mark(username)
+    return new_tweets
 
 
 # 트윗 모니터링 및 JSON 출력 함수
@@ -596,17 +677,23 @@ def monitor_tweets():
     
     all_new_tweets = {}
     
-    # 모든 인플루언서에 대해 최근 트윗 확인
+    # 모든 인플루언서의 최근 트윗을 브라우저 풀로 병렬 수집
+    start_time = time.time()
+    tweets_by_user = get_recent_tweets_parallel([influencer["twitter_username"] for influencer in influencers])
+    logger.info(f"{len(influencers)}명 트윗 수집 완료 ({time.time() - start_time:.1f}초)")
+    
+    # 결과 처리 및 저장 (파일 쓰기는 순차적으로)
     for influencer in influencers:
         username = influencer["twitter_username"]
         
         logger.info(f"\n👤 {influencer['name']}의 최근 트윗 확인 중...")
         
-        # Selenium을 사용하여 최근 트윗 가져오기
-        tweets = get_recent_tweets_via_selenium(username)
+        tweets = tweets_by_user.get(username, [])
         
         if not tweets:
             logger.warning(f"⚠️ {username}의 트윗을 가져오지 못했습니다.")
+            # 새 트윗이 모두 필터로 제외된 경우에도 mark는 올림 (저장할 트윗 없음)
+            update_all_tweets_file(username, tweets)
             continue
             
         logger.info(f"✅ {len(tweets)}개의 트윗을 가져왔습니다.")
@@ -623,15 +710,11 @@ def monitor_tweets():
                     logger.info(f"🚨 {coin} 관련 키워드 감지: {tweet['url'] or ''}")
         
         # 트윗 저장
-        save_tweets_to_file(tweets, username)
         update_all_tweets_file(username, tweets)
         
         # 새 트윗 기록
         all_new_tweets[username] = tweets
     
-    # 코인별 트윗 분류 및 저장
-    categorize_and_save_coin_tweets(all_new_tweets)
-    
     return all_new_tweets
 
 # 메인 함수
@@ -653,6 +736,7 @@ def main():
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("\n프로그램 종료...")
+        get_browser_pool().close()
     except Exception as e:
         logger.error(f"\n⚠️ 오류 발생: {e}")
         import traceback
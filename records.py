@@ -0,0 +1,320 @@
+import sys
+import json
+import logging
+from enum import Enum
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class Coin(str, Enum):
+    """모니터링 대상 코인 (str 서브클래스라 기존 문자열 비교/JSON 출력과 호환)"""
+    BTC = 'BTC'
+    ETH = 'ETH'
+    DOGE = 'DOGE'
+    SHIB = 'SHIB'
+    FLOKI = 'FLOKI'
+    TRUMP = 'TRUMP'
+    MAGA = 'MAGA'
+
+    def __str__(self):
+        # f"{coin}/USDT" 같은 포매팅이 파이썬 버전과 관계없이 심볼만 출력하도록
+        return self.value
+
+    __format__ = str.__format__
+
+    @classmethod
+    def parse(cls, value):
+        """코인 심볼 -> Coin (목록에 없는 심볼은 intern된 문자열 그대로)"""
+        if value is None or isinstance(value, cls):
+            return value
+        try:
+            return cls(value)
+        except ValueError:
+            return intern_str(value)
+
+
+class SourceType(str, Enum):
+    """시그널 출처"""
+    TWITTER = 'twitter'
+    NEWS = 'news'
+
+    def __str__(self):
+        return self.value
+
+    __format__ = str.__format__
+
+    @classmethod
+    def parse(cls, value):
+        if value is None or isinstance(value, cls):
+            return value
+        try:
+            return cls(value)
+        except ValueError:
+            return intern_str(value)
+
+
+def intern_str(value):
+    """반복되는 짧은 문자열(출처, 코인, 상태값)은 intern해서 한 객체만 유지"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _parse_datetime(value):
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return value
+    return value
+
+
+def _json_value(value):
+    """JSON 직렬화용 값 변환 (중첩 dict/list 포함)"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Record):
+        return value.to_json_dict()
+    if isinstance(value, dict):
+        return {k: _json_value(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_value(v) for v in value]
+    return value
+
+
+class _Unset:
+    __slots__ = ()
+
+    def __repr__(self):
+        return '<unset>'
+
+
+_UNSET = _Unset()
+
+
+class Record:
+    """
+    __slots__ 기반 레코드 기본 클래스
+
+    하위 클래스는 FIELDS에 필드 이름을 순서대로 나열한다. 필드는 __slots__ 속성으로
+    저장되어 dict보다 메모리를 적게 쓰고 속성 접근(record.field)이 빠르다.
+    기존 코드와의 호환을 위해 record['field'], record.get('field') 같은 dict 방식 접근도
+    지원하며, 스키마에 없는 키는 extra에 담고 클래스/키별로 한 번 경고를 남긴다.
+    """
+
+    FIELDS = ()
+    REQUIRED = ()
+    DATETIME_FIELDS = ()
+    ENUM_FIELDS = {}
+    INTERN_FIELDS = ()
+
+    __slots__ = ('extra',)
+
+    _warned = set()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._field_set = frozenset(cls.FIELDS)
+
+    def __init__(self, **kwargs):
+        self.extra = None
+        for name in self.FIELDS:
+            object.__setattr__(self, name, _UNSET)
+        for key, value in kwargs.items():
+            self[key] = value
+
+    # ------------------------------------------------------------------
+    # dict 호환 접근
+    # ------------------------------------------------------------------
+    def __getitem__(self, key):
+        if key in self._field_set:
+            value = getattr(self, key)
+            if value is _UNSET:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_set:
+            if key in self.ENUM_FIELDS:
+                value = self.ENUM_FIELDS[key].parse(value)
+            elif key in self.INTERN_FIELDS:
+                value = intern_str(value)
+            object.__setattr__(self, key, value)
+        else:
+            if (type(self).__name__, key) not in Record._warned:
+                Record._warned.add((type(self).__name__, key))
+                logger.warning(f"{type(self).__name__} 스키마에 없는 필드: {key}")
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key):
+        if key in self._field_set:
+            return getattr(self, key) is not _UNSET
+        return bool(self.extra) and key in self.extra
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        keys = [name for name in self.FIELDS if getattr(self, name) is not _UNSET]
+        if self.extra:
+            keys.extend(self.extra)
+        return keys
+
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ', '.join(f"{key}={self[key]!r}" for key in self.keys())
+        return f"{type(self).__name__}({fields})"
+
+    # ------------------------------------------------------------------
+    # 코덱
+    # ------------------------------------------------------------------
+    def to_dict(self):
+        """설정된 필드만 담은 dict (값은 파이썬 객체 그대로, Enum은 문자열로)"""
+        result = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not _UNSET:
+                result[name] = value.value if isinstance(value, Enum) else value
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def to_json_dict(self):
+        """JSON으로 바로 쓸 수 있는 dict (datetime은 ISO 문자열)"""
+        return {key: _json_value(value) for key, value in self.to_dict().items()}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_json_dict(), ensure_ascii=False, **kwargs)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        dict -> 레코드 (필수 필드 누락 시 ValueError, datetime 필드는 ISO 문자열 파싱)
+        """
+        if isinstance(data, cls):
+            return data
+        missing = [name for name in cls.REQUIRED if name not in data]
+        if missing:
+            raise ValueError(f"{cls.__name__} 필수 필드 누락: {missing}")
+
+        record = cls(**data)
+        for name in cls.DATETIME_FIELDS:
+            value = getattr(record, name)
+            if value is not _UNSET:
+                object.__setattr__(record, name, _parse_datetime(value))
+        return record
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+class Article(Record):
+    """realtimeNS 뉴스 기사"""
+    FIELDS = ('id', 'title', 'url', 'source', 'timestamp', 'timestamp_ms', 'risk_level', 'language',
+              'related_coins', 'related_influencers', 'special_categories', 'content', 'trace')
+    REQUIRED = ('title',)
+    INTERN_FIELDS = ('source', 'risk_level', 'language')
+    __slots__ = FIELDS
+
+
+class Tweet(Record):
+    """realtimeTW 트윗"""
+    FIELDS = ('id', 'text', 'created_at', 'created_at_ms', 'author_id', 'public_metrics',
+              'url', 'source', 'is_recent', 'trace')
+    REQUIRED = ('id', 'text')
+    INTERN_FIELDS = ('author_id', 'source')
+    __slots__ = FIELDS
+
+
+class TradingSignal(Record):
+    """reverageAI.generate_trading_signal 거래 시그널"""
+    FIELDS = ('timestamp', 'coinSymbol', 'sourceType', 'sourceId', 'sourceUrl', 'sourceContent',
+              'sourceAuthor', 'sentiment', 'confidenceScore', 'predictedImpact',
+              'estimatedPriceChangePercent', 'recommendedAction', 'recommendedLeverageMultiple',
+              'riskLevel', 'reasoning', 'optimalEntryWindow', 'optimalExitWindow', 'currentPrice',
+              'priceMissing', 'timestamp_ms', 'trace')
+    REQUIRED = ('coinSymbol', 'recommendedAction')
+    ENUM_FIELDS = {'coinSymbol': Coin, 'sourceType': SourceType}
+    INTERN_FIELDS = ('sourceAuthor', 'sentiment', 'predictedImpact', 'recommendedAction', 'riskLevel')
+    __slots__ = FIELDS
+
+
+class Position(Record):
+    """BitcoinTrader 포지션"""
+    FIELDS = ('id', 'type', 'symbol', 'size', 'entry_price', 'stop_loss', 'take_profit', 'leverage',
+              'open_time', 'status', 'close_price', 'close_time', 'pnl_pct')
+    REQUIRED = ('id', 'type', 'size', 'entry_price')
+    DATETIME_FIELDS = ('open_time', 'close_time')
+    INTERN_FIELDS = ('type', 'symbol', 'status')
+    __slots__ = FIELDS
+
+
+class TradePosition(Record):
+    """backend PositionManager.execute_trade 결과 / Firestore positions 문서"""
+    FIELDS = ('id', 'trade_id', 'symbol', 'side', 'leverage', 'amount', 'quantity', 'entry_price',
+              'stop_loss', 'take_profit', 'status', 'order', 'executed_at', 'current_price', 'pnl',
+              'pnl_percent', 'updated_at', 'close_price', 'close_reason', 'final_pnl', 'closed_at',
+              'performance_recorded', 'trace')
+    INTERN_FIELDS = ('symbol', 'side', 'status')
+    __slots__ = FIELDS
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import tracemalloc
+
+    sample = {
+        "timestamp": "2025-05-10T01:04:06", "coinSymbol": "MAGA", "sourceType": "twitter",
+        "sourceId": "1921008311492624867", "sourceUrl": "https://twitter.com/realDonaldTrump/status/1921008311492624867",
+        "sourceContent": "Today, I signed an Executive Order...", "sourceAuthor": "Donald Trump",
+        "sentiment": "positive", "confidenceScore": 78, "predictedImpact": "긍정적",
+        "estimatedPriceChangePercent": 8.44, "recommendedAction": "buy", "recommendedLeverageMultiple": 10,
+        "riskLevel": "high", "reasoning": "기본 분석", "optimalEntryWindow": {"start": "즉시", "end": "10분 이내"},
+        "optimalExitWindow": {"start": "11분 후", "end": "28분 이내"}, "currentPrice": 100.02
+    }
+
+    signal = TradingSignal.from_dict(sample)
+    assert signal.to_json_dict() == sample
+    assert signal['coinSymbol'] == 'MAGA' and signal.coinSymbol is Coin.MAGA
+    print(signal.to_json()[:120], '...')
+
+    n = 100000
+    for name, factory in (("dict", lambda: dict(sample)), ("TradingSignal", lambda: TradingSignal(**sample))):
+        tracemalloc.start()
+        items = [factory() for _ in range(n)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        if name == "dict":
+            total = sum(item['confidenceScore'] for item in items)
+        else:
+            total = sum(item.confidenceScore for item in items)
+        print(f"{name:14} {n}개: {size / 1024 / 1024:.1f}MB, 필드 합산 {time.perf_counter() - start:.3f}초")
+        del items
@@ -0,0 +1,479 @@
+import os
+import re
+import glob
+import time
+import random
+import logging
+import cProfile
+import pstats
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import reverageAI
+from newsArchive import NewsArchive, SNAPSHOT_PATTERN
+from tweetStore import TweetStore
+from timeUtils import to_epoch_ms, ms_to_datetime
+import serialization
+
+logger = logging.getLogger(__name__)
+
+
+class VirtualClock:
+    """
+    리플레이용 가상 시계
+
+    reverageAI 모듈의 datetime.now()가 실제 시간 대신 이 시계를 보도록 바꿔서,
+    is_recent_content와 generate_trading_signal이 과거 시점 기준으로 동작하게 한다.
+    시간은 수집 데이터와 같은 로컬 naive datetime으로 관리한다.
+    """
+
+    def __init__(self, start=None):
+        self.current = start or datetime.now()
+
+    def now(self, tz=None):
+        if tz is None:
+            return self.current
+        return self.current.astimezone(tz)
+
+    def set(self, when):
+        # 시간은 뒤로 가지 않음
+        if when > self.current:
+            self.current = when
+
+    def datetime_class(self):
+        """now()만 가상 시계로 바꾼 datetime 서브클래스 생성"""
+        clock = self
+
+        class VirtualDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now(tz)
+
+        return VirtualDatetime
+
+
+class SimulatedFillModel:
+    """
+    과거 캔들 기반 체결 시뮬레이터
+
+    시그널 시각 이후 첫 캔들 시가에 진입하고, 시그널의 최적 청산 시간
+    (optimalExitWindow['end'])이 지나면 종가로 청산한다. 보유 중 레버리지
+    기준 청산가에 닿으면 강제 청산으로 처리한다.
+    """
+
+    def __init__(self, candles, fee_rate=0.0004, slippage=0.0005, entry_delay_minutes=1,
+                 default_exit_minutes=60, max_leverage=10):
+        """
+        Parameters:
+        -----------
+        candles : dict
+            코인 심볼 -> OHLCV DataFrame (timestamp 인덱스, 로컬 시간)
+        fee_rate : float
+            진입/청산 시 명목 금액 대비 수수료율
+        slippage : float
+            체결 가격 슬리피지
+        entry_delay_minutes : int
+            시그널 발생 후 주문 체결까지 지연 시간 (분)
+        default_exit_minutes : int
+            청산 시간을 해석할 수 없을 때 사용할 보유 시간 (분)
+        max_leverage : int
+            적용할 최대 레버리지
+        """
+        self.candles = {coin: df.sort_index() for coin, df in (candles or {}).items()}
+        self.fee_rate = fee_rate
+        self.slippage = slippage
+        self.entry_delay = timedelta(minutes=entry_delay_minutes)
+        self.default_exit_minutes = default_exit_minutes
+        self.max_leverage = max_leverage
+
+    def price_at(self, coin_symbol, when):
+        """해당 시각 직전 캔들의 종가 (get_coin_price 대체용)"""
+        df = self.candles.get(coin_symbol)
+        if df is None or df.empty:
+            return None
+        pos = df.index.searchsorted(pd.Timestamp(when), side='right') - 1
+        if pos < 0:
+            return None
+        return float(df['close'].iloc[pos])
+
+    def _exit_minutes(self, signal):
+        """'27분 이내' 같은 청산 시간 문자열에서 분 단위 추출"""
+        window = signal.get('optimalExitWindow') or {}
+        match = re.search(r'(\d+)\s*분', str(window.get('end', '')))
+        if match:
+            return int(match.group(1))
+        match = re.search(r'(\d+)\s*시간', str(window.get('end', '')))
+        if match:
+            return int(match.group(1)) * 60
+        return self.default_exit_minutes
+
+    def fill(self, signal, signal_time):
+        """
+        시그널 한 건의 가상 체결 결과 계산
+
+        Returns:
+        --------
+        dict : 체결 정보, 체결할 수 없으면 None
+        """
+        action = str(signal.get('recommendedAction', 'hold')).lower()
+        if action not in ('buy', 'sell'):
+            return None
+
+        df = self.candles.get(signal.get('coinSymbol'))
+        if df is None or df.empty:
+            return None
+
+        side = 1 if action == 'buy' else -1
+        leverage = max(1, min(self.max_leverage, int(signal.get('recommendedLeverageMultiple') or 1)))
+
+        entry_time = pd.Timestamp(signal_time + self.entry_delay)
+        exit_time = entry_time + pd.Timedelta(minutes=self._exit_minutes(signal))
+        start = df.index.searchsorted(entry_time, side='left')
+        end = df.index.searchsorted(exit_time, side='right')
+        if start >= len(df) or end <= start:
+            return None
+
+        window = df.iloc[start:end]
+        entry_price = float(window['open'].iloc[0]) * (1 + side * self.slippage)
+
+        # 레버리지 기준 강제 청산가
+        liquidation_price = entry_price * (1 - side / leverage)
+        if side > 0:
+            liquidated = (window['low'] <= liquidation_price).to_numpy()
+        else:
+            liquidated = (window['high'] >= liquidation_price).to_numpy()
+
+        if liquidated.any():
+            hit = int(liquidated.argmax())
+            exit_price = liquidation_price
+            exit_at = window.index[hit]
+            exit_reason = 'liquidation'
+        else:
+            exit_price = float(window['close'].iloc[-1]) * (1 - side * self.slippage)
+            exit_at = window.index[-1]
+            exit_reason = 'exit_window'
+
+        if exit_reason == 'liquidation':
+            pnl_pct = -100.0
+        else:
+            pnl_pct = side * (exit_price - entry_price) / entry_price * 100 * leverage
+            pnl_pct -= 2 * self.fee_rate * 100 * leverage
+
+        return {
+            'coinSymbol': signal.get('coinSymbol'),
+            'sourceType': signal.get('sourceType'),
+            'sourceId': signal.get('sourceId'),
+            'side': 'long' if side > 0 else 'short',
+            'leverage': leverage,
+            'signal_time': signal_time,
+            'entry_time': window.index[0],
+            'entry_price': entry_price,
+            'exit_time': exit_at,
+            'exit_price': exit_price,
+            'exit_reason': exit_reason,
+            'pnl_pct': pnl_pct
+        }
+
+
+@contextmanager
+def patched_module(module, **attrs):
+    """모듈 전역 값을 잠시 교체했다가 원래대로 복구"""
+    originals = {name: getattr(module, name) for name in attrs}
+    try:
+        for name, value in attrs.items():
+            setattr(module, name, value)
+        yield module
+    finally:
+        for name, value in originals.items():
+            setattr(module, name, value)
+
+
+def parse_event_time(value, fallback=None):
+    """아카이브 타임스탬프를 로컬 naive datetime으로 변환 (실패 시 fallback)"""
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return value
+    ms = to_epoch_ms(value)
+    return ms_to_datetime(ms) if ms is not None else fallback
+
+
+def _iter_snapshot_files(data_dir, start=None, end=None):
+    """data/의 news_integration 파일을 시간 순서대로 읽기 (아카이브가 없을 때)"""
+    files = []
+    for path in glob.glob(os.path.join(data_dir, "news_integration_*.json")):
+        match = SNAPSHOT_PATTERN.search(os.path.basename(path))
+        if match:
+            files.append((datetime.strptime(match.group(1), '%Y%m%d_%H%M'), path))
+    files.sort()
+
+    for file_time, path in files:
+        if (start and file_time < start) or (end and file_time > end):
+            continue
+        try:
+            news_data = serialization.load(path)
+        except Exception as e:
+            logger.error(f"스냅샷 로드 오류 ({path}): {e}")
+            continue
+        yield file_time, news_data
+
+
+def load_news_events(data_dir="data", start=None, end=None, archive=None):
+    """
+    news_integration 스냅샷을 리플레이 이벤트로 변환
+
+    같은 기사(URL + 코인)는 처음 수집된 스냅샷 시점에만 이벤트로 만든다.
+    이벤트 시각(available_at)은 스냅샷 수집 시각이며, 시스템이 실제로 그 기사를
+    볼 수 있었던 시점이다. 압축된 아카이브(newsArchive)가 있으면 파일 대신
+    아카이브에서 기간만 골라 읽는다.
+
+    Returns:
+    --------
+    list : (available_at, signal) 튜플 목록
+    """
+    events = []
+    seen = set()
+
+    if archive is None and NewsArchive.exists():
+        archive = NewsArchive()
+    if archive is not None:
+        snapshots = archive.iter_snapshots(start, end)
+    else:
+        snapshots = _iter_snapshot_files(data_dir, start, end)
+
+    snapshot_count = 0
+    for snapshot_time, news_data in snapshots:
+        snapshot_count += 1
+        available_at = parse_event_time(news_data.get('timestamp'), snapshot_time)
+        for signal in reverageAI.news_signals_from_integration(news_data):
+            key = (signal.get('url') or signal.get('content'), signal.get('coinSymbol'))
+            if key in seen:
+                continue
+            seen.add(key)
+            events.append((available_at, signal))
+
+    logger.info(f"뉴스 스냅샷 {snapshot_count}개에서 {len(events)}개 이벤트 로드")
+    return events
+
+
+def load_tweet_events(tweets_dir="tweets", scrape_delay_minutes=0, start=None, end=None):
+    """
+    수집된 트윗 파일을 리플레이 이벤트로 변환
+
+    Returns:
+    --------
+    list : (available_at, signal) 튜플 목록
+    """
+    tweets_by_user = {}
+    paths = glob.glob(os.path.join(tweets_dir, "*.json"))
+    for path in paths:
+        try:
+            data = serialization.load(path)
+        except Exception as e:
+            logger.error(f"트윗 파일 로드 오류 ({path}): {e}")
+            continue
+
+        # all_tweets.json은 {username: [tweets]}, 사용자별 파일은 [tweets]
+        # 또는 {username, timestamp, tweets}
+        username = os.path.basename(path).split('_')[0]
+        if isinstance(data, dict) and 'tweets' in data:
+            items = [(data.get('username', username), data['tweets'])]
+        elif isinstance(data, dict):
+            items = data.items()
+        else:
+            items = [(username, data)]
+
+        for username, tweets in items:
+            user_tweets = tweets_by_user.setdefault(username, {})
+            for tweet in tweets:
+                if tweet.get('id'):
+                    user_tweets.setdefault(tweet['id'], tweet)
+
+    # 사용자별 트윗 저장소(tweetStore.py) 세그먼트
+    store_dir = os.path.join(tweets_dir, "store")
+    if TweetStore.exists(store_dir):
+        store = TweetStore(store_dir)
+        for username in store.users():
+            user_tweets = tweets_by_user.setdefault(username, {})
+            for tweet in store.get(username):
+                if tweet.get('id'):
+                    user_tweets.setdefault(tweet['id'], tweet)
+
+    events = []
+    delay = timedelta(minutes=scrape_delay_minutes)
+    for username, tweets in tweets_by_user.items():
+        for signal in reverageAI.twitter_signals_from_user(username, list(tweets.values())):
+            created_at = parse_event_time(signal.get('timestamp'))
+            if created_at is None:
+                continue
+            available_at = created_at + delay
+            if (start and available_at < start) or (end and available_at > end):
+                continue
+            events.append((available_at, signal))
+
+    logger.info(f"트윗 파일 {len(paths)}개에서 {len(events)}개 이벤트 로드")
+    return events
+
+
+def run_replay(events, fill_model=None, use_claude=False, max_minutes_old=30, seed=None):
+    """
+    아카이브 이벤트를 시간 순서대로 reverageAI 파이프라인에 통과시킴
+
+    main()과 같은 순서(중복 확인 → 최신성 확인 → 분석 → 시그널 생성)로
+    처리하되, 현재 시각은 가상 시계, 가격은 과거 캔들을 사용하고
+    파일 저장과 알림은 하지 않는다.
+
+    Parameters:
+    -----------
+    events : list
+        (available_at, signal) 튜플 목록
+    fill_model : SimulatedFillModel
+        가격 조회 및 가상 체결 모델 (없으면 가격 없이 시그널만 생성)
+    use_claude : bool
+        Claude 분석 허용 여부 (기본값: 사용 안 함)
+    max_minutes_old : int
+        is_recent_content 최신성 기준 (분)
+    seed : int
+        기본 분석의 난수 시드 (같은 시드면 같은 결과 재현)
+
+    Returns:
+    --------
+    dict : 생성된 시그널, 체결 결과, 처리 통계
+    """
+    events = sorted(events, key=lambda event: event[0])
+    if not events:
+        return {'signals': [], 'fills': [], 'stats': {}}
+
+    if seed is not None:
+        random.seed(seed)
+
+    clock = VirtualClock(events[0][0])
+    processed_ids = {"news": set(), "twitter": set()}
+    signals, fills = [], []
+    stats = {'events': len(events), 'duplicates': 0, 'stale': 0, 'no_analysis': 0, 'signals': 0, 'fills': 0}
+
+    def historical_price(symbol):
+        return fill_model.price_at(symbol, clock.now()) if fill_model else None
+
+    wall_start = time.perf_counter()
+    with patched_module(reverageAI, datetime=clock.datetime_class(), get_coin_price=historical_price):
+        for available_at, signal in events:
+            clock.set(available_at)
+
+            source = signal.get('source', '')
+            if source == 'twitter':
+                data_id, data_type = signal.get('tweet_id', ''), "twitter"
+            else:
+                data_id, data_type = signal.get('url', '') or str(hash(signal.get('content', ''))), "news"
+
+            if reverageAI.is_already_processed(data_id, data_type, processed_ids):
+                stats['duplicates'] += 1
+                continue
+            if not reverageAI.is_recent_content(signal.get('timestamp', ''), max_minutes_old):
+                stats['stale'] += 1
+                continue
+
+            coin_symbol = signal.get('coinSymbol', '')
+            if source == 'twitter':
+                analysis = reverageAI.analyze_tweet(signal, coin_symbol, use_claude=use_claude)
+            else:
+                analysis = reverageAI.analyze_news(signal, coin_symbol, use_claude=use_claude)
+
+            reverageAI.mark_as_processed(data_id, data_type, processed_ids)
+            if not analysis:
+                stats['no_analysis'] += 1
+                continue
+
+            trading_signal = reverageAI.generate_trading_signal(analysis, coin_symbol, signal)
+            if not trading_signal:
+                continue
+            signals.append(trading_signal)
+            stats['signals'] += 1
+
+            if fill_model:
+                fill = fill_model.fill(trading_signal, clock.now())
+                if fill:
+                    fills.append(fill)
+                    stats['fills'] += 1
+
+    wall_seconds = time.perf_counter() - wall_start
+    virtual_seconds = (events[-1][0] - events[0][0]).total_seconds()
+    stats.update({
+        'wall_seconds': wall_seconds,
+        'virtual_seconds': virtual_seconds,
+        'speedup': virtual_seconds / wall_seconds if wall_seconds > 0 else float('inf')
+    })
+    if fills:
+        pnl = pd.Series([fill['pnl_pct'] for fill in fills])
+        stats.update({
+            'win_rate': float((pnl > 0).mean() * 100),
+            'avg_pnl_pct': float(pnl.mean()),
+            'total_pnl_pct': float(pnl.sum())
+        })
+
+    logger.info(f"리플레이 완료: 이벤트 {stats['events']}개, 시그널 {stats['signals']}개, "
+                f"체결 {stats['fills']}개, {wall_seconds:.2f}초 (실시간 대비 {stats['speedup']:.0f}배)")
+    return {'signals': signals, 'fills': fills, 'stats': stats}
+
+
+def fetch_candles(coin_symbol, start, end, timeframe='1m', exchange_id='binance'):
+    """
+    ccxt로 리플레이 구간의 과거 캔들 조회 (결과는 data/candles에 캐시)
+
+    Returns:
+    --------
+    pandas.DataFrame : timestamp(로컬 시간) 인덱스의 OHLCV
+    """
+    cache_dir = os.path.join("data", "candles")
+    cache_file = os.path.join(cache_dir, f"{coin_symbol}_{timeframe}_{start:%Y%m%d%H%M}_{end:%Y%m%d%H%M}.csv")
+    if os.path.exists(cache_file):
+        return pd.read_csv(cache_file, index_col='timestamp', parse_dates=True)
+
+    import ccxt
+
+    exchange = getattr(ccxt, exchange_id)({'enableRateLimit': True})
+    since = int(start.astimezone().timestamp() * 1000)
+    until = int(end.astimezone().timestamp() * 1000)
+    rows = []
+    while since < until:
+        batch = exchange.fetch_ohlcv(f"{coin_symbol}/USDT", timeframe=timeframe, since=since, limit=1000)
+        if not batch:
+            break
+        rows.extend(batch)
+        since = batch[-1][0] + 1
+
+    df = pd.DataFrame(rows, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = (pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+                       .dt.tz_convert(datetime.now().astimezone().tzinfo).dt.tz_localize(None))
+    df = df.drop_duplicates('timestamp').set_index('timestamp')
+
+    os.makedirs(cache_dir, exist_ok=True)
+    df.to_csv(cache_file)
+    return df
+
+
+def profile_replay(events, fill_model=None, top=25, seed=None):
+    """cProfile로 리플레이를 실행하고 누적 시간 기준 상위 함수 출력"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    result = run_replay(events, fill_model, seed=seed)
+    profiler.disable()
+    pstats.Stats(profiler).sort_stats('cumulative').print_stats(top)
+    return result
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    news_events = load_news_events()
+    tweet_events = load_tweet_events()
+    events = news_events + tweet_events
+
+    # 과거 캔들 없이 시그널 로직만 리플레이
+    result = run_replay(events, seed=42)
+
+    print("\n" + "=" * 80)
+    print("리플레이 결과")
+    print("=" * 80)
+    for key, value in result['stats'].items():
+        print(f"  {key}: {value:.2f}" if isinstance(value, float) else f"  {key}: {value}")
@@ -6,22 +6,38 @@ import json
 import re
 import time
 import random
+import heapq
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import logging
 from dotenv import load_dotenv
-import anthropic
+from timeUtils import to_epoch_ms
+from records import TradingSignal
+import serialization
+from pipeline import Pipeline, Stage
+from tracing import get_tracer, trace_of
 
 # 환경 변수 로드
 load_dotenv()
 
-# Claude API 클라이언트 설정
-client = anthropic.Anthropic(api_key=os.getenv('ANTHROPIC_API_KEY'))
-
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# 로깅 설정은 실행 시(__main__)에만 (import하는 쪽의 설정을 덮어쓰지 않음)
 logger = logging.getLogger(__name__)
 
+# Claude API 클라이언트 (anthropic import와 생성은 첫 호출 때 한 번)
+_claude_client = None
+_claude_client_lock = threading.Lock()
+
+def _get_claude_client(api_key):
+    """Claude API 클라이언트 조회 (처음 호출 시 생성, API 키가 바뀌면 재생성)"""
+    global _claude_client
+    with _claude_client_lock:
+        if _claude_client is None or _claude_client.api_key != api_key:
+            import anthropic
+            _claude_client = anthropic.Anthropic(api_key=api_key)
+        return _claude_client
+
 # 2. 모니터링할 인플루언서 목록 설정
 influencers = [
     {"name": "Elon Musk", "twitter_username": "elonmusk", "coins": ["DOGE", "SHIB", "FLOKI"]},
@@ -310,28 +326,30 @@ def get_coin_price(symbol):
 last_api_call_time = datetime.now() - timedelta(minutes=10)  # 초기값
 api_calls_count = 0
 MAX_API_CALLS_PER_MINUTE = 10  # 분당 최대 API 호출 수
+_api_call_lock = threading.Lock()  # 분석 단계 작업 스레드 간 호출 카운터 보호
 
 # Claude API 호출 제한 관리
 def can_call_claude_api():
     """Claude API 호출 제한 확인"""
     global last_api_call_time, api_calls_count
     
-    current_time = datetime.now()
-    time_diff = (current_time - last_api_call_time).total_seconds()
-    
-    # 1분이 지났으면 카운터 초기화
-    if time_diff > 60:
-        last_api_call_time = current_time
-        api_calls_count = 0
-        return True
-    
-    # 분당 호출 제한 확인
-    if api_calls_count < MAX_API_CALLS_PER_MINUTE:
-        api_calls_count += 1
-        return True
-    
-    # 제한 초과
-    return False
+    with _api_call_lock:
+        current_time = datetime.now()
+        time_diff = (current_time - last_api_call_time).total_seconds()
+        
+        # 1분이 지났으면 카운터 초기화
+        if time_diff > 60:
+            last_api_call_time = current_time
+            api_calls_count = 0
+            return True
+        
+        # 분당 호출 제한 확인
+        if api_calls_count < MAX_API_CALLS_PER_MINUTE:
+            api_calls_count += 1
+            return True
+        
+        # 제한 초과
+        return False
 
 #  """Claude API를 사용하여 뉴스/트윗 내용을 분석"""
 def analyze_with_claude(content, coin_symbol, source_type):
@@ -385,6 +403,8 @@ def analyze_with_claude(content, coin_symbol, source_type):
         logger.info(f"코인: {coin_symbol}")
         logger.info(f"프롬프트: {prompt}")
 
+        import anthropic
+
         # Claude API 호출 시도
         try:
             # API 키 확인
@@ -393,7 +413,7 @@ def analyze_with_claude(content, coin_symbol, source_type):
                 logger.error("Anthropic API 키가 설정되지 않았습니다.")
                 raise ValueError("API 키가 없습니다.")
                 
-            client = anthropic.Anthropic(api_key=api_key)
+            client = _get_claude_client(api_key)
             
             # API 호출
             response = client.messages.create(
@@ -711,7 +731,7 @@ def parse_claude_response(response_text):
 def analyze_tweet(tweet_data, coin_symbol, use_claude=False):
     """Claude를 사용하여 트윗 분석"""
     try:
-        tweet_text = tweet_data.get('text', '')
+        tweet_text = tweet_data.get('text') or tweet_data.get('content', '')
         if not tweet_text:
             logger.error("트윗 텍스트가 비어 있습니다.")
             return None
@@ -797,7 +817,7 @@ def analyze_tweet_basic(tweet_data, coin_symbol):
             return None
             
         # 텍스트 필드가 없으면 분석 불가
-        tweet_text = tweet_data.get('text', '')
+        tweet_text = tweet_data.get('text') or tweet_data.get('content', '')
         if not tweet_text:
             logger.error(f"트윗 텍스트가 비어 있습니다.")
             return None
@@ -1111,7 +1131,7 @@ def generate_trading_signal(analysis, coin_symbol, source_data):
             "analyzed_by": "Claude AI"
         }
         
-        return signal
+        return TradingSignal.from_dict(signal)
         
     except Exception as e:
         logger.error(f"거래 시그널 생성 오류: {e}")
@@ -1122,6 +1142,7 @@ def generate_trading_signal(analysis, coin_symbol, source_data):
 # 가격 캐싱을 위한 전역 변수
 price_cache = {}
 last_price_update = {}
+_price_cache_lock = threading.Lock()  # 가격 단계의 동시 조회가 캐시 파일을 덮어쓰지 않도록 보호
 
 def cache_price(symbol, price, source):
     """코인 가격을 캐시에 저장"""
@@ -1129,33 +1150,32 @@ def cache_price(symbol, price, source):
     
     current_time = datetime.now()
     
-    price_cache[symbol] = {
-        'price': price,
-        'source': source,
-        'timestamp': current_time.isoformat()
-    }
-    
-    last_price_update[symbol] = current_time
-    
-    # 캐시 파일에도 저장 (선택 사항)
-    try:
-        cache_file = 'price_cache.json'
-        
-        # 기존 캐시 파일 로드
-        if os.path.exists(cache_file):
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                all_cache = json.load(f)
-        else:
-            all_cache = {}
+    with _price_cache_lock:
+        price_cache[symbol] = {
+            'price': price,
+            'source': source,
+            'timestamp': current_time.isoformat()
+        }
         
-        # 새 가격 정보 추가
-        all_cache[symbol] = price_cache[symbol]
+        last_price_update[symbol] = current_time
         
-        # 파일에 저장
-        with open(cache_file, 'w', encoding='utf-8') as f:
-            json.dump(all_cache, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        logger.warning(f"가격 캐시 파일 저장 오류: {e}")
+        # 캐시 파일에도 저장 (선택 사항)
+        try:
+            cache_file = 'price_cache.json'
+            
+            # 기존 캐시 파일 로드
+            if os.path.exists(cache_file):
+                all_cache = serialization.load(cache_file)
+            else:
+                all_cache = {}
+            
+            # 새 가격 정보 추가
+            all_cache[symbol] = price_cache[symbol]
+            
+            # 파일에 저장
+            serialization.dump(all_cache, cache_file)
+        except Exception as e:
+            logger.warning(f"가격 캐시 파일 저장 오류: {e}")
 
 def get_cached_price(symbol, max_age_seconds=300):
     """캐시된 가격 정보 가져오기"""
@@ -1225,7 +1245,7 @@ def generate_trading_signal_without_price(analysis, coin_symbol, source_data):
             "priceMissing": True   # 가격 정보 누락 표시
         }
         
-        return signal
+        return TradingSignal.from_dict(signal)
         
     except Exception as e:
         logger.error(f"가격 없는 거래 시그널 생성 오류: {e}")
@@ -1236,27 +1256,30 @@ def generate_trading_signal_without_price(analysis, coin_symbol, source_data):
 # 10. 시그널 저장 함수
 def save_signal(signal):
     """거래 시그널 저장"""
+    save_signals([signal])
+
+def save_signals(new_signals):
+    """거래 시그널 여러 개를 한 번에 저장 (파일 읽기/쓰기 1회)"""
+    if not new_signals:
+        return
     signal_file = 'trading_signals.json'
     try:
         # 파일이 있으면 읽기
         if os.path.exists(signal_file):
-            with open(signal_file, 'r', encoding='utf-8') as f:
-                signals = json.load(f)
+            signals = serialization.load(signal_file)
         else:
             signals = []
         
         # 새 시그널 추가
-        signals.append(signal)
+        signals.extend(new_signals)
         
         # 파일에 저장
-        with open(signal_file, 'w', encoding='utf-8') as f:
-            json.dump(signals, f, ensure_ascii=False, indent=2)
+        serialization.dump(signals, signal_file)
             
     except Exception as e:
         logger.error(f"시그널 저장 오류: {e}")
         # 새 파일 생성
-        with open(signal_file, 'w', encoding='utf-8') as f:
-            json.dump([signal], f, ensure_ascii=False, indent=2)
+        serialization.dump(list(new_signals), signal_file)
 
 # 11. 알림 전송 함수
 def send_alert(signal):
@@ -1269,66 +1292,132 @@ def send_alert(signal):
     logger.info(f"📊 예상 가격 변동: {signal['estimatedPriceChangePercent']:.2f}%")
     logger.info(f"🔎 근거: {signal['reasoning']}")
 
+def news_signals_from_integration(news_data):
+    """news_integration 파일 내용을 뉴스 시그널 목록으로 변환"""
+    # 모든 시그널을 저장할 리스트
+    all_signals = []
+    
+    # 1. 고위험 뉴스 처리
+    for article in news_data.get('high_risk', []):
+        for coin in article.get('related_coins', []):
+            signal = {
+                "source": "news",
+                "coinSymbol": coin,
+                "content": article.get('title', ''),
+                "url": article.get('url', ''),
+                "sourceType": article.get('source', ''),
+                "timestamp": article.get('timestamp', datetime.now().isoformat()),
+                "risk_level": "HIGH",
+                "related_influencers": article.get('related_influencers', [])
+            }
+            if article.get('trace'):
+                signal["trace"] = get_tracer().fork(article['trace'], coin)
+            all_signals.append(signal)
+    
+    # 2. 코인별 뉴스 처리
+    for coin, articles in news_data.get('by_coin', {}).items():
+        for article in articles:
+            # 이미 고위험 뉴스로 처리한 경우 스킵
+            if article.get('risk_level') == 'HIGH':
+                continue
+                
+            # 시그널 생성
+            signal = {
+                "source": "news",
+                "coinSymbol": coin,
+                "content": article.get('title', ''),
+                "url": article.get('url', ''),
+                "sourceType": article.get('source', ''),
+                "timestamp": article.get('timestamp', datetime.now().isoformat()),
+                "risk_level": article.get('risk_level', 'MEDIUM'),
+                "related_influencers": article.get('related_influencers', [])
+            }
+            if article.get('trace'):
+                signal["trace"] = get_tracer().fork(article['trace'], coin)
+            all_signals.append(signal)
+    
+    return all_signals
+
+def load_news_from_archive():
+    """압축된 뉴스 아카이브(newsArchive.py)의 최신 스냅샷에서 뉴스 로드"""
+    try:
+        from newsArchive import NewsArchive
+        
+        if not NewsArchive.exists():
+            return None
+            
+        news_data = NewsArchive().latest_snapshot()
+        if not news_data:
+            return None
+            
+        all_signals = news_signals_from_integration(news_data)
+        logger.info(f"뉴스 아카이브에서 {len(all_signals)}개의 뉴스 시그널을 로드했습니다.")
+        return all_signals
+        
+    except Exception as e:
+        logger.error(f"뉴스 아카이브 로드 오류: {e}")
+        return None
+
+# 기사 저장소 (refresh 시 로그의 새 줄만 반영)
+_article_store = None
+
+def load_news_from_store():
+    """기사 저장소(articleStore.py) 색인에서 최신 수집 배치의 뉴스 시그널 로드"""
+    global _article_store
+    try:
+        from articleStore import ArticleStore
+        
+        latest_state_file = "news/latest_state.json"
+        if not os.path.exists(latest_state_file):
+            return None
+            
+        latest_state = serialization.load(latest_state_file)
+            
+        batch_keys = latest_state.get('article_keys')
+        if not batch_keys:
+            return None
+            
+        if _article_store is None:
+            _article_store = ArticleStore(latest_state.get('latest_file', "news/article_store.jsonl"))
+        store = _article_store
+        store.refresh()
+        
+        # 최신 배치를 news_integration 형식으로 모아 같은 변환 사용 (코인별 목록은 코인 색인 사용)
+        news_data = {
+            'high_risk': store.select(batch_keys, risk_level="HIGH"),
+            'by_coin': {coin: store.select(batch_keys, coin=coin) for coin in store.counts('coin', batch_keys)}
+        }
+        all_signals = news_signals_from_integration(news_data)
+        
+        logger.info(f"기사 저장소에서 {len(all_signals)}개의 뉴스 시그널을 로드했습니다.")
+        return all_signals
+        
+    except Exception as e:
+        logger.error(f"기사 저장소 로드 오류: {e}")
+        return None
+
 def load_news_data():
     """realtimeNS.py가 생성한 뉴스 데이터 파일 로드"""
     try:
         # 뉴스 통합 상태 파일 확인
         integration_state_file = "data/news_integration_latest.json"
         
-        # 통합 파일이 없으면 뉴스 디렉토리에서 직접 찾기
+        # 통합 파일이 없으면 아카이브 또는 뉴스 디렉토리에서 찾기
         if not os.path.exists(integration_state_file):
-            logger.warning("뉴스 통합 상태 파일이 없습니다. 직접 뉴스 디렉토리에서 찾습니다.")
-            return load_news_from_directory()
+            logger.warning("뉴스 통합 상태 파일이 없습니다. 기사 저장소, 아카이브 또는 뉴스 디렉토리에서 찾습니다.")
+            return load_news_from_store() or load_news_from_archive() or load_news_from_directory()
             
-        with open(integration_state_file, 'r', encoding='utf-8') as f:
-            integration_state = json.load(f)
+        integration_state = serialization.load(integration_state_file)
             
         latest_file = integration_state.get('latest_file')
         if not latest_file or not os.path.exists(latest_file):
             logger.warning(f"최신 뉴스 파일을 찾을 수 없습니다: {latest_file}")
-            return load_news_from_directory()
+            return load_news_from_store() or load_news_from_archive() or load_news_from_directory()
             
         # 통합 파일에서 뉴스 로드
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            news_data = json.load(f)
-        
-        # 모든 시그널을 저장할 리스트
-        all_signals = []
+        news_data = serialization.load(latest_file)
         
-        # 1. 고위험 뉴스 처리
-        for article in news_data.get('high_risk', []):
-            for coin in article.get('related_coins', []):
-                signal = {
-                    "source": "news",
-                    "coinSymbol": coin,
-                    "content": article.get('title', ''),
-                    "url": article.get('url', ''),
-                    "sourceType": article.get('source', ''),
-                    "timestamp": article.get('timestamp', datetime.now().isoformat()),
-                    "risk_level": "HIGH",
-                    "related_influencers": article.get('related_influencers', [])
-                }
-                all_signals.append(signal)
-        
-        # 2. 코인별 뉴스 처리
-        for coin, articles in news_data.get('by_coin', {}).items():
-            for article in articles:
-                # 이미 고위험 뉴스로 처리한 경우 스킵
-                if article.get('risk_level') == 'HIGH':
-                    continue
-                    
-                # 시그널 생성
-                signal = {
-                    "source": "news",
-                    "coinSymbol": coin,
-                    "content": article.get('title', ''),
-                    "url": article.get('url', ''),
-                    "sourceType": article.get('source', ''),
-                    "timestamp": article.get('timestamp', datetime.now().isoformat()),
-                    "risk_level": article.get('risk_level', 'MEDIUM'),
-                    "related_influencers": article.get('related_influencers', [])
-                }
-                all_signals.append(signal)
+        all_signals = news_signals_from_integration(news_data)
         
         logger.info(f"통합 파일에서 {len(all_signals)}개의 뉴스 시그널을 로드했습니다.")
         return all_signals
@@ -1337,7 +1426,7 @@ def load_news_data():
         logger.error(f"뉴스 데이터 로드 오류: {e}")
         import traceback
         logger.error(traceback.format_exc())
-        return load_news_from_directory()  # 오류 시 디렉토리에서 직접 로드 시도
+        return load_news_from_store() or load_news_from_directory()  # 오류 시 저장소/디렉토리에서 직접 로드 시도
 
 def load_news_from_directory():
     """뉴스 디렉토리에서 직접 뉴스 파일 찾아서 로드"""
@@ -1361,8 +1450,7 @@ def load_news_from_directory():
             latest_high_risk = max(high_risk_files, key=os.path.getmtime)
             
             # 고위험 뉴스 로드
-            with open(latest_high_risk, 'r', encoding='utf-8') as f:
-                high_risk_news = json.load(f)
+            high_risk_news = serialization.load(latest_high_risk)
                 
             for article in high_risk_news:
                 for coin in article.get('related_coins', []):
@@ -1403,8 +1491,7 @@ def load_news_from_directory():
             # 각 코인 최신 파일 로드
             for coin, file_info in coin_files.items():
                 try:
-                    with open(file_info['path'], 'r', encoding='utf-8') as f:
-                        coin_news = json.load(f)
+                    coin_news = serialization.load(file_info['path'])
                         
                     for article in coin_news:
                         # 고위험 뉴스와 중복 방지
@@ -1446,17 +1533,118 @@ def load_news_from_directory():
         logger.error(f"뉴스 디렉토리 처리 오류: {e}")
         return []
     
+def twitter_signals_from_user(username, tweets, coins=None):
+    """
+    인플루언서 한 명의 트윗 목록을 트위터 시그널 목록으로 변환
+
+    coins를 넘기면 인플루언서의 관심 코인 대신 해당 코인 키워드를 확인한다
+    (등록되지 않은 사용자는 사용자명을 작성자로 사용).
+    """
+    all_signals = []
+    
+    # 해당 인플루언서 정보 찾기
+    influencer_info = None
+    for inf in influencers:
+        if inf['twitter_username'] == username:
+            influencer_info = inf
+            break
+    
+    if coins is None:
+        if not influencer_info:
+            return all_signals
+        coins = influencer_info['coins']
+    author = influencer_info['name'] if influencer_info else username
+        
+    for tweet in tweets:
+        # 기본 정보 추출
+        tweet_id = tweet.get('id')
+        if not tweet_id:
+            continue
+            
+        # 이미 처리한 트윗인지 확인
+        tweet_created = tweet.get('created_at')
+        tweet_text = tweet.get('text', '')
+        
+        # 관련 코인 확인
+        for coin in coins:
+            # 코인 관련 키워드 확인 로직은 realtimeTW.py와 일치하게 유지
+            pattern = coin_patterns.get(coin, {})
+            positive_keywords = pattern.get('positiveKeywords', [])
+            negative_keywords = pattern.get('negativeKeywords', [])
+            all_keywords = positive_keywords + negative_keywords + [coin.lower()]
+            
+            is_related = False
+            for keyword in all_keywords:
+                if keyword.lower() in tweet_text.lower():
+                    is_related = True
+                    break
+            
+            if is_related:
+                # 시그널 생성
+                signal = {
+                    "source": "twitter",
+                    "coinSymbol": coin,
+                    "tweet_id": tweet_id,
+                    "content": tweet_text,
+                    "author": author,
+                    "url": tweet.get('url', f"https://twitter.com/{username}/status/{tweet_id}"),
+                    "timestamp": tweet_created if isinstance(tweet_created, str) else str(tweet_created),
+                    "metrics": tweet.get('public_metrics', {})
+                }
+                if tweet.get('trace'):
+                    # 트윗 하나가 여러 코인 시그널로 나뉘어 동시에 분석되므로 코인마다 하위 trace
+                    signal["trace"] = get_tracer().fork(tweet['trace'], coin)
+                all_signals.append(signal)
+    
+    return all_signals
+
+# 트윗 저장소 (refresh 시 사용자 세그먼트의 새 줄만 반영)
+_tweet_store = None
+
+def load_twitter_from_store():
+    """사용자별 트윗 저장소(tweetStore.py)에서 트위터 시그널 로드"""
+    global _tweet_store
+    from tweetStore import TweetStore
+    
+    if _tweet_store is None:
+        _tweet_store = TweetStore('tweets/store')
+    _tweet_store.refresh()
+    
+    all_signals = []
+    seen = set()
+    
+    # 1. 인플루언서별 트윗 처리
+    for username in _tweet_store.users():
+        for signal in twitter_signals_from_user(username, _tweet_store.get(username)):
+            seen.add((signal.get('tweet_id'), signal.get('coinSymbol')))
+            all_signals.append(signal)
+    
+    # 2. 다른 코인 키워드가 포함된 트윗 (기존 코인별 트윗 파일 대체)
+    for username in _tweet_store.users():
+        for signal in twitter_signals_from_user(username, _tweet_store.get(username), coins=list(coin_patterns)):
+            key = (signal.get('tweet_id'), signal.get('coinSymbol'))
+            if key in seen:
+                continue
+            seen.add(key)
+            all_signals.append(signal)
+    
+    logger.info(f"트윗 저장소에서 {len(all_signals)}개의 트위터 시그널을 로드했습니다.")
+    return all_signals
+
 def load_twitter_data():
-    """realtimeTW.py가 생성한 트위터 데이터 파일 로드"""
+    """realtimeTW.py가 생성한 트위터 데이터 로드 (저장소 우선, 없으면 all_tweets.json)"""
     try:
+        from tweetStore import TweetStore
+        if TweetStore.exists('tweets/store'):
+            return load_twitter_from_store()
+        
         # 트위터 all_tweets.json 파일 확인 (realtimeTW.py 생성 파일)
         twitter_file = 'tweets/all_tweets.json'
         if not os.path.exists(twitter_file):
             logger.warning("트위터 데이터 파일이 없습니다: " + twitter_file)
             return []
             
-        with open(twitter_file, 'r', encoding='utf-8') as f:
-            twitter_data = json.load(f)
+        twitter_data = serialization.load(twitter_file)
         
         # 코인별 트윗 파일 디렉토리 확인
         coin_tweets_dir = 'tweets/coins'
@@ -1466,53 +1654,7 @@ def load_twitter_data():
         
         # 1. 인플루언서별 트윗 처리
         for username, tweets in twitter_data.items():
-            # 해당 인플루언서 정보 찾기
-            influencer_info = None
-            for inf in influencers:
-                if inf['twitter_username'] == username:
-                    influencer_info = inf
-                    break
-            
-            if not influencer_info:
-                continue
-                
-            for tweet in tweets:
-                # 기본 정보 추출
-                tweet_id = tweet.get('id')
-                if not tweet_id:
-                    continue
-                    
-                # 이미 처리한 트윗인지 확인
-                tweet_created = tweet.get('created_at')
-                tweet_text = tweet.get('text', '')
-                
-                # 관련 코인 확인
-                for coin in influencer_info['coins']:
-                    # 코인 관련 키워드 확인 로직은 realtimeTW.py와 일치하게 유지
-                    pattern = coin_patterns.get(coin, {})
-                    positive_keywords = pattern.get('positiveKeywords', [])
-                    negative_keywords = pattern.get('negativeKeywords', [])
-                    all_keywords = positive_keywords + negative_keywords + [coin.lower()]
-                    
-                    is_related = False
-                    for keyword in all_keywords:
-                        if keyword.lower() in tweet_text.lower():
-                            is_related = True
-                            break
-                    
-                    if is_related:
-                        # 시그널 생성
-                        signal = {
-                            "source": "twitter",
-                            "coinSymbol": coin,
-                            "tweet_id": tweet_id,
-                            "content": tweet_text,
-                            "author": influencer_info['name'],
-                            "url": tweet.get('url', f"https://twitter.com/{username}/status/{tweet_id}"),
-                            "timestamp": tweet_created if isinstance(tweet_created, str) else str(tweet_created),
-                            "metrics": tweet.get('public_metrics', {})
-                        }
-                        all_signals.append(signal)
+            all_signals.extend(twitter_signals_from_user(username, tweets))
         
         # 2. 코인별 트윗 파일 처리 (더 최신 데이터가 있을 수 있음)
         if os.path.exists(coin_tweets_dir):
@@ -1541,8 +1683,7 @@ def load_twitter_data():
             # 각 코인의 최신 파일에서 트윗 로드
             for coin, file_info in coin_files.items():
                 try:
-                    with open(file_info['path'], 'r', encoding='utf-8') as f:
-                        coin_tweets = json.load(f)
+                    coin_tweets = serialization.load(file_info['path'])
                         
                     for tweet in coin_tweets:
                         tweet_id = tweet.get('id')
@@ -1606,8 +1747,7 @@ def load_news_from_directory():
             latest_high_risk = max(high_risk_files, key=os.path.getmtime)
             
             # 고위험 뉴스 로드
-            with open(latest_high_risk, 'r', encoding='utf-8') as f:
-                high_risk_news = json.load(f)
+            high_risk_news = serialization.load(latest_high_risk)
                 
             for article in high_risk_news:
                 for coin in article.get('related_coins', []):
@@ -1648,8 +1788,7 @@ def load_news_from_directory():
             # 각 코인 최신 파일 로드
             for coin, file_info in coin_files.items():
                 try:
-                    with open(file_info['path'], 'r', encoding='utf-8') as f:
-                        coin_news = json.load(f)
+                    coin_news = serialization.load(file_info['path'])
                         
                     for article in coin_news:
                         # 고위험 뉴스와 중복 방지
@@ -1704,8 +1843,8 @@ def get_all_signals():
     # 모든 시그널 통합
     all_signals = news_signals + twitter_signals
     
-    # 시간순 정렬
-    all_signals.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
+    # 시간순 정렬 (epoch ms 정수 비교)
+    all_signals.sort(key=signal_time_ms, reverse=True)
     
     return all_signals
     
@@ -1968,8 +2107,8 @@ def get_all_signals():
 #         logger.error(traceback.format_exc())
 #         return None
 
-def generate_trading_signal(analysis, coin_symbol, source_data):
-    """거래 시그널 생성 - 더 안전한 버전"""
+def generate_trading_signal(analysis, coin_symbol, source_data, current_price=None):
+    """거래 시그널 생성 - 더 안전한 버전 (current_price를 넘기면 가격 조회 생략)"""
     try:
         # 분석 결과가 없으면 처리 불가
         if not analysis:
@@ -1993,8 +2132,9 @@ def generate_trading_signal(analysis, coin_symbol, source_data):
             source_id = source_url
             source_author = source_data.get('sourceType', '')
         
-        # 현재 코인 가격 조회
-        current_price = get_coin_price(coin_symbol)
+        # 현재 코인 가격 조회 (가격 단계에서 이미 조회했으면 재사용)
+        if current_price is None:
+            current_price = get_coin_price(coin_symbol)
         
         signal = {
             "timestamp": datetime.now().isoformat(),
@@ -2017,7 +2157,11 @@ def generate_trading_signal(analysis, coin_symbol, source_data):
             "currentPrice": current_price
         }
         
-        return signal
+        # 수집 시점 trace를 주문/체결까지 전달
+        if source_data.get('trace'):
+            signal["trace"] = source_data['trace']
+        
+        return TradingSignal.from_dict(signal)
         
     except Exception as e:
         logger.error(f"거래 시그널 생성 오류: {e}")
@@ -2072,7 +2216,7 @@ def generate_trading_signal_without_price(analysis, coin_symbol, source_data):
             "priceMissing": True   # 가격 정보 누락 표시
         }
         
-        return signal
+        return TradingSignal.from_dict(signal)
         
     except Exception as e:
         logger.error(f"가격 없는 거래 시그널 생성 오류: {e}")
@@ -2091,6 +2235,128 @@ def send_alert_without_price(signal):
     logger.info(f"🔎 근거: {signal['reasoning']}")
 
 # 12. 메인 실행 함수
+
+# 파이프라인 설정
+PIPELINE_QUEUE_SIZE = 100   # 단계 사이 대기열 크기
+ANALYZE_WORKERS = 4         # 동시 분석 수 (Claude 호출은 can_call_claude_api로 별도 제한)
+PRICE_BATCH_SIZE = 20       # 가격 조회 배치 크기
+PRICE_FETCH_WORKERS = 8     # 배치 안의 서로 다른 코인 동시 조회 수
+PERSIST_BATCH_SIZE = 20     # 저장/체크포인트 배치 크기
+BATCH_TIMEOUT = 0.5         # 배치를 채우기 위해 기다리는 최대 시간 (초)
+
+def build_signal_pipeline(processed_ids, coin_prices):
+    """
+    시그널 처리 파이프라인 구성
+    dedup → recency → analyze → price → signal → persist
+
+    Parameters:
+    -----------
+    processed_ids : dict
+        이미 처리된 데이터 ID (persist 단계에서 배치마다 갱신/저장)
+    coin_prices : dict
+        이번 실행의 코인별 가격 (코인당 한 번만 조회)
+
+    Returns:
+    --------
+    Pipeline : 시그널 dict를 입력받는 파이프라인
+    """
+
+    def dedup(signal):
+        # 시그널 ID 결정
+        if signal.get('source', '') == 'twitter':
+            data_id = signal.get('tweet_id', '')
+            data_type = "twitter"
+            if not data_id:
+                return None
+        else:  # news
+            # URL이 없으면 내용 해시 사용
+            data_id = signal.get('url', '') or str(hash(signal.get('content', '')))
+            data_type = "news"
+
+        # 이미 처리된 데이터 스킵
+        if is_already_processed(data_id, data_type, processed_ids):
+            return None
+        return {'signal': signal, 'data_id': data_id, 'data_type': data_type}
+
+    def recency(item):
+        # 최신성 확인
+        return item if is_recent_content(signal_time_ms(item['signal'])) else None
+
+    def analyze(item):
+        signal = item['signal']
+        coin_symbol = signal.get('coinSymbol', '')
+
+        # Claude 사용 여부 결정
+        use_claude = should_use_claude(signal)
+        logger.info(f"{signal.get('content', '')[:30]}... 분석에 Claude 사용: {use_claude}")
+
+        with get_tracer().span(trace_of(signal), 'analysis', coin=coin_symbol, claude=use_claude):
+            if item['data_type'] == 'twitter':
+                item['analysis'] = analyze_tweet(signal, coin_symbol, use_claude=use_claude)
+            else:  # news
+                item['analysis'] = analyze_news(signal, coin_symbol, use_claude=use_claude)
+
+        # 분석 실패해도 중복 처리 방지를 위해 처리됨으로 표시하도록 그대로 전달
+        return item
+
+    def fetch_price(coin_symbol):
+        try:
+            return coin_symbol, get_coin_price(coin_symbol)
+        except Exception as e:
+            logger.error(f"{coin_symbol} 가격 정보 오류: {e}")
+            return coin_symbol, None
+
+    def price(items):
+        # 배치 안에서 아직 조회하지 않은 코인만 동시에 조회
+        missing = {item['signal'].get('coinSymbol', '') for item in items if item['analysis']} - set(coin_prices)
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(PRICE_FETCH_WORKERS, len(missing))) as executor:
+                coin_prices.update(executor.map(fetch_price, missing))
+
+        outputs = []
+        for item in items:
+            if item['analysis']:
+                item['price'] = coin_prices.get(item['signal'].get('coinSymbol', ''))
+                # 가격 조회 실패 시 처리됨으로 표시하지 않음 (다음 실행에서 재시도)
+                if item['price'] is None:
+                    continue
+            outputs.append(item)
+        return outputs
+
+    def signal_stage(item):
+        if not item['analysis']:
+            return item
+
+        signal = item['signal']
+        with get_tracer().span(trace_of(signal), 'signal_create', coin=signal.get('coinSymbol', '')):
+            item['trading_signal'] = generate_trading_signal(
+                item['analysis'], signal.get('coinSymbol', ''), signal, current_price=item['price']
+            )
+        return item if item['trading_signal'] else None
+
+    def persist(items):
+        trading_signals = [item['trading_signal'] for item in items if item.get('trading_signal')]
+
+        # 시그널 저장 및 알림
+        save_signals(trading_signals)
+        for trading_signal in trading_signals:
+            send_alert(trading_signal)
+
+        # 처리됨으로 표시하고 배치마다 체크포인트 저장 (중단 시 이 배치 이후만 재처리)
+        for item in items:
+            mark_as_processed(item['data_id'], item['data_type'], processed_ids)
+        save_processed_ids(processed_ids)
+        return items
+
+    return Pipeline([
+        Stage('dedup', dedup),
+        Stage('recency', recency),
+        Stage('analyze', analyze, workers=ANALYZE_WORKERS),
+        Stage('price', price, batch_size=PRICE_BATCH_SIZE, batch_timeout=BATCH_TIMEOUT),
+        Stage('signal', signal_stage),
+        Stage('persist', persist, batch_size=PERSIST_BATCH_SIZE, batch_timeout=BATCH_TIMEOUT)
+    ], queue_size=PIPELINE_QUEUE_SIZE)
+
 def main():
     """최적화된 코인 레버리지 시그널 분석 시스템"""
     logger.info("코인 레버리지 시그널 분석 시스템 시작...")
@@ -2098,122 +2364,36 @@ def main():
     try:
         # 이미 처리된 데이터 ID 로드
         processed_ids = load_processed_ids()
-        
-        # 트위터 데이터 로드
-        twitter_signals = load_twitter_data()
-        logger.info(f"{len(twitter_signals)}개의 트위터 시그널 로드됨")
-        
-        # 뉴스 데이터 로드
-        news_signals = load_news_data()
-        logger.info(f"{len(news_signals)}개의 뉴스 시그널 로드됨")
-        
-        # 모든 시그널 통합
-        all_signals = []
-        
-        # 트위터 시그널 처리
-        for signal in twitter_signals:
-            tweet_id = signal.get('tweet_id', '')
-            if not tweet_id:
-                continue
-                
-            # 이미 처리된 트윗 스킵
-            if is_already_processed(tweet_id, "twitter", processed_ids):
-                continue
-                
-            # 최신성 확인
-            timestamp = signal.get('timestamp', '')
-            if not is_recent_content(timestamp):
-                continue
-                
-            all_signals.append(signal)
-        
-        # 뉴스 시그널 처리
-        for signal in news_signals:
-            url = signal.get('url', '')
-            content = signal.get('content', '')
-            
-            # URL이 없으면 내용 해시 사용
-            news_id = url if url else str(hash(content))
-            
-            # 이미 처리된 뉴스 스킵
-            if is_already_processed(news_id, "news", processed_ids):
-                continue
-                
-            # 최신성 확인
-            timestamp = signal.get('timestamp', '')
-            if not is_recent_content(timestamp):
-                continue
-                
-            all_signals.append(signal)
-        
-        logger.info(f"처리할 새로운 시그널: {len(all_signals)}개")
-        
-        # 시그널 처리 카운터
-        processed_count = 0
-        
+
         # 코인별 가격 캐시 (중복 API 호출 방지)
         coin_prices = {}
-        
-        # 각 시그널 처리
-        for signal in all_signals:
-            try:
-                # 기본 정보 추출
-                source = signal.get('source', '')
-                coin_symbol = signal.get('coinSymbol', '')
-                content = signal.get('content', '')
-
-                # Claude 사용 여부 결정 (이 부분이 현재 없음)
-                use_claude = should_use_claude(signal)
-                logger.info(f"{signal.get('content', '')[:30]}... 분석에 Claude 사용: {use_claude}")
-                
-                
-                # 시그널 ID 결정
-                if source == 'twitter':
-                    data_id = signal.get('tweet_id', '')
-                    data_type = "twitter"
-                else:  # news
-                    data_id = signal.get('url', '') or str(hash(content))
-                    data_type = "news"
-                
-                # 분석 수행
-                if source == 'twitter':
-                    analysis = analyze_tweet(signal, coin_symbol, use_claude=use_claude)
-                else:  # news
-                    analysis = analyze_news(signal, coin_symbol, use_claude=use_claude)
-                
-                # 분석 결과가 있으면 처리
-                if analysis:
-                    try:
-                        # 코인 가격 가져오기
-                        if coin_symbol in coin_prices:
-                            current_price = coin_prices[coin_symbol]
-                        else:
-                            current_price = get_coin_price(coin_symbol)
-                            coin_prices[coin_symbol] = current_price
-                        
-                        # 거래 시그널 생성
-                        trading_signal = generate_trading_signal(analysis, coin_symbol, signal)
-                        
-                        if trading_signal:
-                            # 시그널 저장 및 알림
-                            save_signal(trading_signal)
-                            send_alert(trading_signal)
-                            
-                            # 처리됨으로 표시
-                            mark_as_processed(data_id, data_type, processed_ids)
-                            processed_count += 1
-                    except Exception as price_error:
-                        logger.error(f"가격 정보/시그널 생성 오류: {str(price_error)}")
-                else:
-                    # 분석 실패해도 중복 처리 방지를 위해 처리됨으로 표시
-                    mark_as_processed(data_id, data_type, processed_ids)
-            except Exception as e:
-                logger.error(f"시그널 처리 오류: {e}")
-        
-        # 처리된 ID 목록 저장
+
+        def load_signals():
+            # 트위터 데이터 로드
+            twitter_signals = load_twitter_data()
+            logger.info(f"{len(twitter_signals)}개의 트위터 시그널 로드됨")
+            yield from twitter_signals
+
+            # 뉴스 데이터 로드 (트위터 시그널 처리와 동시에 진행)
+            news_signals = load_news_data()
+            logger.info(f"{len(news_signals)}개의 뉴스 시그널 로드됨")
+            yield from news_signals
+
+        pipeline = build_signal_pipeline(processed_ids, coin_prices)
+        start_time = time.time()
+        results = pipeline.run(load_signals())
+
+        # 파이프라인이 비었을 때도 마지막 상태 저장
         save_processed_ids(processed_ids)
-        
-        logger.info(f"총 {processed_count}개의 시그널이 처리되었습니다.")
+
+        processed_count = sum(1 for item in results if item.get('trading_signal'))
+        for name, stats in pipeline.stats().items():
+            logger.info(f"단계 {name}: 입력 {stats['received']}, 출력 {stats['emitted']}, "
+                        f"오류 {stats['errors']}, 처리 시간 {stats['busy_seconds']:.2f}초")
+        logger.info(f"총 {processed_count}개의 시그널이 처리되었습니다. ({time.time() - start_time:.2f}초)")
+
+        # 이번 실행의 분석/시그널 span 내보내기
+        get_tracer().flush()
         
     except Exception as e:
         logger.error(f"시스템 오류: {e}")
@@ -2243,22 +2423,23 @@ def can_call_claude_api():
     """Claude API 호출 제한 확인"""
     global last_api_call_time, api_calls_count
     
-    current_time = datetime.now()
-    time_diff = (current_time - last_api_call_time).total_seconds()
-    
-    # 1분이 지났으면 카운터 초기화
-    if time_diff > 60:
-        last_api_call_time = current_time
-        api_calls_count = 0
-        return True
-    
-    # 분당 호출 제한 확인
-    if api_calls_count < MAX_API_CALLS_PER_MINUTE:
-        api_calls_count += 1
-        return True
-    
-    # 제한 초과
-    return False
+    with _api_call_lock:
+        current_time = datetime.now()
+        time_diff = (current_time - last_api_call_time).total_seconds()
+        
+        # 1분이 지났으면 카운터 초기화
+        if time_diff > 60:
+            last_api_call_time = current_time
+            api_calls_count = 0
+            return True
+        
+        # 분당 호출 제한 확인
+        if api_calls_count < MAX_API_CALLS_PER_MINUTE:
+            api_calls_count += 1
+            return True
+        
+        # 제한 초과
+        return False
 
 # 처리된 데이터 ID를 저장할 파일
 PROCESSED_DATA_FILE = "data/processed_ids.json"
@@ -2267,13 +2448,12 @@ def load_processed_ids():
     """이미 처리된 데이터 ID 목록 로드"""
     try:
         if os.path.exists(PROCESSED_DATA_FILE):
-            with open(PROCESSED_DATA_FILE, 'r', encoding='utf-8') as f:
-                loaded_data = json.load(f)
-                # list를 set으로 변환
-                processed_ids = {}
-                for key, value in loaded_data.items():
-                    processed_ids[key] = set(value)
-                return processed_ids
+            loaded_data = serialization.load(PROCESSED_DATA_FILE)
+            # list를 set으로 변환
+            processed_ids = {}
+            for key, value in loaded_data.items():
+                processed_ids[key] = set(value)
+            return processed_ids
         # 파일이 없을 경우 기본값
         return {"news": set(), "twitter": set()}
     except Exception as e:
@@ -2283,23 +2463,17 @@ def load_processed_ids():
 def save_processed_ids(processed_ids):
     """처리된 데이터 ID 목록 저장"""
     try:
-        # set을 list로 변환하여 JSON으로 저장
+        # set은 serialization에서 list로 저장됨
         save_data = {}
         for key, value in processed_ids.items():
             # 타입 검사를 통한 안전한 변환
-            if isinstance(value, set):
-                save_data[key] = list(value)
-            elif isinstance(value, list):
+            if isinstance(value, (set, list)):
                 save_data[key] = value
             else:
                 save_data[key] = []
                 logger.warning(f"처리된 ID 저장 중 타입 불일치: {key} - {type(value)}")
         
-        # 디렉토리 확인
-        os.makedirs(os.path.dirname(PROCESSED_DATA_FILE), exist_ok=True)
-        
-        with open(PROCESSED_DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        serialization.dump(save_data, PROCESSED_DATA_FILE)
             
         logger.info(f"처리된 ID 저장 완료 (news: {len(processed_ids.get('news', set()))}, twitter: {len(processed_ids.get('twitter', set()))})")
     except Exception as e:
@@ -2334,77 +2508,27 @@ def mark_as_processed(data_id, data_type, processed_ids):
     # 처리됨으로 표시
     processed_ids[data_type].add(data_id)
 
+def signal_time_ms(signal):
+    """시그널 시각(epoch ms) - 처음 한 번만 파싱해서 'timestamp_ms'에 저장 (실패 시 0)"""
+    ms = signal.get('timestamp_ms')
+    if ms is None:
+        ms = to_epoch_ms(signal.get('timestamp')) or 0
+        signal['timestamp_ms'] = ms
+    return ms
+
 def is_recent_content(timestamp_str, max_minutes_old=30):
-    """컨텐츠가 최신 것인지 확인 (기본값: 최근 30분 이내)"""
-    try:
-        # timestamp_str이 None이면 현재 시간 사용
-        if not timestamp_str:
-            return True
-            
-        # datetime 객체로 변환
-        timestamp = None
-        
-        # 이미 datetime 객체인 경우
-        if isinstance(timestamp_str, datetime):
-            timestamp = timestamp_str
-        # 문자열인 경우 여러 형식 시도
-        elif isinstance(timestamp_str, str):
-            try:
-                # ISO 형식 시도 (2025-05-10 01:04:06+00:00 또는 2025-05-10T01:04:06+00:00)
-                if '+' in timestamp_str or 'T' in timestamp_str:
-                    if 'T' in timestamp_str:
-                        timestamp = datetime.fromisoformat(timestamp_str)
-                    else:
-                        # 공백을 T로 변환하여 ISO 형식으로 만들기
-                        iso_format = timestamp_str.replace(' ', 'T')
-                        timestamp = datetime.fromisoformat(iso_format)
-                # YYYY-MM-DD HH:MM:SS 형식 시도
-                elif '-' in timestamp_str and ':' in timestamp_str and len(timestamp_str) >= 16:
-                    timestamp = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-                # YYYY.MM.DD HH:MM 형식 시도
-                elif '.' in timestamp_str and ':' in timestamp_str:
-                    timestamp = datetime.strptime(timestamp_str, '%Y.%m.%d %H:%M')
-                # MM/DD/YYYY 형식 시도
-                elif '/' in timestamp_str:
-                    parts = timestamp_str.split('/')
-                    if len(parts) == 3 and len(parts[2]) == 4:  # MM/DD/YYYY
-                        timestamp = datetime.strptime(timestamp_str, '%m/%d/%Y')
-                    else:  # 다른 / 형식
-                        current_year = datetime.now().year
-                        timestamp = datetime.strptime(f"{current_year}/{timestamp_str}", '%Y/%m/%d')
-                # HH:MM 형식 시도 (오늘 날짜)
-                elif ':' in timestamp_str and len(timestamp_str) <= 5:
-                    today = datetime.now().date()
-                    time_obj = datetime.strptime(timestamp_str, '%H:%M').time()
-                    timestamp = datetime.combine(today, time_obj)
-                else:
-                    # 다른 모든 형식 실패 시 현재 시간 사용
-                    timestamp = datetime.now()
-            except ValueError:
-                # 파싱 실패 시 현재 시간 사용
-                logger.warning(f"날짜 형식 파싱 실패: {timestamp_str}")
-                timestamp = datetime.now()
-        else:
-            # 다른 타입인 경우 현재 시간 사용
-            timestamp = datetime.now()
-            
-        # 시간 차이 계산
-        current_time = datetime.now()
-        
-        # 시간대 정보가 있으면 UTC로 변환 (간단한 처리)
-        if hasattr(timestamp, 'tzinfo') and timestamp.tzinfo is not None:
-            # 현재 시간을 UTC 기준으로 설정
-            from datetime import timezone
-            current_time = datetime.now(timezone.utc)
-            
-        time_diff = current_time - timestamp
-        minutes_diff = time_diff.total_seconds() / 60
-        
-        return minutes_diff <= max_minutes_old
-    except Exception as e:
-        logger.error(f"최신성 확인 오류: {e}")
-        # 오류 발생 시 안전을 위해 최신으로 간주
-        return True
+    """
+    컨텐츠가 최신 것인지 확인 (기본값: 최근 30분 이내)
+
+    timestamp_str은 문자열, datetime, epoch ms 모두 가능하다. 파싱에 실패하면
+    최신이 아닌 것으로 처리하고 실패 횟수는 timeUtils.get_parse_failures()에 집계된다.
+    """
+    current_time = datetime.now()
+    timestamp_ms = to_epoch_ms(timestamp_str, now=current_time)
+    if timestamp_ms is None:
+        return False
+    
+    return int(current_time.timestamp() * 1000) - timestamp_ms <= max_minutes_old * 60 * 1000
     
 def load_latest_trading_signals(max_signals=30):
     """최근 생성된 거래 시그널 로드"""
@@ -2414,12 +2538,8 @@ def load_latest_trading_signals(max_signals=30):
         return []
         
     try:
-        with open(signals_file, 'r', encoding='utf-8') as f:
-            all_signals = json.load(f)
-            
-        # 최신 시그널만 선택
-        all_signals.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        return all_signals[:max_signals]
+        # 파일 전체를 올리지 않고 스트리밍하면서 최신 시그널만 유지
+        return heapq.nlargest(max_signals, serialization.iter_array(signals_file), key=signal_time_ms)
         
     except Exception as e:
         logger.error(f"거래 시그널 로드 오류: {e}")
@@ -2441,6 +2561,7 @@ def run_scheduler():
 
 # 프로그램 실행
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     try:
         # 한 번 실행하려면:
         main()
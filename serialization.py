@@ -0,0 +1,256 @@
+import os
+import json
+import logging
+from enum import Enum
+from decimal import Decimal
+from datetime import datetime, date, time as dt_time
+
+from records import Record
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 백엔드 선택: orjson이 설치되어 있으면 사용 (C 구현, bytes 직접 출력), 없으면 표준 json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None and os.getenv('TRADECOIN_JSON_BACKEND', 'orjson') == 'orjson' else 'json'
+
+# 스트리밍 읽기 단위 (문자 수)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_warned_types = set()
+
+
+def default(obj):
+    """
+    JSON 기본 타입이 아닌 값 변환
+
+    Record/Enum/datetime/numpy/set/Decimal은 의미를 보존해 변환하고, 그 밖의 타입은
+    문자열로 바꾸되 타입별로 한 번 경고를 남긴다 (default=str처럼 조용히 넘어가지 않음).
+    """
+    if isinstance(obj, Record):
+        return obj.to_json_dict()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (datetime, date, dt_time)):
+        return obj.isoformat()
+    if np is not None:
+        if isinstance(obj, np.generic):
+            return obj.item()
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+
+    type_name = type(obj).__name__
+    if type_name not in _warned_types:
+        _warned_types.add(type_name)
+        logger.warning(f"JSON 직렬화 미지원 타입을 문자열로 저장: {type_name}")
+    return str(obj)
+
+
+def dumps(obj, pretty=False):
+    """
+    객체 -> JSON bytes (UTF-8)
+
+    Parameters:
+    -----------
+    obj : object
+        직렬화할 객체
+    pretty : bool
+        True면 들여쓰기 2칸 (사람이 직접 여는 파일용), 기본값은 공백 없는 compact 출력
+
+    Returns:
+    --------
+    bytes : JSON 데이터
+    """
+    if BACKEND == 'orjson':
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=default, option=option)
+
+    if pretty:
+        text = json.dumps(obj, ensure_ascii=False, indent=2, default=default)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=default)
+    return text.encode('utf-8')
+
+
+def dumps_line(obj):
+    """JSONL 한 줄 (개행 포함 str)"""
+    return dumps(obj).decode('utf-8') + '\n'
+
+
+def loads(data):
+    """JSON bytes/str -> 객체"""
+    if BACKEND == 'orjson':
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump(obj, path, pretty=False, fsync=False):
+    """
+    객체를 JSON 파일로 저장 (임시 파일 작성 후 원자적 rename)
+
+    Parameters:
+    -----------
+    obj : object
+        저장할 객체
+    path : str
+        파일 경로
+    pretty : bool
+        들여쓰기 여부
+    fsync : bool
+        rename 전에 디스크 동기화 (전원 장애에도 파일 내용 보존)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(dumps(obj, pretty=pretty))
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load(path, default_value=None):
+    """
+    JSON 파일 로드
+
+    Parameters:
+    -----------
+    path : str
+        파일 경로
+    default_value : object
+        파일이 없을 때 반환할 값
+
+    Returns:
+    --------
+    object : 로드한 데이터
+    """
+    if not os.path.exists(path):
+        return default_value
+    with open(path, 'rb') as f:
+        return loads(f.read())
+
+
+def iter_array(path, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    최상위 JSON 배열 파일을 원소 단위로 읽기 (파일 전체를 메모리에 올리지 않음)
+
+    Parameters:
+    -----------
+    path : str
+        '[...]' 형태의 JSON 파일 경로
+    chunk_size : int
+        한 번에 읽을 문자 수
+
+    Yields:
+    -------
+    object : 배열 원소
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        eof = not buffer
+        if eof:
+            return
+        if buffer[0] != '[':
+            raise ValueError(f"JSON 배열 파일이 아닙니다: {path}")
+        buffer = buffer[1:]
+
+        while True:
+            # 공백/구분자 건너뛰기
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            while not buffer and not eof:
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = chunk.lstrip().lstrip(',').lstrip()
+
+            if not buffer:
+                raise ValueError(f"JSON 배열이 닫히지 않았습니다: {path}")
+            if buffer[0] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer)
+                # 숫자처럼 버퍼 끝에서 잘렸을 수 있는 원소는 더 읽은 뒤 다시 파싱
+                if end == len(buffer) and not eof:
+                    raise json.JSONDecodeError("버퍼 끝", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer += chunk
+                continue
+
+            yield item
+            buffer = buffer[end:]
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import glob
+    import time
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    paths = sorted(glob.glob("data/*.json")) + sorted(glob.glob("news/*.json")) + ["trading_signals.json"]
+    paths = [p for p in paths if os.path.exists(p)]
+    print(f"백엔드: {BACKEND}, 파일 {len(paths)}개")
+
+    documents = []
+    start = time.perf_counter()
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            documents.append(json.load(f))
+    stdlib_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for path in paths:
+        load(path)
+    backend_load = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stdlib_bytes = sum(len(json.dumps(doc, ensure_ascii=False, indent=2, default=str).encode('utf-8'))
+                       for doc in documents)
+    stdlib_dump = time.perf_counter() - start
+
+    start = time.perf_counter()
+    backend_bytes = sum(len(dumps(doc)) for doc in documents)
+    backend_dump = time.perf_counter() - start
+
+    print(f"로드: json {stdlib_load:.3f}초 / {BACKEND} {backend_load:.3f}초")
+    print(f"저장: json(indent=2) {stdlib_dump:.3f}초, {stdlib_bytes / 1024:.0f}KB / "
+          f"{BACKEND}(compact) {backend_dump:.3f}초, {backend_bytes / 1024:.0f}KB")
+
+    if os.path.exists("trading_signals.json"):
+        start = time.perf_counter()
+        count = sum(1 for _ in iter_array("trading_signals.json"))
+        print(f"trading_signals.json 스트리밍 읽기: {count}개, {time.perf_counter() - start:.3f}초")
+
+    sample = {'time': datetime.now(), 'values': np.arange(3) if np is not None else [0, 1, 2], 'ids': {1, 2}}
+    print(dumps(sample))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "array.json")
+        items = [{'i': i, 'text': '가나다' * (i % 5)} for i in range(5000)] + [1, 2.5, None, "끝"]
+        dump(items, path)
+        assert list(iter_array(path, chunk_size=7)) == items
+        print("iter_array 검증 완료")
@@ -0,0 +1,151 @@
+import re
+import time
+import logging
+from collections import Counter
+from datetime import datetime
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# 파싱 실패 집계 (형식 모양별: 숫자는 9로 치환)
+_parse_failures = Counter()
+
+# 오늘 날짜/올해에 따라 달라지는 형식 표시 (캐시하지 않음)
+_RELATIVE = object()
+
+
+def _datetime_ms(dt):
+    """datetime -> epoch 밀리초 (naive는 로컬 시간으로 해석)"""
+    return int(dt.timestamp() * 1000)
+
+
+def _number_ms(value):
+    """숫자 타임스탬프 -> epoch 밀리초 (1e11 미만이면 초 단위로 간주)"""
+    return int(value if abs(value) >= 1e11 else value * 1000)
+
+
+@lru_cache(maxsize=65536)
+def _parse_absolute(text):
+    """
+    절대 시각 문자열을 epoch 밀리초로 변환 (결과 캐시)
+
+    첫 몇 글자로 형식을 판별해 한 번만 파싱한다. 오늘 날짜가 필요한 형식이면
+    _RELATIVE, 파싱할 수 없으면 None을 반환한다.
+    """
+    try:
+        # ISO 8601 (2025-05-10T01:04:06.123Z, 2025-05-10 01:04:06+00:00, 2025-05-10)
+        if len(text) >= 10 and text[4] == '-' and text[7] == '-':
+            return _datetime_ms(datetime.fromisoformat(text.replace('Z', '+00:00')))
+        # 2025.05.08 14:30
+        if len(text) >= 16 and text[4] == '.' and text[7] == '.':
+            return _datetime_ms(datetime.strptime(text[:16], '%Y.%m.%d %H:%M'))
+        # 05/08/2025
+        if text.count('/') == 2:
+            return _datetime_ms(datetime.strptime(text, '%m/%d/%Y'))
+        # 05/08 (올해), 14:30 (오늘)
+        if text.count('/') == 1 or (':' in text and len(text) <= 5):
+            return _RELATIVE
+        # epoch 초/밀리초 문자열
+        if text.isdigit():
+            return _number_ms(int(text))
+    except ValueError:
+        pass
+    return None
+
+
+def _parse_relative(text, now):
+    if '/' in text:
+        return _datetime_ms(datetime.strptime(f"{now.year}/{text}", '%Y/%m/%d'))
+    time_obj = datetime.strptime(text, '%H:%M').time()
+    return _datetime_ms(datetime.combine(now.date(), time_obj))
+
+
+def _record_failure(value):
+    shape = re.sub(r'\d', '9', str(value))[:40] if value not in (None, '') else '<empty>'
+    if _parse_failures[shape] == 0:
+        logger.warning(f"날짜 형식 파싱 실패: {value!r}")
+    _parse_failures[shape] += 1
+
+
+def to_epoch_ms(value, now=None):
+    """
+    타임스탬프를 UTC epoch 밀리초로 변환
+
+    Parameters:
+    -----------
+    value : str, datetime, int or float
+        ISO 8601, 'YYYY.MM.DD HH:MM', 'MM/DD/YYYY', 'MM/DD', 'HH:MM',
+        datetime(naive는 로컬 시간), epoch 초/밀리초
+    now : datetime
+        'MM/DD', 'HH:MM'처럼 날짜가 빠진 형식의 기준 시각 (기본값: 현재)
+
+    Returns:
+    --------
+    int : epoch 밀리초, 파싱 실패 시 None (실패 횟수는 get_parse_failures로 확인)
+    """
+    if isinstance(value, bool):
+        ms = None
+    elif isinstance(value, (int, float)):
+        return _number_ms(value)
+    elif isinstance(value, datetime):
+        return _datetime_ms(value)
+    elif isinstance(value, str) and value.strip():
+        text = value.strip()
+        ms = _parse_absolute(text)
+        if ms is _RELATIVE:
+            try:
+                ms = _parse_relative(text, now or datetime.now())
+            except ValueError:
+                ms = None
+    else:
+        ms = None
+
+    if ms is None:
+        _record_failure(value)
+    return ms
+
+
+def now_ms():
+    """현재 시각 (epoch 밀리초)"""
+    return int(time.time() * 1000)
+
+
+def ms_to_datetime(ms):
+    """epoch 밀리초 -> 로컬 naive datetime"""
+    return datetime.fromtimestamp(ms / 1000)
+
+
+def get_parse_failures():
+    """형식 모양별 파싱 실패 횟수"""
+    return dict(_parse_failures)
+
+
+def reset_parse_failures():
+    _parse_failures.clear()
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    samples = [
+        "2025-10-04T05:06:50.341050",
+        "2025-05-10 01:04:06+00:00",
+        "2026-10-19T10:00:00.000Z",
+        "2025.05.08 14:30",
+        "05/08/2025",
+        "05/08",
+        "14:30",
+        datetime.now(),
+        1760000000,
+        "어제",
+        None
+    ]
+    for sample in samples:
+        ms = to_epoch_ms(sample)
+        print(f"{sample!r:40} -> {ms} ({ms_to_datetime(ms) if ms is not None else '실패'})")
+    print(f"파싱 실패: {get_parse_failures()}")
+
+    values = ["2025-10-04T05:06:50.341050"] * 100000
+    start = time.perf_counter()
+    for value in values:
+        to_epoch_ms(value)
+    print(f"10만 건 변환 (캐시): {time.perf_counter() - start:.3f}초")
@@ -0,0 +1,407 @@
+"""
+지연 추적 모듈
+수집(스크랩) 시점에 trace를 붙이고 분석 → 시그널 → 검증 → 주문 접수/체결까지 단계별 span을 기록
+"""
+
+import os
+import json
+import time
+import uuid
+import bisect
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 항목(dict/Record)에 trace 컨텍스트를 담는 키
+TRACE_KEY = 'trace'
+
+# trace를 끝내는 단계 (수집부터 이 단계까지를 end_to_end로 기록)
+TERMINAL_STAGE = 'fill'
+
+
+def trace_of(item) -> Optional[Dict]:
+    """항목에 붙은 trace 컨텍스트 (없으면 None)"""
+    try:
+        return item.get(TRACE_KEY) if item is not None else None
+    except AttributeError:
+        return None
+
+
+class LatencyHistogram:
+    """
+    고정 버킷 지연 히스토그램 (ms)
+
+    버킷 경계가 고정이라 관측은 이진 탐색 한 번이고, 여러 프로세스/구간의 히스토그램을
+    버킷별로 더해 합칠 수 있다. 분위수는 버킷 안에서 선형 보간한 근사값이다.
+    """
+
+    BOUNDS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000,
+                 60000, 120000, 300000, 600000, 1800000, 3600000)
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float):
+        self.counts[bisect.bisect_left(self.BOUNDS_MS, value_ms)] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.BOUNDS_MS[i - 1] if i > 0 else 0.0
+                upper = self.BOUNDS_MS[i] if i < len(self.BOUNDS_MS) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / bucket_count)
+            seen += bucket_count
+        return self.max
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': round(self.quantile(0.5), 3),
+            'p90_ms': round(self.quantile(0.9), 3),
+            'p99_ms': round(self.quantile(0.99), 3),
+            'max_ms': round(self.max, 3),
+            'buckets': {
+                str(bound): count for bound, count in zip(self.BOUNDS_MS + ('inf',), self.counts) if count
+            }
+        }
+
+
+class SpanExporter(ABC):
+    """
+    span/히스토그램 내보내기 인터페이스
+
+    Tracer.flush()가 마지막 flush 이후 끝난 span 목록과 전체 히스토그램 스냅샷을 넘긴다.
+    외부 모니터링 시스템 연동은 이 클래스를 상속해 Tracer.add_exporter()로 등록한다.
+    """
+
+    @abstractmethod
+    def export(self, spans: List[Dict], histograms: Dict[str, Dict]):
+        pass
+
+
+class LoggingExporter(SpanExporter):
+    """단계별 p50/p99를 로그로 출력"""
+
+    def export(self, spans: List[Dict], histograms: Dict[str, Dict]):
+        if not spans:
+            return
+        summary = ', '.join(f"{stage} p50 {h['p50_ms']:.0f}ms/p99 {h['p99_ms']:.0f}ms"
+                            for stage, h in histograms.items())
+        logger.info(f"⏱️  지연 ({len(spans)} span): {summary}")
+
+
+class JsonlExporter(SpanExporter):
+    """span을 JSON Lines 파일에 추가하고 히스토그램 스냅샷을 옆 파일에 저장"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.histogram_path = os.path.splitext(path)[0] + '_histograms.json'
+
+    def export(self, spans: List[Dict], histograms: Dict[str, Dict]):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if spans:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.writelines(json.dumps(span, ensure_ascii=False, default=str) + '\n' for span in spans)
+        with open(self.histogram_path, 'w', encoding='utf-8') as f:
+            json.dump(histograms, f, ensure_ascii=False, indent=2)
+
+
+class Tracer:
+    """
+    단계별 지연 추적기
+
+    start_trace()가 수집 시점의 trace 컨텍스트 {'id', 'source', 'ingested_ns'}를 만들고,
+    이 dict가 항목(기사/트윗 → 신호 → 주문)을 따라 파일/Firestore를 거쳐 전달된다.
+    span은 time.monotonic_ns() 기준이며, 같은 호스트에서는 프로세스가 달라도 비교할 수 있다.
+
+    단계마다 두 히스토그램을 갱신한다:
+    - '<stage>': 단계 실행 시간
+    - '<stage>.wait': 같은 trace의 이전 단계가 끝난 뒤 이 단계가 시작되기까지의 대기
+      (다른 span 안에서 시작한 단계는 바깥 span 시작부터)
+    체결(TERMINAL_STAGE)에서 'end_to_end'(수집 → 체결)를 기록한다.
+
+    기록은 잠금 안의 O(1) 갱신뿐이고, 내보내기는 start()의 백그라운드 스레드나 flush()에서 한다.
+    """
+
+    def __init__(self, exporters: Optional[Iterable[SpanExporter]] = None, max_traces: int = 10000,
+                 max_pending: int = 10000):
+        """
+        Parameters:
+        -----------
+        exporters : Iterable[SpanExporter]
+            flush()마다 호출할 내보내기 대상
+        max_traces : int
+            단계 간 대기를 계산하려고 기억하는 최근 trace 수
+        max_pending : int
+            내보내기 전까지 보관하는 최대 span 수 (넘치면 오래된 것부터 버림)
+        """
+        self.exporters: List[SpanExporter] = list(exporters or [])
+        self.max_traces = max_traces
+        self._last_end: OrderedDict = OrderedDict()
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._pending: deque = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def add_exporter(self, exporter: SpanExporter):
+        self.exporters.append(exporter)
+
+    def start_trace(self, source: str, started_ns: Optional[int] = None, **attrs) -> Dict:
+        """
+        수집 시점에 trace 생성 ('scrape' span: started_ns ~ 지금)
+
+        Parameters:
+        -----------
+        source : str
+            수집원 ('news', 'twitter' 등)
+        started_ns : int, optional
+            수집을 시작한 time.monotonic_ns() (없으면 지금, scrape span 길이 0)
+
+        Returns:
+        --------
+        Dict : 항목에 붙일 trace 컨텍스트
+        """
+        now = time.monotonic_ns()
+        context = {
+            'id': uuid.uuid4().hex[:16],
+            'source': source,
+            'ingested_ns': started_ns if started_ns is not None else now
+        }
+        # 첫 span이라 대기는 기록하지 않음
+        with self._lock:
+            self._end(context, 'scrape', context['ingested_ns'], now, attrs)
+            if len(self._last_end) > self.max_traces:
+                self._last_end.popitem(last=False)
+        return context
+
+    def fork(self, context: Optional[Dict], key: str) -> Optional[Dict]:
+        """
+        하위 trace 생성 (항목 하나가 여러 코인으로 나뉘어 동시에 처리될 때 코인마다 하나씩)
+
+        수집 시점(ingested_ns)은 그대로 두고 id만 '<id>:<key>'로 바꾼다. 부모의 마지막 단계
+        종료 시점을 이어받으므로 첫 단계의 대기는 부모 기준으로 계산되고, 이후 대기와
+        체결(end_to_end)은 하위 trace마다 따로 기록된다.
+
+        Parameters:
+        -----------
+        context : Dict
+            부모 trace 컨텍스트 (없으면 None 반환)
+        key : str
+            하위 구분 키 (예: 코인 심볼)
+        """
+        if not context:
+            return None
+        child = {**context, 'id': f"{context['id']}:{key}"}
+        with self._lock:
+            parent_end = self._last_end.get(context['id'])
+            if parent_end is not None:
+                self._last_end[child['id']] = parent_end
+        return child
+
+    def record(self, context: Optional[Dict], stage: str, start_ns: int, end_ns: int, **attrs):
+        """끝난 span 기록 (context가 없으면 무시)"""
+        if not context:
+            return
+        with self._lock:
+            self._begin(context, stage, start_ns)
+            self._end(context, stage, start_ns, end_ns, attrs)
+
+    def _begin(self, context: Dict, stage: str, start_ns: int):
+        """단계 시작: 이전 단계 종료(처음 보는 trace면 수집 시점)부터의 대기 기록"""
+        trace_id = context['id']
+        previous_end = self._last_end.pop(trace_id, context.get('ingested_ns'))
+        if previous_end is not None and start_ns >= previous_end:
+            self._observe(f'{stage}.wait', (start_ns - previous_end) / 1e6)
+
+        # 안쪽 span(예: order 안의 order_ack)의 대기는 바깥 span 시작부터
+        self._last_end[trace_id] = start_ns
+        if len(self._last_end) > self.max_traces:
+            self._last_end.popitem(last=False)
+
+    def _end(self, context: Dict, stage: str, start_ns: int, end_ns: int, attrs: Dict):
+        """단계 종료: 실행 시간 기록 및 span 보관"""
+        trace_id = context['id']
+        duration_ms = (end_ns - start_ns) / 1e6
+        self._observe(stage, duration_ms)
+
+        if stage == TERMINAL_STAGE:
+            self._observe('end_to_end', (end_ns - context['ingested_ns']) / 1e6)
+            self._last_end.pop(trace_id, None)
+        else:
+            self._last_end[trace_id] = max(self._last_end.get(trace_id, end_ns), end_ns)
+
+        span = {
+            'trace_id': trace_id,
+            'source': context.get('source'),
+            'stage': stage,
+            'start_ns': start_ns,
+            'end_ns': end_ns,
+            'duration_ms': round(duration_ms, 3),
+            'since_ingest_ms': round((end_ns - context['ingested_ns']) / 1e6, 3)
+        }
+        if attrs:
+            span['attrs'] = attrs
+        self._pending.append(span)
+
+    def _observe(self, name: str, value_ms: float):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram()
+        histogram.observe(value_ms)
+
+    @contextmanager
+    def span(self, context: Optional[Dict], stage: str, **attrs):
+        """
+        with 블록 실행 시간을 span으로 기록 (예외가 나면 attrs['error']에 남기고 다시 발생)
+
+        블록 안에서 yield된 dict에 값을 넣으면 span 속성으로 함께 기록된다.
+        """
+        if not context:
+            yield attrs
+            return
+
+        start = time.monotonic_ns()
+        with self._lock:
+            self._begin(context, stage, start)
+        try:
+            yield attrs
+        except Exception as e:
+            attrs['error'] = str(e)
+            raise
+        finally:
+            end = time.monotonic_ns()
+            with self._lock:
+                self._end(context, stage, start, end, attrs)
+
+    def mark(self, context: Optional[Dict], stage: str, **attrs):
+        """시점 이벤트 기록 (예: 'order_ack', 'fill')"""
+        now = time.monotonic_ns()
+        self.record(context, stage, now, now, **attrs)
+
+    def histograms(self) -> Dict[str, Dict]:
+        """단계별 히스토그램 스냅샷"""
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in self._histograms.items()}
+
+    def flush(self):
+        """쌓인 span과 히스토그램을 모든 exporter로 내보냄"""
+        with self._lock:
+            spans = list(self._pending)
+            self._pending.clear()
+        histograms = self.histograms()
+        for exporter in self.exporters:
+            try:
+                exporter.export(spans, histograms)
+            except Exception as e:
+                logger.error(f"❌ 지연 추적 내보내기 실패 ({type(exporter).__name__}): {e}")
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            self.flush()
+
+    def start(self, interval: float = 10.0):
+        """백그라운드 주기 내보내기 시작"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='tracer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.flush()
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+def get_tracer() -> Tracer:
+    """
+    프로세스 공용 추적기 (처음 호출 시 생성)
+
+    TRACE_EXPORT_FILE 환경 변수가 있으면 span을 그 JSON Lines 파일로도 내보낸다.
+    """
+    global _tracer
+    with _tracer_lock:
+        if _tracer is None:
+            exporters = [LoggingExporter()]
+            if os.getenv('TRACE_EXPORT_FILE'):
+                exporters.append(JsonlExporter(os.getenv('TRACE_EXPORT_FILE')))
+            _tracer = Tracer(exporters)
+        return _tracer
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    class MemoryExporter(SpanExporter):
+        def __init__(self):
+            self.spans = []
+
+        def export(self, spans, histograms):
+            self.spans.extend(spans)
+
+    memory = MemoryExporter()
+    path = os.path.join(tempfile.mkdtemp(), 'spans.jsonl')
+    tracer = Tracer([memory, JsonlExporter(path)])
+
+    random.seed(0)
+    for i in range(200):
+        scrape_start = time.monotonic_ns() - random.randint(200, 2000) * 1000
+        tweet = {'id': str(i), 'text': 'DOGE to the moon'}
+        tweet[TRACE_KEY] = tracer.start_trace('twitter', started_ns=scrape_start)
+
+        context = trace_of(tweet)
+        with tracer.span(context, 'analysis', model='basic'):
+            time.sleep(random.uniform(0, 0.002))
+        with tracer.span(context, 'signal_create'):
+            pass
+        time.sleep(random.uniform(0, 0.001))  # 실행 주기까지 대기
+        with tracer.span(context, 'order'):
+            tracer.mark(context, 'order_ack')
+        tracer.mark(context, 'fill')
+
+    # trace 없는 항목은 기록하지 않음
+    with tracer.span(None, 'analysis'):
+        pass
+
+    tracer.flush()
+    histograms = tracer.histograms()
+    for stage in ('scrape', 'analysis', 'signal_create', 'order.wait', 'order_ack.wait', 'order', 'end_to_end'):
+        h = histograms[stage]
+        print(f"{stage:>14}: n={h['count']}, p50 {h['p50_ms']:.2f}ms, p99 {h['p99_ms']:.2f}ms, max {h['max_ms']:.2f}ms")
+    assert len(memory.spans) == 200 * 6 and histograms['end_to_end']['count'] == 200
+    print(f"span {len(memory.spans)}개 내보냄 ({path})")
+
+    start = time.perf_counter()
+    context = tracer.start_trace('news')
+    for _ in range(100000):
+        tracer.mark(context, 'analysis')
+    print(f"span 기록 비용: {(time.perf_counter() - start) * 10:.2f}µs")
@@ -0,0 +1,168 @@
+import os
+import logging
+import threading
+
+import serialization
+
+logger = logging.getLogger(__name__)
+
+
+class TradeJournal:
+    """
+    Write-ahead log of position/trade events plus compacted snapshots
+
+    Every event is appended to ``<state>.wal`` as one JSON line and fsynced
+    before the caller continues, so a crash never loses a fill. Snapshots are
+    written to ``<state>.json`` with an atomic rename and record the sequence
+    number of the last event they contain; the WAL is then truncated. Loading
+    reads the snapshot and replays only the events logged after it.
+    """
+
+    def __init__(self, snapshot_path='bitcoin_trader_state.json', snapshot_every=100):
+        """
+        Parameters:
+        -----------
+        snapshot_path : str
+            Path of the snapshot file (the WAL and history archive sit next to it)
+        snapshot_every : int
+            Number of logged events after which a new snapshot is due
+        """
+        base = os.path.splitext(snapshot_path)[0]
+        self.snapshot_path = snapshot_path
+        self.wal_path = f"{base}.wal"
+        self.history_path = f"{base}.history.jsonl"
+        self.snapshot_every = snapshot_every
+
+        self._lock = threading.Lock()
+        self._repair()
+        self.seq, self.events_since_snapshot = self._scan()
+
+    def _repair(self):
+        """Cut off a record left half-written by a crash so new appends start on a clean line"""
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b'\n') + 1
+            if end < len(data):
+                logger.warning(f"Truncating incomplete WAL record in {self.wal_path}")
+                f.truncate(end)
+
+    def _read_wal(self):
+        """Yield events from the WAL, skipping a torn final line"""
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    logger.warning(f"Ignoring incomplete WAL record in {self.wal_path}")
+                    break
+                try:
+                    yield serialization.loads(line)
+                except ValueError as e:
+                    logger.error(f"Corrupt WAL record in {self.wal_path}: {e}")
+
+    def _scan(self):
+        """Find the last sequence number and the number of events pending a snapshot"""
+        snapshot = serialization.load(self.snapshot_path) or {}
+        seq = snapshot_seq = snapshot.get('journal_seq', 0)
+        pending = 0
+        for event in self._read_wal():
+            if event['seq'] > snapshot_seq:
+                seq = max(seq, event['seq'])
+                pending += 1
+        return seq, pending
+
+    def append(self, event_type, data):
+        """
+        Durably log an event
+
+        Parameters:
+        -----------
+        event_type : str
+            Event name (e.g. 'open', 'close')
+        data : dict
+            Event payload
+
+        Returns:
+        --------
+        bool : True if a snapshot is due
+        """
+        with self._lock:
+            self.seq += 1
+            line = serialization.dumps_line({'seq': self.seq, 'type': event_type, 'data': data})
+            with open(self.wal_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.events_since_snapshot += 1
+            return self.events_since_snapshot >= self.snapshot_every
+
+    def write_snapshot(self, state):
+        """
+        Atomically write a snapshot and truncate the WAL
+
+        Parameters:
+        -----------
+        state : dict
+            Full state; the current sequence number is stored alongside it
+        """
+        with self._lock:
+            serialization.dump(dict(state, journal_seq=self.seq), self.snapshot_path, fsync=True)
+
+            # Events up to journal_seq are now in the snapshot. A crash before the
+            # truncation is harmless because load() skips them by sequence number.
+            tmp_path = f"{self.wal_path}.tmp"
+            open(tmp_path, 'w').close()
+            os.replace(tmp_path, self.wal_path)
+            self.events_since_snapshot = 0
+
+    def archive(self, records):
+        """Append records trimmed from the snapshot to the history archive"""
+        if not records:
+            return
+        with open(self.history_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(serialization.dumps_line(record) for record in records))
+
+    def load(self):
+        """
+        Read the latest snapshot and the events logged after it
+
+        Returns:
+        --------
+        tuple : (snapshot dict or None, list of events in sequence order)
+        """
+        with self._lock:
+            snapshot = serialization.load(self.snapshot_path)
+            snapshot_seq = (snapshot or {}).get('journal_seq', 0)
+            events = [event for event in self._read_wal() if event['seq'] > snapshot_seq]
+            events.sort(key=lambda event: event['seq'])
+            return snapshot, events
+
+
+if __name__ == "__main__":
+    import time
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "state.json")
+        journal = TradeJournal(path, snapshot_every=50)
+
+        start = time.perf_counter()
+        for i in range(120):
+            if journal.append('open', {'position': {'id': str(i)}}):
+                journal.write_snapshot({'positions': i})
+        print(f"120 events: {time.perf_counter() - start:.3f}s, seq {journal.seq}, "
+              f"pending {journal.events_since_snapshot}")
+
+        # Simulate a crash mid-write
+        with open(journal.wal_path, 'a') as f:
+            f.write('{"seq": 121, "type": "op')
+
+        recovered = TradeJournal(path)
+        recovered.append('close', {'position_id': '0'})
+        snapshot, events = recovered.load()
+        print(f"Recovered snapshot at seq {snapshot['journal_seq']} plus {len(events)} events "
+              f"(last seq {events[-1]['seq']})")
@@ -0,0 +1,227 @@
+import os
+import logging
+import threading
+
+from records import Tweet
+import serialization
+
+logger = logging.getLogger(__name__)
+
+
+class TweetStore:
+    """
+    사용자별 추가 전용(append) 트윗 저장소
+
+    사용자마다 tweets/store/{username}.jsonl 세그먼트에 새 트윗 배치를 한 줄씩 덧붙이므로
+    쓰기 비용은 새 트윗 수에만 비례한다. 메모리에는 사용자별 최신순 트윗 튜플과 ID 색인을
+    두고, 쓰기는 튜플을 통째로 교체하므로 같은 프로세스의 읽기는 잠금 없이 진행된다.
+    세그먼트가 커지면 백그라운드 스레드가 최신 트윗만 남기고 압축(임시 파일 + rename)한다.
+    다른 프로세스(reverageAI)는 refresh()로 세그먼트의 새 줄만 읽는다.
+    """
+
+    def __init__(self, store_dir='tweets/store', max_per_user=100, compact_after=50):
+        """
+        Parameters:
+        -----------
+        store_dir : str
+            세그먼트 디렉토리
+        max_per_user : int
+            사용자별 유지할 최대 트윗 수 (기존 all_tweets.json과 동일하게 100개)
+        compact_after : int
+            세그먼트 줄(배치) 수가 이 값을 넘으면 백그라운드 압축
+        """
+        self.store_dir = store_dir
+        self.max_per_user = max_per_user
+        self.compact_after = compact_after
+
+        self._tweets = {}      # username -> 최신순 트윗 튜플
+        self._ids = {}         # username -> 트윗 ID 집합
+        self._offsets = {}     # username -> (inode, 읽은 위치)
+        self._lines = {}       # username -> 세그먼트 줄 수
+        self._write_lock = threading.Lock()
+        self._compacting = set()
+
+        self.refresh()
+
+    @staticmethod
+    def exists(store_dir='tweets/store'):
+        return os.path.isdir(store_dir) and any(f.endswith('.jsonl') for f in os.listdir(store_dir))
+
+    def _path(self, username):
+        return os.path.join(self.store_dir, f"{username}.jsonl")
+
+    def _publish(self, username, tweets):
+        """사용자 트윗 튜플과 ID 색인 교체 (읽기 쪽은 항상 완성된 튜플만 봄)"""
+        tweets = tuple(tweets[:self.max_per_user])
+        self._ids[username] = {t.get('id') for t in tweets}
+        self._tweets[username] = tweets
+
+    # ------------------------------------------------------------------
+    # 읽기 (잠금 없음)
+    # ------------------------------------------------------------------
+    def users(self):
+        return list(self._tweets)
+
+    def get(self, username, limit=None):
+        """사용자 트윗 (최신순)"""
+        tweets = self._tweets.get(username, ())
+        return list(tweets if limit is None else tweets[:limit])
+
+    def all(self):
+        """{username: [tweets]} (all_tweets.json과 같은 구조)"""
+        return {username: list(tweets) for username, tweets in self._tweets.items()}
+
+    def contains(self, username, tweet_id):
+        return tweet_id in self._ids.get(username, ())
+
+    # ------------------------------------------------------------------
+    # 세그먼트 동기화
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """모든 사용자 세그먼트에서 아직 읽지 않은 배치만 반영"""
+        if not os.path.isdir(self.store_dir):
+            return 0
+
+        applied = 0
+        for filename in os.listdir(self.store_dir):
+            if filename.endswith('.jsonl'):
+                applied += self._refresh_user(filename[:-len('.jsonl')])
+        return applied
+
+    def _refresh_user(self, username):
+        path = self._path(username)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return 0
+
+        inode, offset = self._offsets.get(username, (None, 0))
+        tweets = list(self._tweets.get(username, ()))
+
+        # 압축으로 파일이 교체되었으면 처음부터 다시 읽기
+        if stat.st_ino != inode or stat.st_size < offset:
+            tweets, offset = [], 0
+            self._lines[username] = 0
+
+        if stat.st_size == offset:
+            return 0
+
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+
+        # 쓰는 중인 마지막 줄은 다음 refresh에서 읽음
+        end = data.rfind(b'\n') + 1
+        applied = 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                batch = serialization.loads(line)
+            except ValueError as e:
+                logger.error(f"{username} 트윗 세그먼트 파싱 오류: {e}")
+                continue
+            tweets = [Tweet.from_dict(t) for t in batch] + tweets
+            applied += 1
+
+        self._lines[username] = self._lines.get(username, 0) + applied
+        self._offsets[username] = (stat.st_ino, offset + end)
+        self._publish(username, tweets)
+        return applied
+
+    # ------------------------------------------------------------------
+    # 쓰기
+    # ------------------------------------------------------------------
+    def append(self, username, tweets):
+        """
+        새 트윗만 사용자 세그먼트에 추가
+
+        Parameters:
+        -----------
+        username : str
+            트위터 사용자명
+        tweets : list
+            수집한 트윗 목록 (최신순)
+
+        Returns:
+        --------
+        list : 실제로 추가된 새 트윗
+        """
+        with self._write_lock:
+            self._refresh_user(username)
+            known = self._ids.get(username, set())
+            new_tweets = [t for t in tweets if t.get('id') and t['id'] not in known]
+            if not new_tweets:
+                return []
+
+            os.makedirs(self.store_dir, exist_ok=True)
+            path = self._path(username)
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(serialization.dumps_line(new_tweets))
+
+            # 메모리 상태는 디스크에 기록된 형태(JSON 직렬화 결과)와 동일하게 유지
+            stored = [Tweet.from_dict(t) for t in serialization.loads(serialization.dumps(new_tweets))]
+            stat = os.stat(path)
+            self._offsets[username] = (stat.st_ino, stat.st_size)
+            self._lines[username] = self._lines.get(username, 0) + 1
+            self._publish(username, stored + list(self._tweets.get(username, ())))
+
+            if self._lines[username] > self.compact_after:
+                self.compact_async(username)
+
+        return new_tweets
+
+    def compact(self, username):
+        """사용자 세그먼트를 현재 트윗(최대 max_per_user개) 한 줄로 다시 쓰기"""
+        try:
+            with self._write_lock:
+                path = self._path(username)
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(serialization.dumps_line(list(self._tweets.get(username, ()))))
+                os.replace(tmp_path, path)
+
+                stat = os.stat(path)
+                self._offsets[username] = (stat.st_ino, stat.st_size)
+                self._lines[username] = 1
+            logger.info(f"{username} 트윗 세그먼트 압축 완료")
+        except Exception as e:
+            logger.error(f"{username} 트윗 세그먼트 압축 오류: {e}")
+        finally:
+            self._compacting.discard(username)
+
+    def compact_async(self, username):
+        """백그라운드 스레드에서 압축 (이미 진행 중이면 무시)"""
+        if username in self._compacting:
+            return
+        self._compacting.add(username)
+        threading.Thread(target=self.compact, args=(username,), daemon=True).start()
+
+
+# 테스트 코드
+if __name__ == "__main__":
+    import time
+    import shutil
+    import tempfile
+
+    logging.basicConfig(level=logging.INFO)
+
+    store_dir = tempfile.mkdtemp()
+    writer = TweetStore(store_dir)
+    reader = TweetStore(store_dir)
+
+    start = time.perf_counter()
+    next_id = 1000
+    for cycle in range(500):
+        batch = []
+        for _ in range(cycle % 3):
+            next_id += 1
+            batch.append({'id': str(next_id), 'text': f"tweet {next_id} bitcoin", 'created_at': time.time()})
+        writer.append('elonmusk', batch[::-1])
+    print(f"500회 추가: {time.perf_counter() - start:.3f}초")
+
+    time.sleep(0.2)
+    reader.refresh()
+    print(f"쓰기 쪽 {len(writer.get('elonmusk'))}개, 읽기 쪽 {len(reader.get('elonmusk'))}개, "
+          f"최신 ID {reader.get('elonmusk', 1)[0]['id']}, 세그먼트 {os.path.getsize(writer._path('elonmusk'))} bytes")
+    shutil.rmtree(store_dir)